@@ -162,8 +162,6 @@ class CypherEncoder(object):
             return self.encode_string(key)
 
     def encode_value(self, value):
-        from py2neo.data import Node, Relationship, Path
-        from neotime import Date, Time, DateTime, Duration
         if value is None:
             return u"null"
         if value is True:
@@ -174,6 +172,8 @@ class CypherEncoder(object):
             return ustr(value)
         if isinstance(value, string_types):
             return self.encode_string(value)
+        from py2neo.data import Node, Relationship, Path
+        from neotime import Date, Time, DateTime, Duration
         if isinstance(value, Node):
             return self.encode_node(value)
         if isinstance(value, Relationship):
@@ -16,20 +16,24 @@
 # limitations under the License.
 
 
+from array import array
 from collections import Mapping
 from functools import reduce
 from io import StringIO
 from itertools import chain
-from operator import xor as xor_operator
+from operator import itemgetter, xor as xor_operator
 from uuid import uuid4
+from warnings import warn
 
 from py2neo.cypher import cypher_repr, cypher_str
 from py2neo.cypher.encoding import LabelSetView
 from py2neo.internal.collections import is_collection, SetView
-from py2neo.internal.compat import integer_types, numeric_types, string_types, ustr, xstr
+from py2neo.internal.caching import label_tuple
+from py2neo.internal.compat import Sequence, integer_types, numeric_types, string_types, unicode_types, ustr, xstr
 from py2neo.internal.html import html_escape
+from py2neo.internal.hydration import hydrate_node, hydrate_relationship
 from py2neo.internal.operations import create_subgraph, merge_subgraph, delete_subgraph, separate_subgraph, \
-    pull_subgraph, push_subgraph, subgraph_exists
+    pull_subgraph, push_subgraph, resolve_subgraph, subgraph_exists
 
 
 def walk(*walkables):
@@ -238,6 +242,68 @@ class Record(tuple, Mapping):
         return s
 
 
+class LazyRecord(Record):
+    """ A :class:`.Record` that holds raw values, exactly as received
+    from the server, and hydrates each value individually on first
+    access. This avoids the cost of building client objects for fields
+    that are never read, which can be significant for wide records.
+
+    :param keys: field names
+    :param values: raw field values
+    :param hydrate: function accepting a field index and a raw value
+                    and returning the hydrated value
+    """
+
+    def __new__(cls, keys, values, hydrate):
+        inst = Record.__new__(cls, zip(keys, values))
+        inst.__hydrate = hydrate
+        inst.__hydrated = {}
+        return inst
+
+    def __value(self, index):
+        try:
+            return self.__hydrated[index]
+        except KeyError:
+            value = self.__hydrated[index] = self.__hydrate(index, tuple.__getitem__(self, index))
+            return value
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            keys = self.keys()[key]
+            values = [self.__value(i) for i in range(len(self))[key]]
+            return Record(zip(keys, values))
+        index = self.index(key)
+        if 0 <= index < len(self):
+            return self.__value(index)
+        else:
+            return None
+
+    def __getslice__(self, start, stop):
+        return self.__getitem__(slice(start, stop))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.__value(i)
+
+    def __contains__(self, value):
+        return any(v == value for v in self)
+
+    def get(self, key, default=None):
+        try:
+            index = self.keys().index(ustr(key))
+        except ValueError:
+            return default
+        if 0 <= index < len(self):
+            return self.__value(index)
+        else:
+            return default
+
+    def items(self, *keys):
+        if keys:
+            return super(LazyRecord, self).items(*keys)
+        return list(zip(self.keys(), self))
+
+
 class PropertyDict(dict):
     """ Mutable key-value property store.
 
@@ -305,37 +371,64 @@ class PropertyDict(dict):
             self[key] = value
 
 
-class Table(list):
-    """ Immutable list of records.
+def _write_lines(file, lines, buffer_size=1000):
+    # Write an iterable of text lines, joining them into blocks so that
+    # large outputs need only a small number of writes
+    if file is None:
+        from sys import stdout as file
+    write = file.write
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= buffer_size:
+            write(u"".join(buffer))
+            del buffer[:]
+    if buffer:
+        write(u"".join(buffer))
+
+
+_text_types = frozenset(unicode_types)
+_number_types = frozenset(integer_types + (float,))
+
+
+def _cypher_text(value):
+    # Equivalent to cypher_str, but with shortcuts for the commonest
+    # types, each of which would otherwise pass through an encoder
+    value_type = type(value)
+    if value_type in _text_types:
+        return value
+    elif value_type in _number_types:
+        return ustr(value)
+    elif value is None:
+        return u"null"
+    elif value is True:
+        return u"true"
+    elif value is False:
+        return u"false"
+    else:
+        return cypher_str(value)
+
+
+def separated_value(value, separator, newline=u"\r\n", quote=u"\""):
+    """ Format a single value for a delimiter-separated file. Strings
+    are quoted only where necessary, :const:`None` becomes an empty
+    field and other values are written as Cypher literals.
     """
+    if value is None:
+        return u""
+    if isinstance(value, string_types):
+        value = ustr(value)
+        if any(ch in value for ch in separator + newline + quote):
+            value = quote + value.replace(quote, quote + quote) + quote
+        return value
+    else:
+        return _cypher_text(value)
 
-    def __init__(self, records, keys=None):
-        super(Table, self).__init__(map(tuple, records))
-        if keys is None:
-            try:
-                k = records.keys()
-            except AttributeError:
-                raise ValueError("Missing keys")
-        else:
-            k = list(map(ustr, keys))
-        width = len(k)
-        t = [set() for _ in range(width)]
-        o = [False] * width
-        for record in self:
-            for i, value in enumerate(record):
-                if value is None:
-                    o[i] = True
-                else:
-                    t[i].add(type(value))
-        f = []
-        for i, _ in enumerate(k):
-            f.append({
-                "type": t[i].copy().pop() if len(t[i]) == 1 else tuple(t[i]),
-                "numeric": all(t_ in numeric_types for t_ in t[i]),
-                "optional": o[i],
-            })
-        self._keys = k
-        self._fields = f
+
+class _TableMixin(object):
+    # Reporting and output methods shared by Table and ColumnTable.
+    # Implementations must provide `_keys`, `_fields`, `__len__` and
+    # integer indexing.
 
     def __repr__(self):
         s = StringIO()
@@ -373,15 +466,16 @@ class Table(list):
             :const:`False` otherwise.
 
         """
+        return self._fields[self._index(key)]
+
+    def _index(self, key):
         if isinstance(key, integer_types):
-            return self._fields[key]
+            return key
         elif isinstance(key, string_types):
             try:
-                index = self._keys.index(key)
+                return self._keys.index(key)
             except ValueError:
                 raise KeyError(key)
-            else:
-                return self._fields[index]
         else:
             raise TypeError(key)
 
@@ -407,55 +501,45 @@ class Table(list):
         :param newline: newline character sequence
         :return: the number of records included in output
         """
-        from click import secho
-
         space = u" " * padding
-        widths = [1 if header else 0] * len(self._keys)
-
-        def calc_widths(values, **_):
-            strings = [cypher_str(value).splitlines(False) for value in values]
-            for i, s in enumerate(strings):
-                w = max(map(len, s)) if s else 0
-                if w > widths[i]:
-                    widths[i] = w
-
-        def write_line(values, underline=u"", **styles):
-            strings = [cypher_str(value).splitlines(False) for value in values]
-            height = max(map(len, strings)) if strings else 1
+        records = [self[index] for index in self._range(skip, limit)]
+        # Each cell is rendered once, then reused both for width
+        # calculation and for output
+        rows = [[_cypher_text(value).splitlines(False) for value in record] for record in records]
+        if header and rows:
+            header_row = [cypher_str(key).splitlines(False) for key in self._keys]
+            widths = [1] * len(self._keys)
+            rows.insert(0, header_row)
+        else:
+            header_row = None
+            widths = [0] * len(self._keys)
+        for x, column in enumerate(zip(*rows)):
+            for cell in column:
+                for text in cell:
+                    if len(text) > widths[x]:
+                        widths[x] = len(text)
+        right = [auto_align and field["numeric"] for field in self._fields]
+
+        def render(cells, underline=u""):
+            height = max(map(len, cells)) if cells else 1
+            lines = []
             for y in range(height):
-                line_text = u""
-                underline_text = u""
-                for x, _ in enumerate(values):
-                    try:
-                        text = strings[x][y]
-                    except IndexError:
-                        text = u""
-                    if auto_align and self._fields[x]["numeric"]:
-                        text = space + text.rjust(widths[x]) + space
-                        u_text = underline * len(text)
+                texts = []
+                for x, cell in enumerate(cells):
+                    text = cell[y] if y < len(cell) else u""
+                    if right[x]:
+                        texts.append(space + text.rjust(widths[x]) + space)
                     else:
-                        text = space + text.ljust(widths[x]) + space
-                        u_text = underline * len(text)
-                    if x > 0:
-                        text = separator + text
-                        u_text = separator + u_text
-                    line_text += text
-                    underline_text += u_text
+                        texts.append(space + text.ljust(widths[x]) + space)
+                line = separator.join(texts)
                 if underline:
-                    line_text += newline + underline_text
-                line_text += newline
-                secho(line_text, file, nl=False, **styles)
+                    line += newline + separator.join(underline * len(text) for text in texts)
+                lines.append(line + newline)
+            return u"".join(lines)
 
-        def apply(f):
-            count = 0
-            for count, index in enumerate(self._range(skip, limit), start=1):
-                if count == 1 and header:
-                    f(self.keys(), underline=u"-")
-                f(self[index])
-            return count
-
-        apply(calc_widths)
-        return apply(write_line)
+        lines = (render(cells, underline=u"-" if cells is header_row else u"") for cells in rows)
+        _write_lines(file, lines)
+        return len(records)
 
     def write_html(self, file=None, header=None, skip=None, limit=None, auto_align=True):
         """ Write data to an HTML table.
@@ -467,28 +551,22 @@ class Table(list):
         :param auto_align: if :const:`True`, right-justify numeric values
         :return: the number of records included in output
         """
-        from click import echo
-
-        def write_tr(values, tag):
-            echo(u"<tr>", file, nl=False)
-            for i, value in enumerate(values):
-                if tag == "th":
-                    template = u'<{}>{}</{}>'
-                elif auto_align and self._fields[i]["numeric"]:
-                    template = u'<{} style="text-align:right">{}</{}>'
-                else:
-                    template = u'<{} style="text-align:left">{}</{}>'
-                echo(template.format(tag, html_escape(cypher_str(value)), tag), file, nl=False)
-            echo(u"</tr>", file, nl=False)
-
-        count = 0
-        echo(u"<table>", file, nl=False)
-        for count, index in enumerate(self._range(skip, limit), start=1):
-            if count == 1 and header:
-                write_tr(self.keys(), u"th")
-            write_tr(self[index], u"td")
-        echo(u"</table>", file, nl=False)
-        return count
+        records = [self[index] for index in self._range(skip, limit)]
+        templates = [u'<td style="text-align:right">{}</td>' if auto_align and field["numeric"]
+                     else u'<td style="text-align:left">{}</td>' for field in self._fields]
+
+        def lines():
+            yield u"<table>"
+            if header and records:
+                yield u"<tr>" + u"".join(u"<th>{}</th>".format(html_escape(cypher_str(key)))
+                                         for key in self._keys) + u"</tr>"
+            for record in records:
+                yield u"<tr>" + u"".join(template.format(html_escape(_cypher_text(value)))
+                                         for template, value in zip(templates, record)) + u"</tr>"
+            yield u"</table>"
+
+        _write_lines(file, lines())
+        return len(records)
 
     def write_separated_values(self, separator, file=None, header=None, skip=None, limit=None,
                                newline=u"\r\n", quote=u"\""):
@@ -503,41 +581,22 @@ class Table(list):
         :param quote: quote character
         :return: the number of records included in output
         """
-        from click import secho
-
-        escaped_quote = quote + quote
-        quotable = separator + newline + quote
-        header_styles = {}
-        if header and isinstance(header, dict):
-            header_styles.update(header)
-
-        def write_value(value, **styles):
-            if value is None:
-                return
-            if isinstance(value, string_types):
-                value = ustr(value)
-                if any(ch in value for ch in quotable):
-                    value = quote + value.replace(quote, escaped_quote) + quote
+        records = [self[index] for index in self._range(skip, limit)]
+
+        def line(values):
+            return separator.join(separated_value(value, separator, newline, quote)
+                                  for value in values) + newline
+
+        lines = map(line, records)
+        if header and records:
+            if isinstance(header, dict):
+                # Only styled headers need to pass through click
+                from click import secho
+                secho(line(self._keys), file, nl=False, **header)
             else:
-                value = cypher_repr(value)
-            secho(value, file, nl=False, **styles)
-
-        def write_line(values, **styles):
-            for i, value in enumerate(values):
-                if i > 0:
-                    secho(separator, file, nl=False, **styles)
-                write_value(value, **styles)
-            secho(newline, file, nl=False, **styles)
-
-        def apply(f):
-            count = 0
-            for count, index in enumerate(self._range(skip, limit), start=1):
-                if count == 1 and header:
-                    f(self.keys(), underline=u"-", **header_styles)
-                f(self[index])
-            return count
-
-        return apply(write_line)
+                lines = chain([line(self._keys)], lines)
+        _write_lines(file, lines)
+        return len(records)
 
     def write_csv(self, file=None, header=None, skip=None, limit=None):
         """ Write the data as RFC4180-compatible comma-separated values.
@@ -552,6 +611,253 @@ class Table(list):
         return self.write_separated_values(u"\t", file, header, skip, limit)
 
 
+
+class Table(_TableMixin, list):
+    """ Immutable list of records.
+    """
+
+    def __init__(self, records, keys=None):
+        super(Table, self).__init__(map(tuple, records))
+        if keys is None:
+            try:
+                k = records.keys()
+            except AttributeError:
+                raise ValueError("Missing keys")
+        else:
+            k = list(map(ustr, keys))
+        width = len(k)
+        t = [set() for _ in range(width)]
+        o = [False] * width
+        for record in self:
+            for i, value in enumerate(record):
+                if value is None:
+                    o[i] = True
+                else:
+                    t[i].add(type(value))
+        f = []
+        for i, _ in enumerate(k):
+            f.append({
+                "type": t[i].copy().pop() if len(t[i]) == 1 else tuple(t[i]),
+                "numeric": all(t_ in numeric_types for t_ in t[i]),
+                "optional": o[i],
+            })
+        self._keys = k
+        self._fields = f
+
+
+try:
+    array("q")
+except ValueError:
+    # Python 2 has no explicit 64-bit type code
+    _int64_typecode = "l"
+else:
+    _int64_typecode = "q"
+
+_typecodes = dict([(t, _int64_typecode) for t in integer_types] + [(float, "d")])
+
+
+def _column(values):
+    # Build storage and metadata for a single column of values. Columns
+    # containing only integers or only floats are packed into a typed
+    # array, with any nulls recorded separately in a byte mask.
+    types = set(map(type, values))
+    optional = type(None) in types
+    types.discard(type(None))
+    field = {
+        "type": types.copy().pop() if len(types) == 1 else tuple(types),
+        "numeric": all(t in numeric_types for t in types),
+        "optional": optional,
+    }
+    typecodes = set(_typecodes.get(t) for t in types)
+    if len(typecodes) == 1 and None not in typecodes:
+        typecode = typecodes.pop()
+        try:
+            if optional:
+                data = array(typecode, [0 if value is None else value for value in values])
+            else:
+                data = array(typecode, values)
+        except OverflowError:
+            pass
+        else:
+            mask = bytearray(value is None for value in values) if optional else None
+            return data, mask, field
+    return values, None, field
+
+
+def _column_values(data, mask):
+    # Unpack a column into a list, restoring any nulls
+    values = data.tolist() if isinstance(data, array) else list(data)
+    if mask is not None:
+        i = mask.find(b"\x01")
+        while i != -1:
+            values[i] = None
+            i = mask.find(b"\x01", i + 1)
+    return values
+
+
+class ColumnTable(_TableMixin, Sequence):
+    """ Immutable sequence of records, stored by column rather than by
+    row. Integer and float fields are held in typed arrays, with nulls
+    recorded in a separate mask, which uses substantially less memory
+    than a list of tuples for large numeric results. Field metadata is
+    derived once per column when the table is constructed.
+
+    A :class:`.ColumnTable` yields tuples when indexed or iterated and
+    provides the same :meth:`.keys`, :meth:`.field` and output methods
+    as a :class:`.Table`. It is not a :class:`list`, however:
+    concatenation, repetition and :meth:`.copy` return plain lists of
+    tuples, and item assignment is not supported.
+    """
+
+    def __init__(self, records, keys=None):
+        if keys is None:
+            try:
+                k = records.keys()
+            except AttributeError:
+                raise ValueError("Missing keys")
+        else:
+            k = list(map(ustr, keys))
+        rows = list(records)
+        columns = [_column(list(map(itemgetter(i), rows))) for i in range(len(k))]
+        self._keys = k
+        self._columns = [(data, mask) for data, mask, _ in columns]
+        self._fields = [field for _, _, field in columns]
+        self._length = len(rows)
+
+    @classmethod
+    def _derive(cls, keys, columns, fields, length):
+        inst = cls.__new__(cls)
+        inst._keys = keys
+        inst._columns = columns
+        inst._fields = fields
+        inst._length = length
+        return inst
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            columns = [(data[index], None if mask is None else mask[index]) for data, mask in self._columns]
+            return self._derive(self._keys, columns, self._fields, len(range(start, stop, step)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Table index out of range")
+        return tuple(None if mask is not None and mask[index] else data[index]
+                     for data, mask in self._columns)
+
+    def __iter__(self):
+        return iter(zip(*[_column_values(data, mask) for data, mask in self._columns]))
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __contains__(self, record):
+        return tuple(record) in iter(self)
+
+    def __eq__(self, other):
+        try:
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        return list(self) < other
+
+    def __le__(self, other):
+        return list(self) <= other
+
+    def __gt__(self, other):
+        return list(self) > other
+
+    def __ge__(self, other):
+        return list(self) >= other
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __mul__(self, n):
+        return list(self) * n
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return list(self)
+
+    def count(self, record):
+        return sum(1 for r in self if r == tuple(record))
+
+    def index(self, record, *args):
+        return list(self).index(tuple(record), *args)
+
+    def column(self, key):
+        """ Return a list of all values for a given field.
+        """
+        return _column_values(*self._columns[self._index(key)])
+
+    def select(self, *keys):
+        """ Return a new :class:`.ColumnTable` containing only the
+        fields specified. The column storage is shared rather than
+        copied.
+        """
+        indexes = [self._index(key) for key in keys]
+        return self._derive([self._keys[i] for i in indexes], [self._columns[i] for i in indexes],
+                            [self._fields[i] for i in indexes], self._length)
+
+    def to_ndarray(self, key=None, dtype=None):
+        """ Return the values of a single field as a one-dimensional
+        `numpy.ndarray <https://docs.scipy.org/doc/numpy/reference/generated/numpy.ndarray.html>`_
+        or, if no field is specified, the entire table as a
+        two-dimensional array. Integer and float fields are returned
+        as read-only views of the underlying storage and, where such a
+        field contains nulls, as a masked array.
+
+        .. note::
+           This method requires `numpy` to be installed.
+
+        :param key: field index or name (optional)
+        :param dtype:
+        :warns: If `numpy` is not installed
+        :returns: `ndarray <https://docs.scipy.org/doc/numpy/reference/generated/numpy.ndarray.html>`__ object.
+        """
+        try:
+            import numpy
+        except ImportError:
+            warn("Numpy is not installed.")
+            raise
+        if key is None:
+            if self._columns and all(isinstance(data, array) and mask is None for data, mask in self._columns):
+                values = numpy.column_stack([numpy.frombuffer(data, dtype=data.typecode)
+                                             for data, _ in self._columns])
+                return values if dtype is None else values.astype(dtype)
+            return numpy.array(list(map(list, self)), dtype=dtype)
+        data, mask = self._columns[self._index(key)]
+        if isinstance(data, array):
+            values = numpy.frombuffer(data, dtype=data.typecode)
+            values.flags.writeable = False
+            if mask is not None:
+                values = numpy.ma.masked_array(values, mask=numpy.frombuffer(mask, dtype=bool))
+        else:
+            values = numpy.empty(len(data), dtype=object)
+            values[:] = data
+        if dtype is not None:
+            values = values.astype(dtype)
+        return values
+
+
 class Subgraph(object):
     """ Arbitrary, unordered collection of nodes and relationships.
     """
@@ -629,6 +935,9 @@ class Subgraph(object):
     def __db_push__(self, tx):
         push_subgraph(tx, self)
 
+    def __db_resolve__(self, tx):
+        resolve_subgraph(tx, self)
+
     def __db_separate__(self, tx):
         separate_subgraph(tx, self)
 
@@ -752,6 +1061,13 @@ class Walkable(Subgraph):
         return self.__sequence[1::2]
 
 
+def _entity_uuid():
+    uuid = str(uuid4())
+    while "0" <= uuid[-7] <= "9":
+        uuid = str(uuid4())
+    return uuid
+
+
 class Entity(PropertyDict, Walkable):
     """ Base class for objects that can be optionally bound to a remote resource. This
     class is essentially a container for a :class:`.Resource` instance.
@@ -763,10 +1079,7 @@ class Entity(PropertyDict, Walkable):
     def __init__(self, iterable, properties):
         Walkable.__init__(self, iterable)
         PropertyDict.__init__(self, properties)
-        uuid = str(uuid4())
-        while "0" <= uuid[-7] <= "9":
-            uuid = str(uuid4())
-        self.__uuid__ = uuid
+        self.__uuid__ = _entity_uuid()
 
     def __repr__(self):
         return Walkable.__repr__(self)
@@ -826,6 +1139,8 @@ class Node(Entity):
         apply(obj)
         return inst
 
+    _batch = None
+
     def __init__(self, *labels, **properties):
         self._remote_labels = frozenset()
         self._labels = set(labels)
@@ -853,11 +1168,20 @@ class Node(Entity):
 
     def __getitem__(self, item):
         if self.graph is not None and self.identity is not None and "properties" in self._stale:
-            self.graph.pull(self)
+            self.__resolve()
         return Entity.__getitem__(self, item)
 
     def __ensure_labels(self):
         if self.graph is not None and self.identity is not None and "labels" in self._stale:
+            self.__resolve()
+
+    def __resolve(self):
+        # Load remote data for this node, together with any other
+        # nodes that were batched alongside it during hydration.
+        batch, self._batch = self._batch, None
+        if batch is not None:
+            batch.resolve()
+        if self._stale:
             self.graph.pull(self)
 
     @property
@@ -910,6 +1234,9 @@ class Relationship(Entity):
 
     """
 
+    # Registry of Relationship subclasses, keyed by type name
+    _types = {}
+
     @staticmethod
     def type(name):
         """ Return the :class:`.Relationship` subclass corresponding to a
@@ -918,10 +1245,15 @@ class Relationship(Entity):
         :param name: relationship type name
         :returns: `type` object
         """
-        for s in Relationship.__subclasses__():
-            if s.__name__ == name:
-                return s
-        return type(xstr(name), (Relationship,), {})
+        try:
+            return Relationship._types[name]
+        except KeyError:
+            for s in Relationship.__subclasses__():
+                if s.__name__ == name:
+                    break
+            else:
+                s = type(xstr(name), (Relationship,), {})
+            return Relationship._types.setdefault(name, s)
 
     @classmethod
     def cast(cls, obj, entities=None):
@@ -1079,3 +1411,121 @@ class Path(Walkable):
                     t, properties = entity
                     entities[i] = Relationship(start_node, t, end_node, **properties)
         Walkable.__init__(self, walk(*entities))
+
+
+class CompactEntity(object):
+    """ Base class for lightweight, read-only representations of remote
+    entities. These are returned in place of :class:`.Node` and
+    :class:`.Relationship` objects when a query is run with
+    ``entities="compact"``.
+
+    Properties are held in a plain :class:`dict` and may be read in
+    the same way as for full entities. Compact entities are not held
+    in the graph-wide entity cache and cannot be pushed or pulled.
+    """
+
+    __slots__ = ("graph", "identity", "properties", "_uuid")
+
+    def __init__(self, graph, identity, properties):
+        self.graph = graph
+        self.identity = identity
+        self.properties = properties
+        self._uuid = None
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other) or self.graph is None or self.identity is None:
+            return False
+        return self.graph == other.graph and self.identity == other.identity
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self.graph and self.identity:
+            return hash(self.graph.database) ^ hash(self.graph.name) ^ hash(self.identity)
+        else:
+            return hash(id(self))
+
+    def __len__(self):
+        return len(self.properties)
+
+    def __iter__(self):
+        return iter(self.properties)
+
+    def __contains__(self, key):
+        return key in self.properties
+
+    def __getitem__(self, key):
+        return self.properties.get(key)
+
+    @property
+    def __uuid__(self):
+        if self._uuid is None:
+            self._uuid = _entity_uuid()
+        return self._uuid
+
+    def get(self, key, default=None):
+        return self.properties.get(key, default)
+
+    def keys(self):
+        return self.properties.keys()
+
+    def values(self):
+        return self.properties.values()
+
+    def items(self):
+        return self.properties.items()
+
+
+class CompactNode(CompactEntity):
+    """ Lightweight, read-only counterpart of :class:`.Node`.
+    Labels are held as a sorted tuple, shared between all compact
+    nodes with the same set of labels.
+    """
+
+    __slots__ = ("labels",)
+
+    def __init__(self, graph, identity, labels, properties):
+        CompactEntity.__init__(self, graph, identity, properties)
+        self.labels = label_tuple(labels)
+
+    def __repr__(self):
+        return "<CompactNode identity=%r labels=%r properties=%r>" % (
+            self.identity, set(self.labels), self.properties)
+
+    def has_label(self, label):
+        return label in self.labels
+
+    def to_node(self):
+        """ Return a full :class:`.Node` for this entity.
+        """
+        return hydrate_node(self.graph, self.identity,
+                            metadata={"labels": list(self.labels)}, data=dict(self.properties))
+
+
+class CompactRelationship(CompactEntity):
+    """ Lightweight, read-only counterpart of :class:`.Relationship`.
+    Endpoints are held only by their identities.
+    """
+
+    __slots__ = ("start_identity", "end_identity", "type")
+
+    def __init__(self, graph, identity, start_identity, end_identity, type, properties):
+        CompactEntity.__init__(self, graph, identity, properties)
+        self.start_identity = start_identity
+        self.end_identity = end_identity
+        self.type = type
+
+    def __repr__(self):
+        return "<CompactRelationship identity=%r start=%r type=%r end=%r properties=%r>" % (
+            self.identity, self.start_identity, self.type, self.end_identity, self.properties)
+
+    def to_relationship(self):
+        """ Return a full :class:`.Relationship` for this entity.
+        The endpoint nodes will be loaded on first access.
+        """
+        return hydrate_relationship(self.graph, self.identity,
+                                    start=self.start_identity, end=self.end_identity,
+                                    type=self.type, data=dict(self.properties))
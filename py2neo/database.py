@@ -18,16 +18,20 @@
 
 from __future__ import absolute_import
 
-from collections import deque
+from collections import deque, OrderedDict
 from datetime import datetime
 from time import sleep
 from warnings import warn
 
 from py2neo.cypher import cypher_escape
-from py2neo.data import Table, Record
+from py2neo.data import Table, ColumnTable, Record, LazyRecord, Subgraph, Node, Relationship, Path, CompactNode, \
+    CompactRelationship, separated_value
 from py2neo.internal.addressing import get_connection_data
-from py2neo.internal.caching import ThreadLocalEntityCache
-from py2neo.internal.compat import string_types, xstr
+from py2neo.internal.caching import EntityCache
+from py2neo.internal.compat import monotonic, string_types, ustr, xstr, TimeoutError
+from py2neo.internal.operations import check_frame_primary_keys, create_nodes_from_frame, \
+    merge_nodes_from_frame
+from py2neo.internal.sci import fix_sci_parameters, sci_loaded
 from py2neo.internal.util import version_tuple, title_case, snake_case
 from py2neo.matching import NodeMatcher, RelationshipMatcher
 
@@ -71,6 +75,10 @@ class Database(object):
 
     _driver = None
     _graphs = None
+    _jmx_cache = None
+
+    #: Number of seconds for which the results of JMX queries are cached.
+    jmx_cache_ttl = 1.0
 
     @classmethod
     def forget_all(cls):
@@ -94,8 +102,15 @@ class Database(object):
             inst._driver = Driver(connection_data["uri"],
                                   auth=connection_data["auth"],
                                   encrypted=connection_data["secure"],
-                                  user_agent=connection_data["user_agent"])
+                                  user_agent=connection_data["user_agent"],
+                                  max_connections=connection_data["max_connections"],
+                                  blocking=connection_data["blocking"],
+                                  keep_alive=connection_data["keep_alive"],
+                                  compression=connection_data["compression"])
+            if isinstance(inst._driver, (HTTPDriver, HTTPSDriver)):
+                inst._driver._database = inst
             inst._graphs = {}
+            inst._jmx_cache = {}
             cls._instances[key] = inst
         return inst
 
@@ -152,39 +167,103 @@ class Database(object):
     def keys(self):
         return list(self)
 
-    def query_jmx(self, namespace, instance=None, name=None, type=None):
-        """ Query the JMX service attached to this database.
+    def _jmx_beans(self, query):
+        """ Run a server-filtered JMX query and return a list of
+        (namespace, terms, attributes) triples, one for each matching
+        MBean. Results are cached for :attr:`.jmx_cache_ttl` seconds.
         """
-        d = {}
-        for nom, _, attributes in self.default_graph.run("CALL dbms.queryJmx('')"):
+        now = monotonic()
+        try:
+            expiry, beans = self._jmx_cache[query]
+        except KeyError:
+            pass
+        else:
+            if now < expiry:
+                return beans
+        beans = []
+        for nom, _, attributes in self.default_graph.run("CALL dbms.queryJmx($query)", query=query):
             ns, _, terms = nom.partition(":")
-            if ns != namespace:
-                continue
             terms = dict(tuple(term.partition("=")[0::2]) for term in terms.split(","))
-            if instance is not None and instance != terms["instance"]:
-                continue
-            if name is not None and name != terms["name"]:
-                continue
-            if type is not None and type != terms["type"]:
-                continue
+            values = {}
             for attr_name, attr_data in attributes.items():
                 attr_value = attr_data.get("value")
                 if attr_value == "true":
-                    d[attr_name] = True
+                    values[attr_name] = True
                 elif attr_value == "false":
-                    d[attr_name] = False
+                    values[attr_name] = False
                 elif isinstance(attr_value, string_types) and "." in attr_value:
                     try:
-                        d[attr_name] = float(attr_value)
+                        values[attr_name] = float(attr_value)
                     except (TypeError, ValueError):
-                        d[attr_name] = attr_value
+                        values[attr_name] = attr_value
                 else:
                     try:
-                        d[attr_name] = int(attr_value)
+                        values[attr_name] = int(attr_value)
                     except (TypeError, ValueError):
-                        d[attr_name] = attr_value
+                        values[attr_name] = attr_value
+            beans.append((ns, terms, values))
+        self._jmx_cache[query] = (now + self.jmx_cache_ttl, beans)
+        return beans
+
+    def _cached_jmx_beans(self, query):
+        """ Return the cached beans for a JMX query, or :const:`None` if
+        no fresh entry exists.
+        """
+        try:
+            expiry, beans = self._jmx_cache[query]
+        except KeyError:
+            return None
+        if monotonic() < expiry:
+            return beans
+        return None
+
+    def query_jmx(self, namespace, instance=None, name=None, type=None):
+        """ Query the JMX service attached to this database.
+
+        Only those MBeans matching the given criteria are requested from
+        the server. Results are cached for :attr:`.jmx_cache_ttl` seconds
+        and a fresh :meth:`.snapshot` of the whole namespace will also be
+        used to answer subsequent queries.
+        """
+        criteria = [("instance", instance), ("name", name), ("type", type)]
+        beans = self._cached_jmx_beans("%s:*" % namespace)
+        if beans is None:
+            pattern = ",".join("%s=%s" % (key, value) for key, value in criteria if value is not None)
+            beans = self._jmx_beans("%s:%s" % (namespace, pattern + ",*" if pattern else "*"))
+        d = {}
+        for ns, terms, attributes in beans:
+            if ns != namespace:
+                continue
+            if any(value is not None and value != terms.get(key) for key, value in criteria):
+                continue
+            d.update(attributes)
         return d
 
+    def snapshot(self):
+        """ Return a dictionary containing all kernel facts for this
+        database, obtained from a single JMX query. The keys of this
+        dictionary correspond to the names of the individual
+        introspection properties, such as :attr:`.kernel_version` and
+        :attr:`.store_file_sizes`.
+        """
+        beans = self._jmx_beans("org.neo4j:*")
+        by_name = {}
+        for ns, terms, attributes in beans:
+            if ns == "org.neo4j":
+                by_name.setdefault(terms.get("name"), {}).update(attributes)
+        kernel = by_name.get("Kernel", {})
+        return {
+            "name": kernel.get("DatabaseName"),
+            "kernel_start_time": _jmx_time(kernel.get("KernelStartTime")),
+            "kernel_version": _jmx_kernel_version(kernel.get("KernelVersion")),
+            "product": kernel.get("KernelVersion"),
+            "store_creation_time": _jmx_time(kernel.get("StoreCreationDate")),
+            "store_id": kernel.get("StoreId"),
+            "primitive_counts": by_name.get("Primitive count", {}),
+            "store_file_sizes": by_name.get("Store file sizes", {}),
+            "config": by_name.get("Configuration", {}),
+        }
+
     @property
     def name(self):
         """ Return the name of the active Neo4j database.
@@ -197,15 +276,14 @@ class Database(object):
         """ Return the time from which this Neo4j instance was in operational mode.
         """
         info = self.query_jmx("org.neo4j", name="Kernel")
-        return datetime.fromtimestamp(info["KernelStartTime"] / 1000.0)
+        return _jmx_time(info["KernelStartTime"])
 
     @property
     def kernel_version(self):
         """ Return the version of Neo4j.
         """
         info = self.query_jmx("org.neo4j", name="Kernel")
-        version_string = info["KernelVersion"].partition("version:")[-1].partition(",")[0].strip()
-        return version_tuple(version_string)
+        return _jmx_kernel_version(info["KernelVersion"])
 
     @property
     def product(self):
@@ -219,7 +297,7 @@ class Database(object):
         """ Return the time when this Neo4j graph store was created.
         """
         info = self.query_jmx("org.neo4j", name="Kernel")
-        return datetime.fromtimestamp(info["StoreCreationDate"] / 1000.0)
+        return _jmx_time(info["StoreCreationDate"])
 
     @property
     def store_id(self):
@@ -251,6 +329,24 @@ class Database(object):
         return self.query_jmx("org.neo4j", name="Configuration")
 
 
+def _jmx_time(value):
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1000.0)
+
+
+def _jmx_kernel_version(value):
+    if value is None:
+        return None
+    version_string = value.partition("version:")[-1].partition(",")[0].strip()
+    return version_tuple(version_string)
+
+
+def _frame_ids(frame, identities):
+    from pandas import Series
+    return Series(identities, index=frame.index, name="id")
+
+
 class Graph(object):
     """ The `Graph` class represents the graph data storage space within
     a Neo4j graph database. Connection details are provided using URIs
@@ -265,18 +361,23 @@ class Graph(object):
 
     The full set of supported `settings` are:
 
-    ==============  =============================================  ==============  =============
-    Keyword         Description                                    Type            Default
-    ==============  =============================================  ==============  =============
-    ``auth``        A 2-tuple of (user, password)                  tuple           ``('neo4j', 'password')``
-    ``host``        Database server host name                      str             ``'localhost'``
-    ``password``    Password to use for authentication             str             ``'password'``
-    ``port``        Database server port                           int             ``7687``
-    ``scheme``      Use a specific URI scheme                      str             ``'bolt'``
-    ``secure``      Use a secure connection (TLS)                  bool            ``False``
-    ``user``        User to authenticate as                        str             ``'neo4j'``
-    ``user_agent``  User agent to send for all connections         str             `(depends on URI scheme)`
-    ==============  =============================================  ==============  =============
+    ===================  =================================================  ==============  =============
+    Keyword              Description                                        Type            Default
+    ===================  =================================================  ==============  =============
+    ``auth``             A 2-tuple of (user, password)                      tuple           ``('neo4j', 'password')``
+    ``blocking``         Wait for a free HTTP connection when all are busy  bool            ``False``
+    ``cache_size``       Number of recent entities to keep cached           int             ``0``
+    ``compression``      Request gzip-compressed HTTP responses             bool            ``False``
+    ``host``             Database server host name                          str             ``'localhost'``
+    ``keep_alive``       Keep connections alive between requests            bool            ``True``
+    ``max_connections``  Number of HTTP connections to keep pooled          int             ``10``
+    ``password``         Password to use for authentication                 str             ``'password'``
+    ``port``             Database server port                               int             ``7687``
+    ``scheme``           Use a specific URI scheme                          str             ``'bolt'``
+    ``secure``           Use a secure connection (TLS)                      bool            ``False``
+    ``user``             User to authenticate as                            str             ``'neo4j'``
+    ``user_agent``       User agent to send for all connections             str             `(depends on URI scheme)`
+    ===================  =================================================  ==============  =============
 
     Each setting can be provided as a keyword argument or as part of
     an ``http:``, ``https:``, ``bolt:`` or ``bolt+routing:`` URI. Therefore, the examples
@@ -287,6 +388,12 @@ class Graph(object):
         >>> graph_2 = Graph(host="localhost")
         >>> graph_3 = Graph("bolt://localhost:7687")
 
+    Only one `Graph` instance exists for each name within a database,
+    so settings that identify the same service return the same object.
+    The entity caches are created along with that instance, and asking
+    for a different ``cache_size`` afterwards raises a
+    :exc:`ValueError`.
+
     Once obtained, the `Graph` instance provides direct or indirect
     access to most of the functionality available within py2neo.
     """
@@ -297,18 +404,29 @@ class Graph(object):
     #: The :class:`.Schema` resource for this :class:`.Graph`.
     schema = None
 
-    node_cache = ThreadLocalEntityCache()
-    relationship_cache = ThreadLocalEntityCache()
+    #: The :class:`.EntityCache` of :class:`.Node` objects for this
+    #: :class:`.Graph`, shared by all threads.
+    node_cache = None
+
+    #: The :class:`.EntityCache` of :class:`.Relationship` objects for
+    #: this :class:`.Graph`, shared by all threads.
+    relationship_cache = None
 
     def __new__(cls, uri=None, **settings):
         name = settings.pop("name", "data")
+        cache_size = settings.pop("cache_size", None)
         database = Database(uri, **settings)
         if name in database:
             inst = database[name]
+            if cache_size is not None and cache_size != inst.node_cache.max_size:
+                raise ValueError("Graph %r already exists with cache_size=%r" %
+                                 (name, inst.node_cache.max_size))
         else:
             inst = object.__new__(cls)
             inst.database = database
             inst.schema = Schema(inst)
+            inst.node_cache = EntityCache(cache_size or 0)
+            inst.relationship_cache = EntityCache(cache_size or 0)
             inst.__name__ = name
             database[name] = inst
         return inst
@@ -351,6 +469,26 @@ class Graph(object):
         with self.begin() as tx:
             tx.create(subgraph)
 
+    def create_nodes_from_frame(self, frame, labels, relationships=None, return_ids=False, chunk_size=10000):
+        """ Run a :meth:`.Transaction.create_nodes_from_frame` operation,
+        using a separate :class:`.Transaction` for each chunk of rows.
+
+        :param frame: pandas DataFrame, one row per node
+        :param labels: label or labels for every node
+        :param relationships: dictionary mapping column names to
+                              (type, label, key) tuples
+        :param return_ids: if :const:`True`, return the node identities
+        :param chunk_size: number of rows to load per transaction
+        :returns: Series of node identities, if requested
+        """
+        identities = []
+        for start in range(0, len(frame), chunk_size):
+            with self.begin() as tx:
+                identities.extend(create_nodes_from_frame(tx, frame.iloc[start:start + chunk_size],
+                                                          labels, relationships, chunk_size))
+        if return_ids:
+            return _frame_ids(frame, identities)
+
     def delete(self, subgraph):
         """ Run a :meth:`.Transaction.delete` operation within an
         `autocommit` :class:`.Transaction`. To delete only the
@@ -393,7 +531,7 @@ class Graph(object):
         """
         return self.begin(autocommit=True).exists(subgraph)
 
-    def match(self, nodes=None, r_type=None, limit=None):
+    def match(self, nodes=None, r_type=None, limit=None, endpoints=True):
         """ Match and return all relationships with specific criteria.
 
         For example, to find all of Alice's friends::
@@ -405,8 +543,22 @@ class Graph(object):
                 a Set implies a match in any direction
         :param r_type: type of relationships to match (:const:`None` means any type)
         :param limit: maximum number of relationships to match (:const:`None` means unlimited)
-        """
-        return RelationshipMatcher(self).match(nodes=nodes, r_type=r_type).limit(limit)
+        :param endpoints: if :const:`True`, load the start and end nodes
+                of each relationship within the same result (see
+                :meth:`.RelationshipMatch.with_endpoints`)
+
+        .. note::
+            With `endpoints` enabled, the start and end nodes of every
+            matched relationship are hydrated from the server, which
+            includes any bound nodes passed in `nodes`. Local changes
+            to those nodes that have not been pushed are overwritten
+            with their stored labels and properties. Push such changes
+            first, or pass ``endpoints=False``, to keep them.
+        """
+        match = RelationshipMatcher(self).match(nodes=nodes, r_type=r_type).limit(limit)
+        if endpoints:
+            match = match.with_endpoints()
+        return match
 
     def match_one(self, nodes=None, r_type=None):
         """ Match and return one relationship with specific criteria.
@@ -433,6 +585,34 @@ class Graph(object):
         with self.begin() as tx:
             tx.merge(subgraph, label, *property_keys)
 
+    def merge_from_frame(self, frame, primary_label, primary_key, labels=(), relationships=None,
+                         return_ids=False, chunk_size=10000):
+        """ Run a :meth:`.Transaction.merge_from_frame` operation,
+        using a separate :class:`.Transaction` for each chunk of rows.
+
+        :param frame: pandas DataFrame, one row per node
+        :param primary_label: label on which to match any existing nodes
+        :param primary_key: column and property key on which to match any
+                            existing nodes
+        :param labels: additional label or labels for every node
+        :param relationships: dictionary mapping column names to
+                              (type, label, key) tuples
+        :param return_ids: if :const:`True`, return the node identities
+        :param chunk_size: number of rows to load per transaction
+        :returns: Series of node identities, if requested
+        :raises ValueError: if any row has no primary key value, in
+                            which case nothing is loaded
+        """
+        check_frame_primary_keys(frame, primary_key)
+        identities = []
+        for start in range(0, len(frame), chunk_size):
+            with self.begin() as tx:
+                identities.extend(merge_nodes_from_frame(tx, frame.iloc[start:start + chunk_size],
+                                                         primary_label, primary_key, labels,
+                                                         relationships, chunk_size))
+        if return_ids:
+            return _frame_ids(frame, identities)
+
     @property
     def name(self):
         return self.__name__
@@ -486,16 +666,33 @@ class Graph(object):
         """
         return RelationshipMatcher(self)
 
-    def run(self, cypher, parameters=None, **kwparameters):
+    def resolve(self, subgraph):
+        """ Run a :meth:`.Transaction.resolve` operation within a
+        :class:`.Transaction`.
+
+        :param subgraph: a :class:`.Node`, :class:`.Relationship` or other
+                         :class:`.Subgraph`, or an iterable of such objects
+        """
+        with self.begin() as tx:
+            tx.resolve(subgraph)
+
+    def run(self, cypher, parameters=None, lazy=False, entities="full", **kwparameters):
         """ Run a :meth:`.Transaction.run` operation within an
-        `autocommit` :class:`.Transaction`.
+        `autocommit` :class:`.Transaction`. Records are streamed from
+        the server as the returned cursor consumes them, and the
+        connection is held until the cursor is exhausted or closed.
 
         :param cypher: Cypher statement
         :param parameters: dictionary of parameters
+        :param lazy: if :const:`True`, return :class:`.LazyRecord`
+                     objects that hydrate each value on first access
+        :param entities: ``"full"`` or ``"compact"``; see
+                         :meth:`.Transaction.run`
         :param kwparameters: extra keyword parameters
         :return:
         """
-        return self.begin(autocommit=True).run(cypher, parameters, **kwparameters)
+        return self.begin(autocommit=True).run(cypher, parameters, lazy=lazy, entities=entities,
+                                               **kwparameters)
 
     def separate(self, subgraph):
         """ Run a :meth:`.Transaction.separate` operation within an
@@ -511,8 +708,12 @@ class Schema(object):
     """ The schema resource attached to a `Graph` instance.
     """
 
+    #: Default number of seconds to wait for indexes to come online.
+    default_timeout = 300
+
     def __init__(self, graph):
         self.graph = graph
+        self._descriptions = {}
 
     @property
     def node_labels(self):
@@ -530,35 +731,130 @@ class Schema(object):
         """ Create a schema index for a label and property
         key combination.
         """
-        self.graph.run("CREATE INDEX ON :%s(%s)" %
-                       (cypher_escape(label), ",".join(map(cypher_escape, property_keys)))).close()
-        while property_keys not in self.get_indexes(label):
-            sleep(0.1)
+        self.graph.run(_index_statement("CREATE", label, property_keys)).close()
+        self.await_indexes([(label, property_keys, None)])
 
     def create_uniqueness_constraint(self, label, *property_keys):
         """ Create a uniqueness constraint for a label.
         """
-        self.graph.run("CREATE CONSTRAINT ON (a:%s) "
-                       "ASSERT a.%s IS UNIQUE" %
-                       (cypher_escape(label), ",".join(map(cypher_escape, property_keys)))).close()
-        while property_keys not in self.get_uniqueness_constraints(label):
-            sleep(0.1)
+        self.graph.run(_constraint_statement("CREATE", label, property_keys)).close()
+        self.await_indexes([(label, property_keys, "node_unique_property")])
 
     def drop_index(self, label, *property_keys):
         """ Remove label index for a given property key.
         """
-        self.graph.run("DROP INDEX ON :%s(%s)" %
-                       (cypher_escape(label), ",".join(map(cypher_escape, property_keys)))).close()
+        self.graph.run(_index_statement("DROP", label, property_keys)).close()
 
     def drop_uniqueness_constraint(self, label, *property_keys):
         """ Remove the uniqueness constraint for a given property key.
         """
-        self.graph.run("DROP CONSTRAINT ON (a:%s) "
-                       "ASSERT a.%s IS UNIQUE" %
-                       (cypher_escape(label), ",".join(map(cypher_escape, property_keys)))).close()
-
-    def _get_indexes(self, label, t=None):
-        indexes = []
+        self.graph.run(_constraint_statement("DROP", label, property_keys)).close()
+
+    def apply(self, spec, timeout=None):
+        """ Bring the schema in line with a specification of indexes
+        and uniqueness constraints. All missing schema items are
+        created up front, after which this method waits once for all
+        indexes to come online.
+
+        The specification is a dictionary that may contain the keys
+        ``indexes`` and ``uniqueness_constraints``, each of which maps
+        to a sequence of tuples of label and one or more property keys::
+
+            >>> graph.schema.apply({
+            ...     "indexes": [("Person", "name"), ("Person", "born")],
+            ...     "uniqueness_constraints": [("Movie", "title")],
+            ... })
+
+        Items that already exist are left untouched; nothing is dropped.
+
+        :param spec: dictionary of schema items
+        :param timeout: maximum number of seconds to wait for indexes
+                        to come online
+        :return: list of (label, property_keys, type) tuples for each
+                 item created
+        :raises TimeoutError: as for :meth:`.await_indexes`
+        """
+        existing = {(label, tuple(properties), typ)
+                    for label, properties, _, typ in self._index_rows()}
+        existing_keys = {(label, properties) for label, properties, _ in existing}
+        created = []
+        for label_and_keys in spec.get("uniqueness_constraints", ()):
+            label, property_keys = label_and_keys[0], tuple(label_and_keys[1:])
+            if (label, property_keys, "node_unique_property") in existing:
+                continue
+            self.graph.run(_constraint_statement("CREATE", label, property_keys)).close()
+            created.append((label, property_keys, "node_unique_property"))
+            existing_keys.add((label, property_keys))
+        for label_and_keys in spec.get("indexes", ()):
+            label, property_keys = label_and_keys[0], tuple(label_and_keys[1:])
+            if (label, property_keys) in existing_keys:
+                continue
+            self.graph.run(_index_statement("CREATE", label, property_keys)).close()
+            created.append((label, property_keys, None))
+            existing_keys.add((label, property_keys))
+        if created:
+            self.await_indexes(created, timeout)
+        return created
+
+    def await_indexes(self, expected=(), timeout=None):
+        """ Wait for all indexes to come online, using the
+        ``db.awaitIndexes`` procedure. On servers that do not provide
+        this procedure, the schema is polled until each of the
+        `expected` (label, property_keys, type) items is online.
+
+        :param expected: schema items to wait for when polling
+        :param timeout: maximum number of seconds to wait
+        :raises TimeoutError: if polling gives up before every expected
+                              item is online (:exc:`socket.timeout`
+                              on Python 2)
+        """
+        from neo4j.exceptions import CypherError
+        if timeout is None:
+            timeout = self.default_timeout
+        try:
+            self.graph.run("CALL db.awaitIndexes($timeout)", timeout=timeout).close()
+        except (GraphError, CypherError) as error:
+            if error.code != "Neo.ClientError.Procedure.ProcedureNotFound":
+                raise
+        else:
+            return
+        deadline = monotonic() + timeout
+        pending = {(label, tuple(property_keys), typ) for label, property_keys, typ in expected}
+        while pending:
+            online = [(label, tuple(properties), typ)
+                      for label, properties, state, typ in self._index_rows()
+                      if state in (u"ONLINE", u"online")]
+            pending = {(label, property_keys, typ) for label, property_keys, typ in pending
+                       if not any(label == o[0] and property_keys == o[1] and typ in (None, o[2])
+                                  for o in online)}
+            if pending:
+                if monotonic() > deadline:
+                    raise TimeoutError("Timed out waiting for indexes to come online")
+                sleep(0.1)
+
+    def _parse_description(self, description):
+        """ Extract the label and property keys from an index description,
+        such as ``INDEX ON :Person(name)``. Parsed descriptions are cached.
+        """
+        try:
+            return self._descriptions[description]
+        except KeyError:
+            from py2neo.cypher.lexer import CypherLexer
+            from pygments.token import Token
+            lbl = None
+            properties = []
+            for token_type, token_value in CypherLexer().get_tokens(description):
+                if token_type is Token.Name.Label:
+                    lbl = token_value.strip("`")
+                elif token_type is Token.Name.Variable:
+                    properties.append(token_value.strip("`"))
+            parsed = self._descriptions[description] = (lbl, tuple(properties))
+            return parsed
+
+    def _index_rows(self):
+        """ Yield a (label, property_keys, state, type) tuple for each
+        index and constraint currently defined.
+        """
         for record in self.graph.run("CALL db.indexes"):
             lbl = None
             properties = []
@@ -568,23 +864,21 @@ class Schema(object):
                 description, state, typ = record
             else:
                 raise RuntimeError("Unexpected response from procedure db.indexes (%d fields)" % len(record))
+            if not lbl or not properties:
+                lbl, properties = self._parse_description(description)
+            if not lbl or not properties:
+                continue
+            yield lbl, tuple(properties), state, typ
+
+    def _get_indexes(self, label, t=None):
+        indexes = []
+        for lbl, properties, state, typ in self._index_rows():
             if state not in (u"ONLINE", u"online"):
                 continue
             if t and typ != t:
                 continue
-            if not lbl or not properties:
-                from py2neo.cypher.lexer import CypherLexer
-                from pygments.token import Token
-                tokens = list(CypherLexer().get_tokens(description))
-                for token_type, token_value in tokens:
-                    if token_type is Token.Name.Label:
-                        lbl = token_value.strip("`")
-                    elif token_type is Token.Name.Variable:
-                        properties.append(token_value.strip("`"))
-            if not lbl or not properties:
-                continue
             if lbl == label:
-                indexes.append(tuple(properties))
+                indexes.append(properties)
         return indexes
 
     def get_indexes(self, label):
@@ -598,11 +892,24 @@ class Schema(object):
         return self._get_indexes(label, "node_unique_property")
 
 
+def _index_statement(verb, label, property_keys):
+    return "%s INDEX ON :%s(%s)" % (verb, cypher_escape(label), ",".join(map(cypher_escape, property_keys)))
+
+
+def _constraint_statement(verb, label, property_keys):
+    return "%s CONSTRAINT ON (a:%s) ASSERT a.%s IS UNIQUE" % (
+        verb, cypher_escape(label), ",".join(map(cypher_escape, property_keys)))
+
+
 class Result(object):
     """ Wraps a BoltStatementResult
     """
 
-    def __init__(self, graph, entities, result):
+    #: The session of an autocommit transaction, held until the result
+    #: has been read in full or is closed.
+    session = None
+
+    def __init__(self, graph, entities, result, lazy=False, compact=False, session=None):
         from neo4j.v1 import BoltStatementResult
         from py2neo.internal.http import HTTPStatementResult
         from py2neo.internal.packstream import PackStreamHydrator
@@ -610,13 +917,34 @@ class Result(object):
         self.result.error_class = GraphError.hydrate
         # TODO: un-yuk this
         if isinstance(result, HTTPStatementResult):
-            self.result._hydrant.entities = entities
-            self.result_iterator = iter(self.result)
+            hydrant = self.result._hydrant
+            hydrant.entities = entities
+            records = iter(self.result)
         elif isinstance(result, BoltStatementResult):
-            self.result._hydrant = PackStreamHydrator(graph, result.keys(), entities)
-            self.result_iterator = iter(map(Record, self.result))
+            hydrant = self.result._hydrant = PackStreamHydrator(graph, result.keys(), entities)
+            records = map(Record, self.result)
         else:
             raise RuntimeError("Unexpected statement result class %r" % result.__class__.__name__)
+        hydrant.lazy = lazy
+        hydrant.compact = compact
+        if lazy:
+            hydrate_field = hydrant.hydrate_field
+            self.result_iterator = (LazyRecord(record.keys(), record.values(), hydrate_field)
+                                    for record in self.result)
+        else:
+            self.result_iterator = iter(records)
+        self.session = session
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """ Close the session held by this result, if any, buffering
+        any records not yet received and releasing the connection.
+        """
+        session, self.session = self.session, None
+        if session is not None:
+            session.close()
 
     def keys(self):
         """ Return the keys for the whole data set.
@@ -626,12 +954,18 @@ class Result(object):
     def summary(self):
         """ Return the summary.
         """
-        return self.result.summary()
+        from neo4j.v1 import CypherError
+        try:
+            return self.result.summary()
+        except CypherError as error:
+            raise GraphError.hydrate({"code": error.code, "message": error.message})
+        finally:
+            self.close()
 
     def plan(self):
         """ Return the query plan, if available.
         """
-        metadata = self.result.summary().metadata
+        metadata = self.summary().metadata
         plan = {}
         if "plan" in metadata:
             plan.update(metadata["plan"])
@@ -671,15 +1005,21 @@ class Result(object):
     def stats(self):
         """ Return the query statistics.
         """
-        return vars(self.result.summary().counters)
+        return vars(self.summary().counters)
 
     def fetch(self):
         """ Fetch and return the next item.
         """
+        from neo4j.v1 import CypherError
         try:
             return next(self.result_iterator)
         except StopIteration:
+            self.close()
             return None
+        except CypherError as error:
+            # Raised by Bolt for a failure after the result header
+            self.close()
+            raise GraphError.hydrate({"code": error.code, "message": error.message})
 
 
 class GraphError(Exception):
@@ -798,6 +1138,9 @@ class Transaction(object):
         self.driver = driver = self.graph.database.driver
         self.session = driver.session()
         self.results = []
+        # The HTTP transport converts NumPy and pandas values as it
+        # encodes parameters, whereas Bolt needs them converting first
+        self._fix_sci_parameters = getattr(driver, "uri_scheme", None) not in ("http", "https")
         if autocommit:
             self.transaction = None
         else:
@@ -826,36 +1169,67 @@ class Transaction(object):
         """
         return self._finished
 
-    def run(self, cypher, parameters=None, **kwparameters):
+    def run(self, cypher, parameters=None, lazy=False, entities="full", **kwparameters):
         """ Send a Cypher statement to the server for execution and return
         a :py:class:`.Cursor` for navigating its result.
 
         :param cypher: Cypher statement
-        :param parameters: dictionary of parameters
+        :param parameters: dictionary of parameters, in which any NumPy
+                           or pandas values are converted to native values
+        :param lazy: if :const:`True`, the cursor will yield
+                     :class:`.LazyRecord` objects, each of which holds
+                     raw values and hydrates them individually on first
+                     access
+        :param entities: ``"full"`` to return nodes and relationships as
+                         :class:`.Node` and :class:`.Relationship` objects,
+                         or ``"compact"`` to return them as read-only
+                         :class:`.CompactNode` and :class:`.CompactRelationship`
+                         objects; paths are always returned in full
         :returns: :py:class:`.Cursor` object
+
+        Within an `autocommit` transaction, the statement is sent and
+        the header of its result read before this method returns, so
+        that errors in the statement itself are raised here. Records
+        are then streamed as the cursor consumes them, with the
+        connection held until the cursor is exhausted or closed, or
+        its summary or statistics are read. An error that occurs part
+        way through the result is raised by the cursor.
         """
         from neo4j.v1 import CypherError
 
         self._assert_unfinished()
         try:
-            entities = self.entities.popleft()
+            mapped_entities = self.entities.popleft()
         except IndexError:
-            entities = {}
+            mapped_entities = {}
 
         try:
+            if entities not in ("full", "compact"):
+                raise ValueError("Unknown entity mode %r" % (entities,))
+            if self._fix_sci_parameters and sci_loaded():
+                parameters = fix_sci_parameters(dict(parameters or {}, **kwparameters))
+                kwparameters = {}
             if self.transaction:
                 result = self.transaction.run(cypher, parameters, **kwparameters)
             else:
                 result = self.session.run(cypher, parameters, **kwparameters)
+                self.session.send()
         except CypherError as error:
             raise GraphError.hydrate({"code": error.code, "message": error.message})
         else:
-            r = Result(self.graph, entities, result)
+            r = Result(self.graph, mapped_entities, result, lazy=lazy, compact=(entities == "compact"),
+                       session=None if self.transaction else self.session)
             self.results.append(r)
             return Cursor(r)
         finally:
             if not self.transaction:
-                self.finish()
+                if self.results and self.results[-1].session is self.session:
+                    # The session now belongs to the result, which
+                    # closes it once the records have been read
+                    self.session = None
+                    self._finished = True
+                else:
+                    self.finish()
 
     def process(self):
         """ Send all pending statements to the server for processing.
@@ -927,6 +1301,42 @@ class Transaction(object):
         else:
             create(self)
 
+    def create_nodes_from_frame(self, frame, labels, relationships=None, return_ids=False, chunk_size=10000):
+        """ Create a node for each row of a
+        `pandas.DataFrame <http://pandas.pydata.org/pandas-docs/stable/dsintro.html#dataframe>`_,
+        with properties taken from the columns of that row. Rows are
+        sent in chunks, each loaded by a single ``UNWIND`` statement,
+        and no :class:`.Node` objects are constructed.
+
+        Relationships to existing nodes can be created from the values
+        in specific columns, which are not then stored as properties.
+        For example, the following creates a ``WORKS_FOR`` relationship
+        from each new person to the company whose name is held in the
+        ``employer`` column::
+
+            >>> tx.create_nodes_from_frame(people, "Person",
+            ...                            relationships={"employer": ("WORKS_FOR", "Company", "name")})
+
+        Missing values are not stored, and relationships are only
+        created where a matching node exists.
+
+        .. note::
+           This method requires `pandas` to be installed.
+
+        :param frame: DataFrame, one row per node
+        :param labels: label or labels for every node
+        :param relationships: dictionary mapping column names to
+                              (type, label, key) tuples
+        :param return_ids: if :const:`True`, return the node identities
+        :param chunk_size: number of rows to send per statement
+        :returns: `Series <http://pandas.pydata.org/pandas-docs/stable/dsintro.html#series>`__
+                  of node identities, aligned with the index of `frame`, if
+                  requested
+        """
+        identities = create_nodes_from_frame(self, frame, labels, relationships, chunk_size)
+        if return_ids:
+            return _frame_ids(frame, identities)
+
     def delete(self, subgraph):
         """ Delete the remote nodes and relationships that correspond to
         those in a local subgraph. To delete only the relationships, use
@@ -990,6 +1400,39 @@ class Transaction(object):
         else:
             merge(self, primary_label, primary_key)
 
+    def merge_from_frame(self, frame, primary_label, primary_key, labels=(), relationships=None,
+                         return_ids=False, chunk_size=10000):
+        """ Merge a node for each row of a
+        `pandas.DataFrame <http://pandas.pydata.org/pandas-docs/stable/dsintro.html#dataframe>`_,
+        matching existing nodes on the basis of a primary label and the
+        value in a primary key column. As with :meth:`.merge`, the
+        properties of each node are replaced by those in its row. Rows
+        are loaded as described for :meth:`.create_nodes_from_frame`,
+        except that relationships are merged rather than created.
+
+        .. note::
+           This method requires `pandas` to be installed.
+
+        :param frame: DataFrame, one row per node
+        :param primary_label: label on which to match any existing nodes
+        :param primary_key: column and property key on which to match any
+                            existing nodes
+        :param labels: additional label or labels for every node
+        :param relationships: dictionary mapping column names to
+                              (type, label, key) tuples
+        :param return_ids: if :const:`True`, return the node identities
+        :param chunk_size: number of rows to send per statement
+        :returns: `Series <http://pandas.pydata.org/pandas-docs/stable/dsintro.html#series>`__
+                  of node identities, aligned with the index of `frame`, if
+                  requested
+        :raises ValueError: if any row has no primary key value, in
+                            which case nothing is sent
+        """
+        identities = merge_nodes_from_frame(self, frame, primary_label, primary_key, labels,
+                                            relationships, chunk_size)
+        if return_ids:
+            return _frame_ids(frame, identities)
+
     def pull(self, subgraph):
         """ Update local entities from their remote counterparts.
 
@@ -1026,6 +1469,27 @@ class Transaction(object):
         else:
             return push(self)
 
+    def resolve(self, subgraph):
+        """ Load properties and labels for all stale entities within a
+        local :class:`.Subgraph`. Stale entities are those known only
+        by identity, such as the end nodes of matched relationships,
+        and these are loaded together using a single query rather than
+        one per entity.
+
+        :param subgraph: a :class:`.Node`, :class:`.Relationship` or other
+                         :class:`.Subgraph`, or an iterable of such objects
+        """
+        try:
+            resolve = subgraph.__db_resolve__
+        except AttributeError:
+            nodes = []
+            relationships = []
+            for entity in subgraph:
+                nodes.extend(entity.nodes)
+                relationships.extend(entity.relationships)
+            resolve = Subgraph(nodes, relationships).__db_resolve__
+        resolve(self)
+
     def separate(self, subgraph):
         """ Delete the remote relationships that correspond to those in a local
         subgraph. This leaves any nodes untouched.
@@ -1041,6 +1505,32 @@ class Transaction(object):
             separate(self)
 
 
+def _json_value(value):
+    # Convert graph structures into JSON-compatible maps, for use when
+    # writing JSON Lines output. Nodes and relationships are themselves
+    # dictionaries, so cannot be left to the encoder's default function.
+    if isinstance(value, (Node, CompactNode)):
+        return OrderedDict([("identity", value.identity), ("labels", sorted(value.labels)),
+                            ("properties", dict(value))])
+    elif isinstance(value, Relationship):
+        return OrderedDict([("identity", value.identity), ("type", type(value).__name__),
+                            ("start", value.start_node.identity), ("end", value.end_node.identity),
+                            ("properties", dict(value))])
+    elif isinstance(value, CompactRelationship):
+        return OrderedDict([("identity", value.identity), ("type", value.type),
+                            ("start", value.start_identity), ("end", value.end_identity),
+                            ("properties", dict(value))])
+    elif isinstance(value, Path):
+        return OrderedDict([("nodes", list(map(_json_value, value.nodes))),
+                            ("relationships", list(map(_json_value, value.relationships)))])
+    elif isinstance(value, list):
+        return list(map(_json_value, value))
+    elif isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    else:
+        return value
+
+
 class Cursor(object):
     """ A `Cursor` is a navigator for a stream of records.
 
@@ -1117,6 +1607,8 @@ class Cursor(object):
     def close(self):
         """ Close this cursor and free up all associated resources.
         """
+        if self._result is not None:
+            self._result.close()
         self._result = None
         self._current = None
 
@@ -1221,13 +1713,19 @@ class Cursor(object):
         """
         return [record.data() for record in self]
 
-    def to_table(self):
+    def to_table(self, columnar=False):
         """ Consume and extract the entire result as a :class:`.Table`
         object.
 
+        :param columnar: if :const:`True`, return a :class:`.ColumnTable`,
+                         which stores values by field and is better
+                         suited to large numeric results
         :return: the full query result
         """
-        return Table(self)
+        if columnar:
+            return ColumnTable(self)
+        else:
+            return Table(self)
 
     def to_subgraph(self):
         """ Consume and extract the entire result as a :class:`.Subgraph`
@@ -1338,3 +1836,84 @@ class Cursor(object):
                 return MutableMatrix(list(map(list, self)))
             else:
                 return ImmutableMatrix(list(map(list, self)))
+
+    def write_separated_values(self, separator, file=None, header=None, newline=u"\r\n", quote=u"\"",
+                               chunk_size=1000):
+        """ Consume the result, streaming each record to a
+        delimiter-separated file as it is received. Unlike writing via
+        :meth:`.to_table`, records are not collected first and the
+        writer itself buffers no more than `chunk_size` lines, so memory
+        use does not grow with the size of the result. Records are read
+        from the server as they are written, both for :meth:`.Graph.run`
+        and within a :class:`.Transaction`, although a transport may read
+        a limited number of records ahead. Values are formatted as for
+        :meth:`.Table.write_separated_values`.
+
+        :param separator: field separator character
+        :param file: file-like object capable of receiving output
+                     (defaults to standard output)
+        :param header: boolean flag for addition of column headers
+        :param newline: newline character sequence
+        :param quote: quote character
+        :param chunk_size: number of records to write at a time
+        :return: the number of records included in output
+        """
+
+        def line(values):
+            return separator.join(separated_value(value, separator, newline, quote)
+                                  for value in values) + newline
+
+        if header:
+            lines = [line(self.keys())]
+        else:
+            lines = []
+        return self._write_lines(file, lines, line, chunk_size)
+
+    def write_csv(self, file=None, header=None, chunk_size=1000):
+        """ Stream the result as RFC4180-compatible comma-separated values.
+        This is a customised call to :meth:`.write_separated_values`.
+        """
+        return self.write_separated_values(u",", file, header, chunk_size=chunk_size)
+
+    def write_tsv(self, file=None, header=None, chunk_size=1000):
+        """ Stream the result as tab-separated values.
+        This is a customised call to :meth:`.write_separated_values`.
+        """
+        return self.write_separated_values(u"\t", file, header, chunk_size=chunk_size)
+
+    def write_jsonl(self, file=None, chunk_size=1000):
+        """ Consume the result, streaming each record to a
+        `JSON Lines <http://jsonlines.org/>`_ file as a JSON object,
+        keyed by field name. Nodes, relationships and paths become JSON
+        objects and other values with no JSON equivalent, such as
+        temporal values, are written as strings. Records are streamed
+        as for :meth:`.write_separated_values`, with the writer itself
+        buffering no more than `chunk_size` lines.
+
+        :param file: file-like object capable of receiving output
+                     (defaults to standard output)
+        :param chunk_size: number of records to write at a time
+        :return: the number of records included in output
+        """
+        from json import JSONEncoder
+        encode = JSONEncoder(ensure_ascii=False, default=ustr).encode
+        keys = self.keys()
+
+        def line(values):
+            return ustr(encode(OrderedDict(zip(keys, map(_json_value, values))))) + u"\n"
+
+        return self._write_lines(file, [], line, chunk_size)
+
+    def _write_lines(self, file, lines, line, chunk_size):
+        if file is None:
+            from sys import stdout as file
+        write = file.write
+        count = 0
+        for count, record in enumerate(self, start=1):
+            lines.append(line(record))
+            if len(lines) >= chunk_size:
+                write(u"".join(lines))
+                del lines[:]
+        if lines:
+            write(u"".join(lines))
+        return count
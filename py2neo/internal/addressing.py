@@ -45,6 +45,10 @@ DEFAULT_HOST = "localhost"
 DEFAULT_BOLT_PORT = 7687
 DEFAULT_HTTP_PORT = 7474
 DEFAULT_HTTPS_PORT = 7473
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_BLOCKING = False
+DEFAULT_KEEP_ALIVE = True
+DEFAULT_COMPRESSION = False
 
 
 def address_str(address):
@@ -63,7 +67,11 @@ def get_connection_data(uri=None, **settings):
     :return:
     """
     data = {
+        "blocking": None,
+        "compression": None,
         "host": None,
+        "keep_alive": None,
+        "max_connections": None,
         "password": None,
         "port": None,
         "scheme": None,
@@ -100,6 +108,10 @@ def get_connection_data(uri=None, **settings):
     data["password"] = coalesce(settings.get("password"), data["password"])
     data["host"] = coalesce(settings.get("host"), data["host"])
     data["port"] = coalesce(settings.get("port"), data["port"])
+    data["max_connections"] = coalesce(settings.get("max_connections"), DEFAULT_MAX_CONNECTIONS)
+    data["blocking"] = coalesce(settings.get("blocking"), DEFAULT_BLOCKING)
+    data["keep_alive"] = coalesce(settings.get("keep_alive"), DEFAULT_KEEP_ALIVE)
+    data["compression"] = coalesce(settings.get("compression"), DEFAULT_COMPRESSION)
     # apply correct scheme for security
     if data["secure"] is True and data["scheme"] == "http":
         data["scheme"] = "https"
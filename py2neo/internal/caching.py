@@ -16,6 +16,7 @@
 # limitations under the License.
 
 
+from collections import OrderedDict
 from threading import Lock, local
 from weakref import WeakValueDictionary
 
@@ -63,3 +64,210 @@ class ThreadLocalEntityCache(local):
                 # insert or replace
                 self._dict[key] = value
                 return value
+
+
+class EntityCache(object):
+    """ Cache of entities, keyed by identity, that is shared between
+    threads.
+
+    Entities are held by weak reference and the cache is split into a
+    number of shards, each with its own lock, to reduce contention.
+    If `max_size` is non-zero, up to that many of the most recently
+    used entities are also held by strong reference so that they
+    survive even when not referenced elsewhere.
+
+    :param max_size: maximum number of entities to hold by strong
+                     reference, or zero to hold entities only weakly
+    :param shards: number of shards, reduced to `max_size` if that
+                   is smaller and non-zero
+    """
+
+    def __init__(self, max_size=0, shards=16):
+        self.max_size = max_size
+        if max_size:
+            # Give every shard a strong tier, dividing max_size exactly
+            shards = min(shards, max_size)
+        self._shards = [_EntityCacheShard(max_size // shards + (i < max_size % shards))
+                        for i in range(shards)]
+
+    def _shard(self, key):
+        shards = self._shards
+        return shards[hash(key) % len(shards)]
+
+    def __contains__(self, key):
+        shard = self._shard(key)
+        with shard.lock:
+            return key in shard.weak
+
+    def __getitem__(self, key):
+        return self._shard(key).get(key)
+
+    def __len__(self):
+        size = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.weak)
+        return size
+
+    def get_many(self, keys):
+        """ Return a dictionary of all values held for a collection of
+        keys. Keys with no value held are omitted. Each shard is locked
+        only once, however many of the keys it holds.
+        """
+        shards = self._shards
+        keys_by_shard = {}
+        for key in keys:
+            keys_by_shard.setdefault(hash(key) % len(shards), []).append(key)
+        values = {}
+        for i, shard_keys in keys_by_shard.items():
+            shards[i].get_many(shard_keys, values)
+        return values
+
+    def clear(self):
+        for shard in self._shards:
+            shard.clear()
+
+    def keys(self):
+        keys = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.weak.keys())
+        return keys
+
+    def stats(self):
+        """ Return a dictionary of hit, miss and eviction counts, plus
+        the numbers of entities currently held weakly and strongly.
+        """
+        stats = dict.fromkeys(["hits", "misses", "evictions", "size", "strong_size"], 0)
+        for shard in self._shards:
+            with shard.lock:
+                stats["hits"] += shard.hits
+                stats["misses"] += shard.misses
+                stats["evictions"] += shard.evictions
+                stats["size"] += len(shard.weak)
+                stats["strong_size"] += len(shard.strong)
+        return stats
+
+    def update(self, key, value):
+        """ Extract, insert or remove a value for a given key.
+        """
+        return self._shard(key).update(key, value)
+
+
+class _EntityCacheShard(object):
+
+    def __init__(self, max_size):
+        self.lock = Lock()
+        self.weak = WeakValueDictionary()
+        self.strong = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        with self.lock:
+            self.weak.clear()
+            self.strong.clear()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                value = self.weak[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            else:
+                self.hits += 1
+                self._touch(key, value)
+                return value
+
+    def get_many(self, keys, values):
+        with self.lock:
+            weak = self.weak
+            for key in keys:
+                try:
+                    value = weak[key]
+                except KeyError:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._touch(key, value)
+                    values[key] = value
+
+    def update(self, key, value):
+        with self.lock:
+            if value is None:
+                # remove
+                self.strong.pop(key, None)
+                try:
+                    del self.weak[key]
+                except KeyError:
+                    pass
+                return None
+            elif callable(value):
+                try:
+                    # extract
+                    existing_value = self.weak[key]
+                except KeyError:
+                    # construct and insert
+                    self.misses += 1
+                    new_value = value()
+                    self.weak[key] = new_value
+                    self._touch(key, new_value)
+                    return new_value
+                else:
+                    self.hits += 1
+                    self._touch(key, existing_value)
+                    return existing_value
+            else:
+                # insert or replace
+                self.weak[key] = value
+                self._touch(key, value)
+                return value
+
+    def _touch(self, key, value):
+        # Mark a value as most recently used in the strong tier,
+        # evicting the least recently used value if necessary.
+        if self.max_size:
+            strong = self.strong
+            strong.pop(key, None)
+            strong[key] = value
+            if len(strong) > self.max_size:
+                strong.popitem(last=False)
+                self.evictions += 1
+
+
+_labels = {}
+_label_sets = {}
+_label_tuples = {}
+
+
+def intern_label(label):
+    """ Return a shared instance of a label string.
+    """
+    return _labels.setdefault(label, label)
+
+
+def label_set(labels):
+    """ Return a shared frozenset of interned labels, so that nodes with
+    identical label sets can refer to a single frozenset instance.
+    """
+    key = frozenset(labels)
+    try:
+        return _label_sets[key]
+    except KeyError:
+        value = frozenset(map(intern_label, key))
+        return _label_sets.setdefault(value, value)
+
+
+def label_tuple(labels):
+    """ Return a shared, sorted tuple of interned labels, so that nodes
+    with identical label sets can refer to a single tuple instance.
+    """
+    key = tuple(sorted(labels))
+    try:
+        return _label_tuples[key]
+    except KeyError:
+        value = tuple(map(intern_label, key))
+        return _label_tuples.setdefault(value, value)
@@ -24,9 +24,9 @@ except ImportError:
     from ConfigParser import SafeConfigParser
 
 try:
-    from collections.abc import Mapping
+    from collections.abc import Mapping, Sequence
 except ImportError:
-    from collections import Mapping
+    from collections import Mapping, Sequence
 
 try:
     from urllib.parse import urlparse, urlsplit
@@ -38,6 +38,16 @@ try:
 except ImportError:
     from urllib import urlretrieve
 
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+try:
+    TimeoutError = TimeoutError
+except NameError:
+    from socket import timeout as TimeoutError
+
 try:
     from subprocess import DEVNULL
 except ImportError:
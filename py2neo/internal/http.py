@@ -19,8 +19,9 @@
 from __future__ import absolute_import
 
 from base64 import b64encode
-from collections import OrderedDict
-from json import dumps as json_dumps, loads as json_loads
+from collections import deque, OrderedDict
+from threading import Lock
+from timeit import default_timer as timer
 from warnings import catch_warnings, simplefilter
 
 from neo4j.addressing import SocketAddress
@@ -32,7 +33,8 @@ from py2neo.data import Record
 from py2neo.database import GraphError
 from py2neo.internal.addressing import get_connection_data
 from py2neo.internal.compat import urlsplit, ustr
-from py2neo.internal.json import JSONDehydrator
+from py2neo.internal.json import JSONStreamReader, json_codec
+from py2neo.internal.util import version_tuple
 
 
 # import logging
@@ -63,17 +65,30 @@ FORBIDDEN = 403
 NOT_FOUND = 404
 
 
-def fix_parameters(parameters):
-    if not parameters:
-        return {}
-    dehydrator = JSONDehydrator()
-    try:
-        dehydrated, = dehydrator.dehydrate([parameters])
-    except TypeError as error:
-        value = error.args[0]
-        raise TypeError("Parameters of type {} are not supported".format(type(value).__name__))
-    else:
-        return dehydrated
+def _meter_pool(pool, stats, lock):
+    # Wrap the method by which a urllib3 connection pool hands out
+    # connections, recording whether (and for how long) the pool had
+    # none available. The stats dictionary is held separately from the
+    # HTTP instance to avoid a reference cycle through the pool.
+    get_conn = pool._get_conn
+
+    def _get_conn(timeout=None):
+        exhausted = pool.pool is not None and pool.pool.empty()
+        t0 = timer()
+        try:
+            return get_conn(timeout=timeout)
+        finally:
+            t1 = timer()
+            with lock:
+                stats["requests"] += 1
+                if exhausted:
+                    if pool.block:
+                        stats["waits"] += 1
+                        stats["wait_time"] += t1 - t0
+                    else:
+                        stats["overflows"] += 1
+
+    pool._get_conn = _get_conn
 
 
 class HTTP(object):
@@ -84,30 +99,42 @@ class HTTP(object):
     def authorization(user, password):
         return 'Basic ' + b64encode((user + ":" + password).encode("utf-8")).decode("ascii")
 
-    def __init__(self, uri, headers, verified):
+    def __init__(self, uri, headers, verified, max_connections=10, blocking=False,
+                 keep_alive=True, compression=False, codec=None):
         self.uri = uri
         self.verified = verified
+        self.codec = codec or json_codec()
+        self.compression = compression
         parts = urlsplit(uri)
         scheme = parts.scheme
         host = parts.hostname
         port = parts.port
+        pool_settings = {"maxsize": max_connections, "block": blocking}
         if scheme == "http":
             from urllib3 import HTTPConnectionPool
-            self._http = HTTPConnectionPool("%s:%d" % (host, port))
+            self._http = HTTPConnectionPool("%s:%d" % (host, port), **pool_settings)
         elif scheme == "https":
             from urllib3 import HTTPSConnectionPool
             if verified:
                 from certifi import where
-                self._http = HTTPSConnectionPool("%s:%d" % (host, port), cert_reqs="CERT_REQUIRED", ca_certs=where())
+                self._http = HTTPSConnectionPool("%s:%d" % (host, port), cert_reqs="CERT_REQUIRED", ca_certs=where(),
+                                                 **pool_settings)
             else:
-                self._http = HTTPSConnectionPool("%s:%d" % (host, port))
+                self._http = HTTPSConnectionPool("%s:%d" % (host, port), **pool_settings)
         else:
             raise ValueError("Unsupported scheme %r" % scheme)
+        self._stats_lock = Lock()
+        self._stats = {"requests": 0, "waits": 0, "wait_time": 0.0, "overflows": 0}
+        _meter_pool(self._http, self._stats, self._stats_lock)
         self.path = parts.path
         if "auth" in headers:
             user, password = headers.pop("auth")
             headers["Authorization"] = 'Basic ' + b64encode(
                 (ustr(user) + u":" + ustr(password)).encode("utf-8")).decode("ascii")
+        if not keep_alive:
+            headers["Connection"] = "close"
+        if compression:
+            headers["Accept-Encoding"] = "gzip"
         self.headers = headers
 
     def __del__(self):
@@ -141,22 +168,31 @@ class HTTP(object):
         rs = self.request("GET", self.path + ref, headers=self.headers)
         try:
             if rs.status == 200:
-                return json_loads(rs.data.decode('utf-8'))
+                return self.codec.decode(rs.data)
             else:
                 self.raise_error(rs.status, rs.data)
         finally:
             rs.close()
 
-    def post(self, ref, json, expected):
-        """ Perform an HTTP POST to this resource.
+    def post(self, ref, json, expected, stream=False, encoded=False):
+        """ Perform an HTTP POST to this resource. If `encoded` is true,
+        `json` is taken to be an already encoded JSON document. If
+        `stream` is true, the response body is left unread, to be
+        consumed incrementally by the caller, who must then release the
+        connection.
         """
         headers = dict(self.headers)
         if json is not None:
             headers["Content-Type"] = "application/json"
-            json = json_dumps(json).encode('utf-8')
-        rs = self.request("POST", self.path + ref, headers=self.headers, body=json)
+            if not encoded:
+                json = self.codec.encode(json)
+        rs = self.request("POST", self.path + ref, headers=headers, body=json,
+                          preload_content=not stream)
         if rs.status not in expected:
-            self.raise_error(rs.status, rs.data)
+            try:
+                self.raise_error(rs.status, rs.data)
+            finally:
+                rs.release_conn()
         return rs
 
     def delete(self, ref, expected):
@@ -171,13 +207,27 @@ class HTTP(object):
         if self._http and self._http.pool:
             self._http.close()
 
+    def stats(self):
+        """ Return a dictionary of connection pool statistics: the
+        number of ``requests`` made, the number of times a request
+        ``waits`` for a free connection and the total ``wait_time`` in
+        seconds, the number of ``overflows`` for which a non-blocking
+        pool creates a connection it cannot keep, plus the number of
+        ``connections`` opened and the ``max_connections`` pooled.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["connections"] = self._http.num_connections
+        stats["max_connections"] = self._http.pool.maxsize if self._http.pool else 0
+        return stats
+
     def raise_error(self, status_code, data):
         if status_code == UNAUTHORIZED:
             raise AuthError(self.uri)
         if status_code == FORBIDDEN:
             raise Forbidden(self.uri)
         if data:
-            content = json_loads(data.decode('utf-8'))
+            content = self.codec.decode(data)
         else:
             content = {}
         message = content.pop("message", "HTTP request to <%s> returned unexpected status code %s" % (self.uri, status_code))
@@ -186,6 +236,54 @@ class HTTP(object):
         raise error
 
 
+# Result data formats for servers that cannot describe the entities
+# within rows. The graph section sent alongside the REST format gives
+# the endpoints of every relationship, so that path directions need no
+# further queries, which could not run while a result holds the only
+# connection available.
+REST_RESULT_DATA_CONTENTS = ("REST", "graph")
+
+
+def result_data_contents(http):
+    """ Select the format in which result data should be returned by
+    the server at the other end of an :class:`.HTTP` instance. The
+    ``row`` and ``graph`` formats are used together where the server
+    describes all entities within each row, falling back to the
+    ``REST`` and ``graph`` formats for older servers. Entity properties
+    are sent in both sections either way, but the former sends no URIs.
+
+    Returns :const:`None` if the server cannot be asked, for example
+    because it is unavailable or refuses the credentials, in which
+    case the fallback formats should be used until it can be.
+    """
+    from neo4j.v1 import ServiceUnavailable
+    from urllib3.exceptions import HTTPError
+    try:
+        version = version_tuple(http.get_json("")["neo4j_version"])
+    except (GraphError, AuthError, Forbidden, ServiceUnavailable, HTTPError):
+        return None
+    except (KeyError, AttributeError, ValueError):
+        return list(REST_RESULT_DATA_CONTENTS)
+    if version[:2] >= (3, 3):
+        return ["row", "graph"]
+    else:
+        return list(REST_RESULT_DATA_CONTENTS)
+
+
+def _driver_database(driver):
+    # Results are hydrated into the graph of the database that owns the
+    # driver, so that they share its entity caches. Drivers created
+    # directly fall back to the database with identical settings.
+    if driver._database is None:
+        from py2neo.database import Database
+        data = driver._connection_data
+        driver._database = Database(data["uri"], auth=data["auth"], secure=data["secure"],
+                                    verified=data["verified"], user_agent=data["user_agent"],
+                                    max_connections=data["max_connections"], blocking=data["blocking"],
+                                    keep_alive=data["keep_alive"], compression=data["compression"])
+    return driver._database
+
+
 class HTTPDriver(Driver):
 
     uri_scheme = "http"
@@ -196,6 +294,9 @@ class HTTPDriver(Driver):
 
     _graph = None
 
+    #: The :class:`.Database` that owns this driver, if any.
+    _database = None
+
     def __new__(cls, uri, **config):
         cls._check_uri(uri)
         instance = object.__new__(cls)
@@ -204,15 +305,20 @@ class HTTPDriver(Driver):
             "Authorization": HTTP.authorization(connection_data["user"], connection_data["password"]),
             "User-Agent": connection_data["user_agent"],
             "X-Stream": "true",
-        }, connection_data["verified"])
+        }, connection_data["verified"], max_connections=connection_data["max_connections"],
+            blocking=connection_data["blocking"], keep_alive=connection_data["keep_alive"],
+            compression=connection_data["compression"])
         instance._graph = None
         return instance
 
+    _result_data_contents = None
+
     def session(self, access_mode=None, bookmark=None):
         if self._graph is None:
-            from py2neo.database import Database
-            self._graph = Database(self._connection_data["uri"], auth=self._connection_data["auth"]).default_graph
-        return HTTPSession(self._graph, self._http)
+            self._graph = _driver_database(self).default_graph
+        if self._result_data_contents is None:
+            self._result_data_contents = result_data_contents(self._http)
+        return HTTPSession(self._graph, self._http, self._result_data_contents or REST_RESULT_DATA_CONTENTS)
 
 
 class HTTPSDriver(Driver):
@@ -225,6 +331,9 @@ class HTTPSDriver(Driver):
 
     _graph = None
 
+    #: The :class:`.Database` that owns this driver, if any.
+    _database = None
+
     def __new__(cls, uri, **config):
         cls._check_uri(uri)
         instance = object.__new__(cls)
@@ -233,19 +342,33 @@ class HTTPSDriver(Driver):
             "Authorization": HTTP.authorization(connection_data["user"], connection_data["password"]),
             "User-Agent": connection_data["user_agent"],
             "X-Stream": "true",
-        }, connection_data["verified"])
+        }, connection_data["verified"], max_connections=connection_data["max_connections"],
+            blocking=connection_data["blocking"], keep_alive=connection_data["keep_alive"],
+            compression=connection_data["compression"])
         instance._graph = None
         return instance
 
+    _result_data_contents = None
+
     def session(self, access_mode=None, bookmark=None):
         if self._graph is None:
-            from py2neo.database import Database
-            self._graph = Database(self._connection_data["uri"], auth=self._connection_data["auth"]).default_graph
-        return HTTPSession(self._graph, self._http)
+            self._graph = _driver_database(self).default_graph
+        if self._result_data_contents is None:
+            self._result_data_contents = result_data_contents(self._http)
+        return HTTPSession(self._graph, self._http, self._result_data_contents or REST_RESULT_DATA_CONTENTS)
 
 
 class HTTPResultLoader(object):
 
+    #: Set once the columns for this result have been received.
+    started = False
+
+    def columns(self, keys):
+        pass
+
+    def record(self, values):
+        pass
+
     def load(self, result):
         pass
 
@@ -253,6 +376,47 @@ class HTTPResultLoader(object):
         pass
 
 
+def read_transactional_response(reader):
+    """ Generate a sequence of events from a transactional endpoint
+    response as it is read, incrementally, from a
+    :class:`.JSONStreamReader`. Each event is a 2-tuple of
+    ``("columns", keys)``, ``("record", data)``, ``("result", metadata)``
+    or ``(key, value)`` for any other top-level key, such as ``"errors"``.
+    Records are generated between the columns and the metadata for each
+    result, the latter including everything except the data itself.
+    """
+    if not reader.start(u"{"):
+        return
+    while True:
+        key = reader.read_key()
+        if key == u"results":
+            if reader.start(u"["):
+                while True:
+                    result = {}
+                    if reader.start(u"{"):
+                        while True:
+                            result_key = reader.read_key()
+                            if result_key == u"data":
+                                if reader.start(u"["):
+                                    while True:
+                                        yield "record", reader.read_value()
+                                        if not reader.advance(u"]"):
+                                            break
+                            else:
+                                value = result[result_key] = reader.read_value()
+                                if result_key == u"columns":
+                                    yield "columns", value
+                            if not reader.advance(u"}"):
+                                break
+                    yield "result", result
+                    if not reader.advance(u"]"):
+                        break
+        else:
+            yield key, reader.read_value()
+        if not reader.advance(u"}"):
+            break
+
+
 class HTTPSession(Session):
 
     begin_ref = "transaction"
@@ -263,14 +427,23 @@ class HTTPSession(Session):
 
     commit_ref = None           # e.g. "transaction/1/commit"
 
-    def __init__(self, graph, http):
+    #: Size of the chunks in which streamed responses are read.
+    chunk_size = 65536
+
+    def __init__(self, graph, http, result_data_contents=REST_RESULT_DATA_CONTENTS):
         self.graph = graph
+        self.result_data_contents = list(result_data_contents)
         self.post = http.post
+        self.encode = http.codec.encode
         self.delete = http.delete
         self.ref = self.autocommit_ref
         self._statements = []
         self._result_loaders = []
         self._bookmark = None
+        # State of the response currently being streamed, if any
+        self._response = None
+        self._events = None
+        self._active_loaders = deque()
 
     def _connect(self, access_mode=None):
         pass
@@ -285,55 +458,113 @@ class HTTPSession(Session):
         if not statement:
             raise ValueError("Cannot run an empty statement")
 
-        self._statements.append(OrderedDict([
-            ("statement", ustr(statement)),
-            ("parameters", fix_parameters(dict(parameters or {}, **kwparameters))),
-            ("resultDataContents", ["REST"]),
-            ("includeStats", True),
-        ]))
+        # Statements are encoded individually, as they are run, so that
+        # unsupported parameter values are reported straight away.
+        try:
+            encoded = self.encode(OrderedDict([
+                ("statement", ustr(statement)),
+                ("parameters", dict(parameters or {}, **kwparameters)),
+                ("resultDataContents", self.result_data_contents),
+                ("includeStats", True),
+            ]))
+        except TypeError as error:
+            value = error.args[0]
+            raise TypeError("Parameters of type {} are not supported".format(type(value).__name__))
+        self._statements.append(encoded)
         result_loader = HTTPResultLoader()
         self._result_loaders.append(result_loader)
         return HTTPStatementResult(self, result_loader)
 
     def send(self):
-        self.sync()
-
-    def fetch(self):
-        return 0
-
-    def sync(self):
+        """ Send any pending statements and read the response up to the
+        header of the first result. The remainder of the response is
+        read on demand by :meth:`.fetch`.
+        """
         ref = self.ref
         # Some of the transactional URIs do not support empty statement
         # lists in versions earlier than 2.3. Which doesn't really matter
         # as it's a waste sending anything anyway.
         if ref in (self.autocommit_ref, self.begin_ref, self.transaction_ref) and not self._statements:
-            return 0
-        count = 0
+            return
+        self._drain()
         try:
-            response = self.post(ref, {"statements": self._statements}, expected=(OK, CREATED))
+            body = b'{"statements":[' + b",".join(self._statements) + b"]}"
+            response = self.post(ref, body, expected=(OK, CREATED), stream=True, encoded=True)
             if response.status == 201:
                 location_path = urlsplit(response.headers["Location"]).path
                 self.transaction_ref = "".join(location_path.rpartition("transaction")[1:])
                 self.commit_ref = "%s/commit" % self.transaction_ref
                 self.ref = self.transaction_ref
-            content = json_loads(response.data.decode("utf-8"))
-            errors = content["errors"]
-            if errors:
-                from py2neo.database import GraphError
-                raise GraphError.hydrate(errors[0])
-            for i, result_loader in enumerate(self._result_loaders):
-                try:
-                    count += result_loader.load(content["results"][i])
-                except IndexError:
-                    result_loader.fail()
-            return count
+            self._response = response
+            self._events = read_transactional_response(
+                JSONStreamReader(response.stream(self.chunk_size, decode_content=True)))
+            self._active_loaders.extend(self._result_loaders)
         finally:
             self._statements[:] = ()
             self._result_loaders[:] = ()
+        loaders = self._active_loaders
+        while self._events is not None and loaders and not loaders[0].started:
+            self.fetch()
 
-    def detach(self, result):
+    def fetch(self):
+        """ Read the next event from the response currently being
+        streamed, returning the number of records read (zero or one).
+        """
+        if self._events is None:
+            return 0
+        loaders = self._active_loaders
+        try:
+            event, value = next(self._events)
+        except StopIteration:
+            self._release(True)
+            return 0
+        except Exception:
+            self._release(False)
+            raise
+        if event == "record":
+            loaders[0].record(value)
+            return 1
+        elif event == "columns":
+            loaders[0].started = True
+            loaders[0].columns(value)
+        elif event == "result":
+            loaders.popleft().load(value)
+        elif event == "errors" and value:
+            from py2neo.database import GraphError
+            for _ in self._events:
+                pass
+            self._release(True)
+            raise GraphError.hydrate(value[0])
         return 0
 
+    def sync(self):
+        self.send()
+        return self._drain()
+
+    def _drain(self):
+        # Buffer the remainder of the response currently being streamed
+        count = 0
+        while self._events is not None:
+            count += self.fetch()
+        return count
+
+    def _release(self, complete):
+        # Finish with the response currently being streamed, failing
+        # any results that were not received in full
+        response = self._response
+        self._response = self._events = None
+        while self._active_loaders:
+            self._active_loaders.popleft().fail()
+        if not complete:
+            response.close()
+        response.release_conn()
+
+    def detach(self, result):
+        count = 0
+        while result.attached() and self._events is not None:
+            count += self.fetch()
+        return count
+
     def last_bookmark(self):
         return None
 
@@ -356,6 +587,7 @@ class HTTPSession(Session):
         self._transaction = None
         self._bookmark = None
         try:
+            self._drain()
             if self.transaction_ref:
                 self.ref = self.transaction_ref
                 self.delete(self.ref, expected=(OK, NOT_FOUND))
@@ -371,19 +603,21 @@ class HTTPStatementResult(StatementResult):
 
     zipper = Record
 
+    #: Number of records to read ahead while iterating, allowing path
+    #: directions to be looked up for a batch of records at a time.
+    read_ahead = 1000
+
     def __init__(self, session, result_loader):
         from py2neo.internal.json import JSONHydrator
 
         super(HTTPStatementResult, self).__init__(session, JSONHydrator(session.graph, ()))
 
+        def columns(keys):
+            self._keys = self._hydrant.keys = tuple(keys)
+
         def load(result):
             from neo4j.v1 import BoltStatementResultSummary
 
-            keys = self._keys = self._hydrant.keys = tuple(result["columns"])
-            hydrate = self._hydrant.hydrate
-            for record in result["data"]:
-                self._records.append(Record(zip(keys, hydrate(record["rest"]))))
-
             stats = result["stats"]
             # fix broken key
             if "relationship_deleted" in stats:
@@ -404,22 +638,36 @@ class HTTPStatementResult(StatementResult):
 
             self._summary = BoltStatementResultSummary(**metadata)
             self._session = None
-            return len(self._records)
 
         def fail():
             self._session = None
 
+        def record(data):
+            self._records.append(self._hydrant.unpack(data))
+
+        result_loader.columns = columns
+        result_loader.record = record
         result_loader.load = load
         result_loader.fail = fail
 
     def records(self):
-        """ Generator for records obtained from this result.
+        """ Generator for records obtained from this result. Records
+        are read from the network and hydrated as they are consumed.
 
         :yields: iterable of :class:`.Record` objects
         """
-        if self.attached():
-            self._session.send()
+        hydrant = self._hydrant
         records = self._records
         next_record = records.popleft
-        while records:
-            yield next_record()
+        attached = self.attached
+        if attached():
+            self._session.send()
+        while True:
+            while attached() and len(records) < self.read_ahead:
+                self._session.fetch()
+            if not records:
+                break
+            keys = self._keys
+            hydrant.prepare(records)
+            for _ in range(len(records)):
+                yield Record(zip(keys, hydrant.hydrate(next_record())))
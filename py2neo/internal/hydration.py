@@ -16,6 +16,9 @@
 # limitations under the License.
 
 
+from weakref import WeakValueDictionary
+
+from py2neo.internal.caching import label_set
 from py2neo.internal.collections import round_robin
 
 
@@ -42,10 +45,9 @@ def hydrate_node(graph, identity, inst=None, **rest):
         inst.update(rest["data"])
     if "metadata" in rest:
         inst._stale.discard("labels")
-        metadata = rest["metadata"]
-        inst._remote_labels = frozenset(metadata["labels"])
+        labels = inst._remote_labels = label_set(rest["metadata"]["labels"])
         inst.clear_labels()
-        inst.update_labels(metadata["labels"])
+        inst.update_labels(labels)
     return inst
 
 
@@ -79,6 +81,25 @@ def hydrate_relationship(graph, identity, inst=None, **rest):
     return inst
 
 
+def node_is_current(inst, labels, properties):
+    """ Return true if a node already holds a set of labels and a map of
+    properties, so that hydrating it from them would change nothing.
+    Labels are not compared if :const:`None`.
+    """
+    if inst._stale:
+        return False
+    if labels is not None and not inst._labels == inst._remote_labels == frozenset(labels):
+        return False
+    return dict.__eq__(inst, properties) is True
+
+
+def relationship_is_current(inst, properties):
+    """ Return true if a relationship already holds a map of properties,
+    so that hydrating it from them would change nothing.
+    """
+    return "properties" not in inst._stale and dict.__eq__(inst, properties) is True
+
+
 def hydrate_path(graph, data):
     from py2neo.data import Path
     node_ids = data["nodes"]
@@ -92,3 +113,36 @@ def hydrate_path(graph, data):
     inst = Path(*round_robin(nodes, relationships))
     inst.__metadata = data
     return inst
+
+
+class ResolutionBatch(object):
+    """ A group of stale nodes, such as the endpoints of relationships
+    returned within a single result, that are resolved together by a
+    single query when any one of them is first accessed.
+    """
+
+    #: Maximum number of nodes to hold in a single batch.
+    max_size = 1000
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.nodes = WeakValueDictionary()
+
+    def add(self, node):
+        """ Add a stale node to this batch, returning :const:`False` if
+        the batch is already full.
+        """
+        if len(self.nodes) >= self.max_size:
+            return False
+        node._batch = self
+        self.nodes[node.identity] = node
+        return True
+
+    def resolve(self):
+        """ Load properties and labels for all nodes in this batch.
+        """
+        nodes = list(self.nodes.values())
+        self.nodes.clear()
+        for node in nodes:
+            node._batch = None
+        self.graph.resolve(nodes)
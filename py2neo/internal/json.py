@@ -18,105 +18,637 @@
 
 from __future__ import absolute_import
 
+from codecs import getincrementaldecoder
+from itertools import chain
+from json import JSONDecoder, JSONEncoder, loads as json_loads
+from uuid import UUID
+from weakref import WeakValueDictionary
+
 from py2neo.internal.collections import is_collection
-from py2neo.internal.compat import bytes_types, integer_types, list_types, string_types, ustr
-from py2neo.internal.hydration import hydrate_node, hydrate_relationship, hydrate_path
+from py2neo.internal.compat import integer_types, list_types, string_types, unicode_types
+from py2neo.internal.hydration import ResolutionBatch, hydrate_node, hydrate_relationship, hydrate_path, \
+    node_is_current, relationship_is_current
+from py2neo.internal.sci import is_sci, sci_to_native
 
 
 INT64_MIN = -(2 ** 63)
 INT64_MAX = (2 ** 63) - 1
 
+# Translation tables for screening encoded documents. Only documents
+# containing a run of digits long enough to be an out-of-range integer,
+# or text shaped like a UUID, need to be checked value by value.
+_DIGITS = bytes(bytearray(48 if 48 <= c <= 57 else 32 for c in range(256)))
+_LONG_DIGITS = b"0" * 19
+_HEX_DIGITS = bytes(bytearray(120 if 48 <= c <= 57 or 97 <= c <= 102 else c if c == 45 else 32
+                              for c in range(256)))
+_UUID_SHAPE = b"-".join(b"x" * n for n in (8, 4, 4, 4, 12))
+
+# Types that need no screening before encoding with orjson, and the
+# types with which an enumeration must be mixed for the standard
+# library to encode its members
+_PLAIN_TYPES = frozenset(integer_types + string_types + (bool, type(None)))
+_ENUM_MIXIN_TYPES = integer_types + unicode_types + (float,)
+
+# The deepest nesting that orjson will encode
+_MAX_DEPTH = 255
+
+
+def _check_value(value):
+    """ Raise a :exc:`ValueError` for any integer outside the signed
+    64-bit range, or a :exc:`TypeError` for any UUID, within a value.
+    """
+    if isinstance(value, integer_types):
+        if not INT64_MIN <= value <= INT64_MAX:
+            raise ValueError("Integer out of bounds (64-bit signed integer values only)")
+    elif isinstance(value, UUID):
+        raise TypeError(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(key, UUID):
+                raise TypeError(key)
+            _check_value(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _check_value(item)
+
+
+def _uri_to_id(uri):
+    _, _, identity = uri.rpartition("/")
+    return int(identity)
+
+
+class RowValue(object):
+    """ The raw value of a single column from result data returned in
+    the ``row`` format, along with the positions of the entities within
+    it and the graph section that describes them.
+
+    Each entity position is held as a `(container, key, meta)` tuple,
+    where `container` is the list or dictionary holding the entity, or
+    :const:`None` if the entity is the value itself.
+    """
+
+    __slots__ = ("value", "entities", "graph")
+
+    def __init__(self, value, entities, graph):
+        self.value = value
+        self.entities = entities
+        self.graph = graph
+
+
+def _properties_match(value, meta, graph):
+    # Whether a map from a row holds the properties of the entity that
+    # a metadata entry describes. Entities deleted within the current
+    # transaction are not described by the graph section.
+    nodes, relationships = graph
+    entry = (relationships if meta.get("type") == "relationship" else nodes).get(meta.get("id"))
+    return entry is None or entry["properties"] == value
+
+
+def _row_graph(data):
+    # Index the graph section of a row by entity identity
+    nodes = {}
+    relationships = {}
+    if data:
+        for node in data["nodes"]:
+            nodes[int(node["id"])] = node
+        for relationship in data["relationships"]:
+            relationships[int(relationship["id"])] = relationship
+    return nodes, relationships
+
 
 class JSONHydrator(object):
 
+    #: If :const:`True`, :meth:`.hydrate` returns raw values untouched,
+    #: leaving each to be hydrated on demand by :meth:`.hydrate_field`.
+    lazy = False
+
+    #: If :const:`True`, nodes and relationships are hydrated into
+    #: read-only :class:`.CompactNode` and :class:`.CompactRelationship`
+    #: objects instead of full entities.
+    compact = False
+
     def __init__(self, graph, keys, entities=None):
         self.graph = graph
         self.keys = keys
         self.entities = entities or {}
+        # Identity maps of the entities hydrated within this result, so
+        # that repeat occurrences are not hydrated again.
+        self.nodes = WeakValueDictionary()
+        self.relationships = WeakValueDictionary()
+        self._batch = None
+        # Start node identities of path relationships, keyed by
+        # relationship identity, used to work out path directions.
+        self._start_nodes = {}
 
     def hydrate(self, values):
         """ Hydrate values from raw JSON representations into client objects.
         """
-        graph = self.graph
+        if self.lazy:
+            return tuple(values)
         entities = self.entities
         keys = self.keys
+        return tuple(self._hydrate(value, entities.get(keys[i])) for i, value in enumerate(values))
 
-        def uri_to_id(uri):
-            _, _, identity = uri.rpartition("/")
-            return int(identity)
+    def prepare(self, rows):
+        """ Look up, using a single query, the directions of all path
+        relationships within a set of raw rows, ahead of hydration.
+        No query is needed for relationships whose start nodes were
+        given by the graph section of the same result data.
+        """
+        relationships = set()
 
-        def hydrate_(data, inst=None):
+        def collect(data):
             if isinstance(data, dict):
-                if "self" in data:
+                if "nodes" in data and "relationships" in data and "directions" not in data:
+                    relationships.update(map(_uri_to_id, data["relationships"]))
+            elif is_collection(data):
+                for value in data:
+                    collect(value)
+
+        for values in rows:
+            collect(values)
+        relationships.difference_update(self._start_nodes)
+        if relationships:
+            cursor = self.graph.run("MATCH ()-[r]->() WHERE id(r) IN {x} RETURN id(r), id(startNode(r))",
+                                    x=list(relationships))
+            for r, start in cursor:
+                self._start_nodes[r] = start
+
+    def hydrate_field(self, index, value):
+        """ Hydrate a single raw value from the field at a given index.
+        """
+        return self._hydrate(value, self.entities.get(self.keys[index]))
+
+    def unpack(self, data):
+        """ Extract the raw value for each column from an item of result
+        data, in either the ``REST`` or the ``row`` and ``graph`` format.
+        """
+        try:
+            rest = data["rest"]
+        except KeyError:
+            pass
+        else:
+            # Record the start nodes of all relationships in the graph
+            # section, if sent, so that path directions can be worked
+            # out without a further query
+            if data.get("graph"):
+                start_nodes = self._start_nodes
+                for relationship in data["graph"]["relationships"]:
+                    start_nodes[int(relationship["id"])] = int(relationship["startNode"])
+            return rest
+        meta = data.get("meta") or []
+        graph = _row_graph(data.get("graph"))
+        values = []
+        pos = 0
+        for value in data["row"]:
+            entities = []
+            pos = self._align(value, meta, pos, graph, entities, None, None)
+            values.append(RowValue(value, entities, graph))
+        if pos != len(meta):
+            raise ValueError("Row metadata does not match row values")
+        return values
+
+    def _align(self, value, meta, pos, graph, entities, container, key):
+        # Match a value against the row metadata from position `pos`,
+        # recording the position of each entity within it, and return
+        # the position of the next unused metadata entry. The server
+        # flattens the metadata for lists and maps, sending one entry
+        # for each item within them, but sends a single entry for each
+        # node or relationship (a map of properties within the row) and
+        # each path (a list of property maps). An entry that describes
+        # an entity is only matched by a value equal to the properties
+        # of that entity in the graph section. Any other collection
+        # found at that entry must hold the entity, since its own items
+        # would otherwise have entries first.
+        #
+        # A collection with no items, or holding only such collections,
+        # has no entries of its own. So `RETURN {}, n` cannot be told
+        # apart from `RETURN n, {}` for a node without properties; the
+        # first such value is taken to be the entity.
+        m = meta[pos] if pos < len(meta) else None
+        if isinstance(value, dict):
+            if isinstance(m, dict):
+                entity_type = m.get("type")
+                if entity_type == "node" or entity_type == "relationship":
+                    if _properties_match(value, m, graph):
+                        entities.append((container, key, m))
+                        return pos + 1
+                else:
+                    # Other typed values, such as points
+                    return pos + 1
+            for k, item in value.items():
+                pos = self._align(item, meta, pos, graph, entities, value, k)
+            return pos
+        elif isinstance(value, list):
+            if (isinstance(m, list) and len(m) == len(value) and
+                    all(type(item) is dict and _properties_match(item, mi, graph) for item, mi in zip(value, m))):
+                entities.append((container, key, m))
+                return pos + 1
+            for i, item in enumerate(value):
+                pos = self._align(item, meta, pos, graph, entities, value, i)
+            return pos
+        elif isinstance(m, list) or (isinstance(m, dict) and m.get("type") in ("node", "relationship")):
+            raise ValueError("Row metadata does not match row values")
+        else:
+            return pos + 1
+
+    def _row_entity(self, m, graph, inst=None):
+        if isinstance(m, list):
+            return self._row_path(m, graph)
+        elif m["type"] == "node":
+            return self._row_node(m["id"], graph[0].get(m["id"]), inst)
+        else:
+            return self._row_relationship(m["id"], graph[1].get(m["id"]), inst)
+
+    def _row_node(self, identity, entry, inst=None, full=False):
+        graph = self.graph
+        if entry is None:
+            # Deleted within the current transaction
+            return hydrate_node(graph, identity, inst=inst)
+        if self.compact and inst is None and not full:
+            from py2neo.data import CompactNode
+            return CompactNode(graph, identity, entry["labels"], entry["properties"])
+        if inst is None:
+            # Repeat occurrences are only hydrated again if changed
+            inst = self.nodes.get(identity)
+            if inst is not None and node_is_current(inst, entry["labels"], entry["properties"]):
+                return inst
+        inst = self.nodes[identity] = hydrate_node(graph, identity, inst=inst,
+                                                   metadata={"labels": entry["labels"]},
+                                                   data=entry["properties"])
+        return inst
+
+    def _row_relationship(self, identity, entry, inst=None, full=False):
+        graph = self.graph
+        if entry is None:
+            # Deleted within the current transaction
+            if inst is not None:
+                return inst
+            try:
+                return self.relationships[identity]
+            except KeyError:
+                pass
+
+            def inst_constructor():
+                # Neither type nor endpoints are known, so these are
+                # left unbound and the properties marked as stale
+                from py2neo.data import Node, Relationship
+                new_inst = Relationship(Node(), Node())
+                new_inst.graph = graph
+                new_inst.identity = identity
+                new_inst._stale.add("properties")
+                return new_inst
+
+            inst = self.relationships[identity] = graph.relationship_cache.update(identity, inst_constructor)
+            return inst
+        start = int(entry["startNode"])
+        end = int(entry["endNode"])
+        if self.compact and inst is None and not full:
+            from py2neo.data import CompactRelationship
+            return CompactRelationship(graph, identity, start, end, entry["type"], entry["properties"])
+        if inst is None:
+            inst = self.relationships.get(identity)
+            if inst is not None and relationship_is_current(inst, entry["properties"]):
+                return inst
+        inst = self.relationships[identity] = hydrate_relationship(graph, identity, inst=inst,
+                                                                   start=start, end=end, type=entry["type"],
+                                                                   data=entry["properties"])
+        self._defer(inst.start_node)
+        self._defer(inst.end_node)
+        return inst
+
+    def _row_path(self, meta, graph):
+        from py2neo.data import Path
+        entities = []
+        for i, m in enumerate(meta):
+            if i % 2 == 0:
+                entities.append(self._row_node(m["id"], graph[0].get(m["id"]), full=True))
+            else:
+                entities.append(self._row_relationship(m["id"], graph[1].get(m["id"]), full=True))
+        return Path(*entities)
+
+    def _defer(self, node):
+        # Add a stale node to the current resolution batch, so that it
+        # can be loaded alongside others from the same result.
+        if node._stale and node._batch is None:
+            if self._batch is None or not self._batch.add(node):
+                self._batch = ResolutionBatch(self.graph)
+                self._batch.add(node)
+
+    def _hydrate(self, data, inst=None):
+        graph = self.graph
+        if type(data) is RowValue:
+            value = data.value
+            for container, key, m in data.entities:
+                if container is None:
+                    return self._row_entity(m, data.graph, inst)
+                container[key] = self._row_entity(m, data.graph)
+            return value
+        elif isinstance(data, dict):
+            if "self" in data:
+                identity = _uri_to_id(data["self"])
+                if self.compact and inst is None:
+                    from py2neo.data import CompactNode, CompactRelationship
                     if "type" in data:
-                        data["start"] = uri_to_id(data["start"])
-                        data["end"] = uri_to_id(data["end"])
-                        return hydrate_relationship(graph, uri_to_id(data["self"]), inst=inst, **data)
+                        return CompactRelationship(graph, identity, _uri_to_id(data["start"]),
+                                                   _uri_to_id(data["end"]), data["type"], data["data"])
                     else:
-                        return hydrate_node(graph, uri_to_id(data["self"]), inst=inst, **data)
-                elif "nodes" in data and "relationships" in data:
-                    data["nodes"] = list(map(uri_to_id, data["nodes"]))
-                    data["relationships"] = list(map(uri_to_id, data["relationships"]))
-                    if "directions" not in data:
-                        directions = []
-                        relationships = graph.evaluate(
-                            "MATCH ()-[r]->() WHERE id(r) IN {x} RETURN collect(r)",
-                            x=data["relationships"])
-                        for i, relationship in enumerate(relationships):
-                            if relationship.start_node.identity == data["nodes"][i]:
-                                directions.append("->")
-                            else:
-                                directions.append("<-")
-                        data["directions"] = directions
-                    return hydrate_path(graph, data)
+                        return CompactNode(graph, identity, data["metadata"]["labels"], data["data"])
+                if "type" in data:
+                    if inst is None:
+                        # Repeat occurrences are only hydrated again if changed
+                        inst = self.relationships.get(identity)
+                        if inst is not None and relationship_is_current(inst, data["data"]):
+                            return inst
+                    data["start"] = _uri_to_id(data["start"])
+                    data["end"] = _uri_to_id(data["end"])
+                    inst = self.relationships[identity] = hydrate_relationship(graph, identity, inst=inst, **data)
+                    self._defer(inst.start_node)
+                    self._defer(inst.end_node)
+                    return inst
                 else:
-                    # from warnings import warn
-                    # warn("Map literals returned over the Neo4j REST interface are ambiguous "
-                    #      "and may be hydrated as graph objects")
-                    return data
-            elif is_collection(data):
-                return type(data)(map(hydrate_, data))
+                    if inst is None:
+                        inst = self.nodes.get(identity)
+                        if inst is not None and node_is_current(inst, data.get("metadata", {}).get("labels"),
+                                                                data["data"]):
+                            return inst
+                    inst = self.nodes[identity] = hydrate_node(graph, identity, inst=inst, **data)
+                    return inst
+            elif "nodes" in data and "relationships" in data:
+                if "directions" not in data:
+                    self.prepare([[data]])
+                data["nodes"] = nodes = list(map(_uri_to_id, data["nodes"]))
+                data["relationships"] = relationships = list(map(_uri_to_id, data["relationships"]))
+                if "directions" not in data:
+                    start_nodes = self._start_nodes
+                    data["directions"] = ["->" if start_nodes.get(r) == nodes[i] else "<-"
+                                          for i, r in enumerate(relationships)]
+                path = hydrate_path(graph, data)
+                for node in path.nodes:
+                    self._defer(node)
+                return path
             else:
+                # from warnings import warn
+                # warn("Map literals returned over the Neo4j REST interface are ambiguous "
+                #      "and may be hydrated as graph objects")
                 return data
+        elif is_collection(data):
+            return type(data)(map(self._hydrate, data))
+        else:
+            return data
+
 
-        return tuple(hydrate_(value, entities.get(keys[i])) for i, value in enumerate(values))
+class JSONCodec(object):
+    """ Codec for the JSON documents exchanged with the server, built
+    on the standard library :mod:`json` module. Documents are encoded
+    to, and decoded from, UTF-8 bytes.
 
+    Values with no native JSON representation are passed to
+    :meth:`.dehydrate` by the encoder itself, so that checking and
+    serialising a document takes a single traversal. Non-finite floats
+    are rejected, as the server cannot parse them.
+    """
 
-class JSONDehydrator(object):
+    #: Name of the underlying JSON library.
+    name = "json"
 
     def __init__(self):
-        self.dehydration_functions = {}
+        self._encode = JSONEncoder(default=self.dehydrate, separators=(",", ":"), allow_nan=False).encode
+
+    @staticmethod
+    def dehydrate(obj):
+        """ Convert a value that JSON cannot represent natively, or
+        raise a :exc:`TypeError` carrying that value if unsupported.
+        NumPy and pandas values are converted to native values.
+        """
+        if isinstance(obj, list_types):
+            return list(obj)
+        elif is_sci(obj):
+            return sci_to_native(obj)
+        raise TypeError(obj)
+
+    def encode(self, value):
+        """ Encode a value as a JSON document.
+
+        :raises TypeError: if the value contains anything that cannot
+            be represented in JSON
+        :raises ValueError: if the value contains an integer outside
+            the signed 64-bit range, or a non-finite float
+        """
+        data = self._encode(value).encode("utf-8")
+        if data.translate(_DIGITS).find(_LONG_DIGITS) != -1:
+            _check_value(value)
+        return data
 
-    def dehydrate(self, values):
-        """ Convert native values into PackStream values.
+    def decode(self, data):
+        """ Decode a JSON document.
         """
+        return json_loads(data.decode("utf-8"))
+
+
+class OrJSONCodec(JSONCodec):
+    """ Codec for the JSON documents exchanged with the server, built
+    on the optional `orjson <https://github.com/ijl/orjson>`_ library.
 
-        def dehydrate_(obj):
+    Only complete documents are decoded by orjson. Result data that is
+    streamed from the server is read incrementally by a
+    :class:`.JSONStreamReader`, which uses the standard library.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        from enum import Enum
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._error = orjson.JSONEncodeError
+        self._enum = Enum
+        # Match the standard library in converting non-string keys and
+        # in passing dates, times and dataclasses to the default function
+        self._options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME |
+                         orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def _screen(self, values, depth=0):
+        # orjson encodes non-finite floats as null and serialises every
+        # enumeration member by value, neither of which the standard
+        # library codec allows. Values are screened a level of nesting
+        # at a time, by the set of types found at that level, so values
+        # of the common scalar types are never inspected one by one.
+        # Structures nested more deeply than orjson allows are left for
+        # orjson to reject.
+        if not values or depth > _MAX_DEPTH:
+            return
+        nested = []
+        for t in set(map(type, values)).difference(_PLAIN_TYPES):
+            if issubclass(t, self._enum) and not issubclass(t, _ENUM_MIXIN_TYPES):
+                raise TypeError(next(value for value in values if type(value) is t))
+            elif issubclass(t, float):
+                floats = [value for value in values if type(value) is t]
+                total = sum(floats)
+                # The sum is only non-finite if a value is, or on overflow
+                if total - total != 0 and any(value - value != 0 for value in floats):
+                    raise ValueError("Out of range float values are not JSON compliant")
+            elif issubclass(t, dict):
+                nested.extend(chain.from_iterable(value.values() for value in values if type(value) is t))
+            elif issubclass(t, (list, tuple)):
+                nested.extend(chain.from_iterable(value for value in values if type(value) is t))
+        self._screen(nested, depth + 1)
+
+    def encode(self, value):
+        # orjson does not preserve the error raised by the default
+        # function, so it is captured here instead
+        errors = []
+
+        def dehydrate(obj):
             try:
-                f = self.dehydration_functions[type(obj)]
-            except KeyError:
-                pass
+                obj = self.dehydrate(obj)
+                self._screen([obj])
+            except (TypeError, ValueError) as error:
+                errors.append(error)
+                raise
             else:
-                return f(obj)
-            if obj is None:
-                return None
-            elif isinstance(obj, bool):
                 return obj
-            elif isinstance(obj, integer_types):
-                if INT64_MIN <= obj <= INT64_MAX:
-                    return obj
-                raise ValueError("Integer out of bounds (64-bit signed integer values only)")
-            elif isinstance(obj, float):
-                return obj
-            elif isinstance(obj, string_types):
-                return ustr(obj)
-            elif isinstance(obj, bytes_types):  # order is important here - bytes must be checked after string
-                raise TypeError("Parameters passed over JSON do not support BYTES")
-            elif isinstance(obj, list_types):
-                return list(map(dehydrate_, obj))
-            elif isinstance(obj, dict):
-                return {key: dehydrate_(value) for key, value in obj.items()}
+
+        self._screen([value])
+        try:
+            data = self._dumps(value, default=dehydrate, option=self._options)
+        except self._error as error:
+            if errors:
+                raise errors[0]
+            # orjson also refuses integers beyond 64 bits
+            raise ValueError(*error.args)
+        # orjson accepts unsigned 64-bit integers and always serialises
+        # UUIDs, both of which the standard library codec rejects
+        if (data.translate(_DIGITS).find(_LONG_DIGITS) != -1 or
+                data.translate(_HEX_DIGITS).find(_UUID_SHAPE) != -1):
+            _check_value(value)
+        return data
+
+    def decode(self, data):
+        return self._loads(data)
+
+
+def json_codec():
+    """ Return the fastest JSON codec available.
+    """
+    try:
+        return OrJSONCodec()
+    except ImportError:
+        return JSONCodec()
+
+
+class JSONStreamReader(object):
+    """ Incremental reader for a JSON document that arrives as a
+    sequence of byte chunks, such as a streamed HTTP response body.
+
+    Structural characters are consumed individually, whereas complete
+    values are decoded as soon as enough data has arrived. Only the
+    unread part of the document is ever held in memory.
+    """
+
+    whitespace = u" \t\r\n"
+
+    def __init__(self, chunks, encoding="utf-8"):
+        self._chunks = iter(chunks)
+        self._decoder = getincrementaldecoder(encoding)()
+        self._raw_decode = JSONDecoder().raw_decode
+        self._buffer = u""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=0):
+        """ Read chunks until at least `size` characters are buffered
+        (or at least one more chunk if `size` is zero), returning
+        :const:`False` if the end of the input had already been reached.
+        """
+        if self._eof:
+            return False
+        parts = [self._buffer[self._pos:]]
+        length = len(parts[0])
+        target = max(size, length + 1)
+        while length < target:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                parts.append(self._decoder.decode(b"", True))
+                break
             else:
-                raise TypeError(obj)
+                text = self._decoder.decode(chunk)
+                parts.append(text)
+                length += len(text)
+        self._buffer = u"".join(parts)
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """ Return the next non-whitespace character without consuming
+        it, or :const:`None` at the end of the input.
+        """
+        whitespace = self.whitespace
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            size = len(buffer)
+            while pos < size and buffer[pos] in whitespace:
+                pos += 1
+            self._pos = pos
+            if pos < size:
+                return buffer[pos]
+            if not self._fill():
+                return None
 
-        return tuple(map(dehydrate_, values))
+    def expect(self, chars):
+        """ Consume and return the next non-whitespace character, which
+        must be one of `chars`.
+        """
+        char = self.peek()
+        if char is None or char not in chars:
+            raise ValueError("Expected one of %r in JSON stream, found %r" % (chars, char))
+        self._pos += 1
+        return char
+
+    def start(self, char):
+        """ Consume the opening character of an object (``{``) or array
+        (``[``) and return :const:`True` if it contains any items. An
+        empty object or array is consumed in its entirety.
+        """
+        self.expect(char)
+        close = u"}" if char == u"{" else u"]"
+        if self.peek() == close:
+            self._pos += 1
+            return False
+        return True
+
+    def advance(self, close):
+        """ Consume the separator following an item in an object or
+        array, returning :const:`False` if that was the final item.
+        """
+        return self.expect(u"," + close) == u","
+
+    def read_key(self):
+        """ Read an object key and the colon that follows it.
+        """
+        key = self.read_value()
+        self.expect(u":")
+        return key
+
+    def read_value(self):
+        """ Decode and return the next complete value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # Incomplete value; read at least as much again
+                if not self._fill(2 * (len(self._buffer) - self._pos)):
+                    raise
+            else:
+                if end == len(self._buffer) and isinstance(value, (integer_types, float)) and self._fill():
+                    # A number at the end of the buffer may continue
+                    # into the next chunk, so check before accepting it
+                    continue
+                self._pos = end
+                return value
@@ -20,17 +20,25 @@ from __future__ import absolute_import
 
 
 __all__ = [
+    "check_frame_primary_keys",
+    "create_nodes_from_frame",
     "create_subgraph",
     "delete_subgraph",
+    "merge_nodes_from_frame",
     "merge_subgraph",
     "pull_subgraph",
     "push_subgraph",
+    "resolve_subgraph",
     "separate_subgraph",
     "subgraph_exists",
 ]
 
 
 from py2neo.cypher import cypher_escape
+from py2neo.internal.compat import string_types, ustr
+from py2neo.internal.caching import label_set
+from py2neo.internal.hydration import hydrate_node
+from py2neo.internal.sci import frame_columns
 
 
 def _node_create_dict(nodes):
@@ -42,7 +50,7 @@ def _node_create_dict(nodes):
     """
     d = {}
     for node in nodes:
-        key = frozenset(node.labels)
+        key = label_set(node.labels)
         d.setdefault(key, []).append(node)
     return d
 
@@ -61,7 +69,7 @@ def _node_merge_dict(primary_label, primary_key, nodes):
     for node in nodes:
         p_label = getattr(node, "__primarylabel__", None) or primary_label
         p_key = getattr(node, "__primarykey__", None) or primary_key
-        key = (p_label, p_key, frozenset(node.labels))
+        key = (p_label, p_key, label_set(node.labels))
         d.setdefault(key, []).append(node)
     return d
 
@@ -180,6 +188,118 @@ def merge_subgraph(tx, subgraph, p_label, p_key):
             graph.relationship_cache.update(identity, relationship)
 
 
+def _label_string(labels):
+    if isinstance(labels, string_types):
+        labels = [labels]
+    return "".join(":" + cypher_escape(label) for label in sorted(set(labels)))
+
+
+def _load_frame(tx, frame, node_clause, key_column, relationships, relationship_clause, chunk_size):
+    """ Load the rows of a pandas DataFrame as nodes, using one UNWIND
+    statement per chunk of rows.
+
+    Each row is sent as a list of [position, properties, key value,
+    relationship target values...], built from the frame column by
+    column. Node identities are returned in row order.
+    """
+    keys, columns = frame_columns(frame)
+    relationships = list((relationships or {}).items())
+    excluded = set(column for column, _ in relationships)
+    property_keys = [key for key in keys if key not in excluded]
+    property_columns = [columns[keys.index(key)] for key in property_keys]
+    size = len(frame)
+    if property_columns:
+        properties = [dict(zip(property_keys, row)) for row in zip(*property_columns)]
+    else:
+        properties = [{} for _ in range(size)]
+    keys_values = columns[keys.index(key_column)] if key_column else [None] * size
+    targets = [columns[keys.index(column)] for column, _ in relationships]
+    rows = [list(row) for row in zip(range(size), properties, keys_values, *targets)]
+
+    clauses = ["UNWIND $x AS data", node_clause]
+    for i, (column, (r_type, label, key)) in enumerate(relationships):
+        target = "_%d" % i
+        clauses.append("WITH _, data OPTIONAL MATCH (%s:%s {%s:data[%d]})" % (
+            target, cypher_escape(label), cypher_escape(key), 3 + i))
+        clauses.append("WITH _, data, collect(%s) AS %s" % (target, target))
+        clauses.append("FOREACH (b IN %s | %s (_)-[:%s]->(b))" % (
+            target, relationship_clause, cypher_escape(r_type)))
+    clauses.append("RETURN data[0], id(_)")
+    cypher = " ".join(clauses)
+
+    identities = [None] * size
+    for start in range(0, size, chunk_size):
+        for position, identity in tx.run(cypher, x=rows[start:start + chunk_size]):
+            identities[position] = identity
+    return identities
+
+
+def create_nodes_from_frame(tx, frame, labels, relationships=None, chunk_size=10000):
+    """ Create a node for each row of a pandas DataFrame.
+
+    :param tx:
+    :param frame: DataFrame of node properties, one row per node
+    :param labels: label or labels for every node
+    :param relationships: dictionary mapping column names to 3-tuples of
+                          (type, label, key); each such column holds the
+                          key value of an existing node to which an
+                          outgoing relationship is created
+    :param chunk_size: number of rows to send per statement
+    :return: list of node identities, in row order
+    """
+    node_clause = "CREATE (_%s) SET _ = data[1]" % _label_string(labels)
+    return _load_frame(tx, frame, node_clause, None, relationships, "CREATE", chunk_size)
+
+
+def check_frame_primary_keys(frame, primary_key):
+    """ Check that a pandas DataFrame has a primary key column with a
+    value in every row. Rows without one would otherwise reach MERGE
+    with a null key, which the server rejects part way through a load.
+
+    :raises ValueError: if the column is missing or has missing values
+    """
+    keys = [ustr(key) for key in frame.columns]
+    try:
+        index = keys.index(primary_key)
+    except ValueError:
+        raise ValueError("Primary key column %r not found" % primary_key)
+    missing = frame.iloc[:, index].isnull()
+    if missing.any():
+        raise ValueError("Primary key column %r has missing values in %d row(s), "
+                         "starting at index %s" % (primary_key, missing.sum(), missing.idxmax()))
+
+
+def merge_nodes_from_frame(tx, frame, primary_label, primary_key, labels=(), relationships=None,
+                           chunk_size=10000):
+    """ Merge a node for each row of a pandas DataFrame, on the basis of
+    a primary label and the value of a primary key column.
+
+    :param tx:
+    :param frame: DataFrame of node properties, one row per node
+    :param primary_label: label on which to match any existing nodes
+    :param primary_key: column and property key on which to match any
+                        existing nodes
+    :param labels: additional label or labels for every node
+    :param relationships: dictionary mapping column names to 3-tuples of
+                          (type, label, key); each such column holds the
+                          key value of an existing node to which an
+                          outgoing relationship is merged
+    :param chunk_size: number of rows to send per statement
+    :return: list of node identities, in row order
+    :raises ValueError: if the primary key column is missing, has
+                        missing values or is also a relationship column
+    """
+    if primary_key in (relationships or {}):
+        raise ValueError("Primary key column %r cannot also be a relationship column" % primary_key)
+    check_frame_primary_keys(frame, primary_key)
+    node_clause = "MERGE (_:%s {%s:data[2]}) SET _ = data[1]" % (cypher_escape(primary_label),
+                                                                 cypher_escape(primary_key))
+    label_string = _label_string(labels)
+    if label_string:
+        node_clause += " SET _%s" % label_string
+    return _load_frame(tx, frame, node_clause, primary_key, relationships, "MERGE", chunk_size)
+
+
 def delete_subgraph(tx, subgraph):
     """ Delete data in a remote :class:`.Graph` based on a local
     :class:`.Subgraph`.
@@ -246,7 +366,7 @@ def pull_subgraph(tx, subgraph):
     for node, cursor in nodes.items():
         new_labels = cursor.evaluate(1)
         if new_labels:
-            node._remote_labels = frozenset(new_labels)
+            node._remote_labels = new_labels = label_set(new_labels)
             labels = node._labels
             labels.clear()
             labels.update(new_labels)
@@ -279,6 +399,38 @@ def push_subgraph(tx, subgraph):
             tx.run("\n".join(clauses), parameters)
 
 
+def resolve_subgraph(tx, subgraph):
+    """ Load data for all stale entities within a local :class:`.Subgraph`
+    using one query for nodes and one for relationships.
+
+    :param tx:
+    :param subgraph:
+    :return:
+    """
+    graph = tx.graph
+    nodes = {}
+    for node in subgraph.nodes:
+        if node.graph is graph and node._stale:
+            nodes.setdefault(node.identity, []).append(node)
+    if nodes:
+        for remote, in tx.run("MATCH (_) WHERE id(_) IN $x RETURN _", x=list(nodes)):
+            for node in nodes[remote.identity]:
+                if node is not remote:
+                    hydrate_node(graph, remote.identity, inst=node,
+                                 metadata={"labels": remote._remote_labels}, data=remote)
+    relationships = {}
+    for relationship in subgraph.relationships:
+        if relationship.graph is graph and "properties" in relationship._stale:
+            relationships.setdefault(relationship.identity, []).append(relationship)
+    if relationships:
+        for remote, in tx.run("MATCH ()-[_]->() WHERE id(_) IN $x RETURN _", x=list(relationships)):
+            for relationship in relationships[remote.identity]:
+                relationship._stale.discard("properties")
+                if relationship is not remote:
+                    relationship.clear()
+                    relationship.update(remote)
+
+
 def subgraph_exists(tx, subgraph):
     """ Determine whether one or more graph entities all exist within the
     database. Note that if any nodes or relationships in *subgraph* are not
@@ -19,73 +19,205 @@
 from __future__ import absolute_import
 
 from collections import namedtuple
+from weakref import WeakValueDictionary
 
 from neo4j.packstream.structure import Structure
 from neo4j.v1.types import PackStreamHydrator as _PackStreamHydrator
 
-from py2neo.internal.hydration import hydrate_node, hydrate_relationship
+from py2neo.internal.compat import atomic_types
+from py2neo.internal.hydration import ResolutionBatch, hydrate_node, hydrate_relationship, \
+    node_is_current, relationship_is_current
 
 
 _unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
 
+_primitive_types = frozenset(atomic_types + (type(None),))
+
+
+def _is_primitive(obj):
+    """ Return true if `obj` is an atomic value, or a list or dictionary
+    containing only atomic values, and therefore requires no hydration.
+    """
+    t = type(obj)
+    if t in _primitive_types:
+        return True
+    elif t is list:
+        return all(type(item) in _primitive_types for item in obj)
+    elif t is dict:
+        return all(type(value) in _primitive_types for value in obj.values())
+    else:
+        return False
+
 
 class PackStreamHydrator(_PackStreamHydrator):
 
+    #: Number of consecutive primitive values a column must yield before
+    #: it is switched to the fast path, bypassing the recursive walk.
+    profile_size = 10
+
+    #: If :const:`True`, :meth:`.hydrate` returns raw values untouched,
+    #: leaving each to be hydrated on demand by :meth:`.hydrate_field`.
+    lazy = False
+
+    #: If :const:`True`, nodes and relationships are hydrated into
+    #: read-only :class:`.CompactNode` and :class:`.CompactRelationship`
+    #: objects instead of full entities.
+    compact = False
+
     def __init__(self, graph, keys, entities=None):
         super(PackStreamHydrator, self).__init__(2)  # maximum known protocol version
         self.graph = graph
         self.keys = keys
         self.entities = entities or {}
+        self._profile = [0] * len(keys)
+        self._profile_types = [set() for _ in keys]
+        self._primitive_only = False
+        # Identity maps of the entities hydrated within this result, so
+        # that repeat occurrences are not hydrated again.
+        self.nodes = WeakValueDictionary()
+        self.relationships = WeakValueDictionary()
+        self._batch = None
 
     def hydrate(self, values):
         """ Hydrate values from raw PackStream representations into client objects.
+
+        Each column is profiled as records arrive. Once a column has
+        yielded only primitive values (including lists and dictionaries
+        of primitives) for :attr:`.profile_size` records, its values are
+        passed through untouched for as long as their own type is one
+        already seen for that column. The items within lists and
+        dictionaries are not checked again, and empty collections do
+        not count towards a profile. Any other value is hydrated as
+        usual, and profiling for that column starts afresh.
         """
-        graph = self.graph
+        if self.lazy:
+            return tuple(values)
         entities = self.entities
         keys = self.keys
+        profile = self._profile
+        profile_types = self._profile_types
+        profile_size = self.profile_size
+        if len(profile) != len(values):
+            profile = self._profile = [0] * len(values)
+            profile_types = self._profile_types = [set() for _ in values]
+        if self._primitive_only:
+            # Every column has been profiled as primitive, so a record
+            # of values of the profiled types can be passed straight through.
+            for value, types in zip(values, profile_types):
+                if type(value) not in types:
+                    break
+            else:
+                return tuple(values)
+        hydrated = []
+        for i, value in enumerate(values):
+            t = type(value)
+            if profile[i] >= profile_size:
+                if t in profile_types[i]:
+                    hydrated.append(value)
+                    continue
+                profile[i] = 0
+                profile_types[i].clear()
+                self._primitive_only = False
+            hydrated.append(self._hydrate(value, entities.get(keys[i])))
+            if not _is_primitive(value):
+                profile[i] = 0
+                profile_types[i].clear()
+            elif value or t in _primitive_types:
+                profile[i] += 1
+                profile_types[i].add(t)
+                if profile[i] >= profile_size and min(profile) >= profile_size:
+                    self._primitive_only = True
+        return tuple(hydrated)
+
+    def hydrate_field(self, index, value):
+        """ Hydrate a single raw value from the field at a given index.
+        """
+        return self._hydrate(value, self.entities.get(self.keys[index]))
+
+    def _defer(self, node):
+        # Add a stale node to the current resolution batch, so that it
+        # can be loaded alongside others from the same result.
+        if node._stale and node._batch is None:
+            if self._batch is None or not self._batch.add(node):
+                self._batch = ResolutionBatch(self.graph)
+                self._batch.add(node)
 
-        def hydrate_(obj, inst=None):
-            if isinstance(obj, Structure):
-                tag = obj.tag
-                fields = obj.fields
-                if tag == b"N":
-                    return hydrate_node(graph, fields[0], inst=inst,
-                                        metadata={"labels": list(fields[1])}, data=hydrate_(fields[2]))
-                elif tag == b"R":
-                    return hydrate_relationship(graph, fields[0], inst=inst,
-                                                start=fields[1], end=fields[2],
-                                                type=fields[3], data=hydrate_(fields[4]))
-                elif tag == b"P":
-                    from py2neo.data import Path
-                    nodes = [hydrate_(node) for node in fields[0]]
-                    u_rels = [_unbound_relationship(*map(hydrate_, r)) for r in fields[1]]
-                    sequence = fields[2]
-                    last_node = nodes[0]
-                    steps = [last_node]
-                    for i, rel_index in enumerate(sequence[::2]):
-                        next_node = nodes[sequence[2 * i + 1]]
-                        if rel_index > 0:
-                            u_rel = u_rels[rel_index - 1]
-                            rel = hydrate_relationship(graph, u_rel.id,
-                                                       start=last_node.identity, end=next_node.identity,
-                                                       type=u_rel.type, data=u_rel.properties)
-                        else:
-                            u_rel = u_rels[-rel_index - 1]
-                            rel = hydrate_relationship(graph, u_rel.id,
-                                                       start=next_node.identity, end=last_node.identity,
-                                                       type=u_rel.type, data=u_rel.properties)
-                        steps.append(rel)
-                        steps.append(next_node)
-                        last_node = next_node
-                    return Path(*steps)
-                else:
-                    # Defer everything else to the official driver
-                    return super(PackStreamHydrator, self).hydrate([obj])[0]
-            elif isinstance(obj, list):
-                return list(map(hydrate_, obj))
-            elif isinstance(obj, dict):
-                return {key: hydrate_(value) for key, value in obj.items()}
+    def _hydrate_node(self, fields, inst=None):
+        identity = fields[0]
+        if inst is None:
+            # Repeat occurrences are only hydrated again if changed
+            inst = self.nodes.get(identity)
+            if inst is not None and node_is_current(inst, fields[1], fields[2]):
+                return inst
+        inst = self.nodes[identity] = hydrate_node(self.graph, identity, inst=inst,
+                                                   metadata={"labels": list(fields[1])},
+                                                   data=self._hydrate(fields[2]))
+        return inst
+
+    def _hydrate(self, obj, inst=None):
+        graph = self.graph
+        hydrate_ = self._hydrate
+        if type(obj) in _primitive_types:
+            return obj
+        elif isinstance(obj, Structure):
+            tag = obj.tag
+            fields = obj.fields
+            if tag == b"N":
+                if self.compact and inst is None:
+                    from py2neo.data import CompactNode
+                    return CompactNode(graph, fields[0], fields[1], hydrate_(fields[2]))
+                return self._hydrate_node(fields, inst)
+            elif tag == b"R":
+                identity = fields[0]
+                if self.compact and inst is None:
+                    from py2neo.data import CompactRelationship
+                    return CompactRelationship(graph, identity, fields[1], fields[2], fields[3],
+                                               hydrate_(fields[4]))
+                if inst is None:
+                    inst = self.relationships.get(identity)
+                    if inst is not None and relationship_is_current(inst, fields[4]):
+                        return inst
+                inst = self.relationships[identity] = hydrate_relationship(graph, identity, inst=inst,
+                                                                           start=fields[1], end=fields[2],
+                                                                           type=fields[3],
+                                                                           data=hydrate_(fields[4]))
+                self._defer(inst.start_node)
+                self._defer(inst.end_node)
+                return inst
+            elif tag == b"P":
+                from py2neo.data import Path
+                nodes = [self._hydrate_node(node.fields) for node in fields[0]]
+                u_rels = [_unbound_relationship(*map(hydrate_, r)) for r in fields[1]]
+                sequence = fields[2]
+                last_node = nodes[0]
+                steps = [last_node]
+                for i, rel_index in enumerate(sequence[::2]):
+                    next_node = nodes[sequence[2 * i + 1]]
+                    if rel_index > 0:
+                        u_rel = u_rels[rel_index - 1]
+                        start, end = last_node, next_node
+                    else:
+                        u_rel = u_rels[-rel_index - 1]
+                        start, end = next_node, last_node
+                    rel = self.relationships.get(u_rel.id)
+                    if rel is None or not relationship_is_current(rel, u_rel.properties):
+                        rel = self.relationships[u_rel.id] = hydrate_relationship(
+                            graph, u_rel.id, inst=rel, start=start.identity, end=end.identity,
+                            type=u_rel.type, data=u_rel.properties)
+                    steps.append(rel)
+                    steps.append(next_node)
+                    last_node = next_node
+                return Path(*steps)
             else:
+                # Defer everything else to the official driver
+                return super(PackStreamHydrator, self).hydrate([obj])[0]
+        elif isinstance(obj, list):
+            if _is_primitive(obj):
                 return obj
-
-        return tuple(hydrate_(value, entities.get(keys[i])) for i, value in enumerate(values))
+            return list(map(hydrate_, obj))
+        elif isinstance(obj, dict):
+            if _is_primitive(obj):
+                return obj
+            return {key: hydrate_(value) for key, value in obj.items()}
+        else:
+            return obj
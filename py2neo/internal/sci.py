@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Conversion of NumPy and pandas values into native Python values, for
+use as query parameters. Neither library is required; values are
+recognised by the module in which their type is defined.
+"""
+
+
+from sys import modules
+
+from py2neo.internal.compat import ustr
+
+
+INT64_MAX = (2 ** 63) - 1
+
+SCI_MODULES = ("numpy", "pandas")
+
+
+def sci_loaded():
+    """ Return :const:`True` if either NumPy or pandas has been imported,
+    and therefore values from those libraries could be in use.
+    """
+    return any(name in modules for name in SCI_MODULES)
+
+
+def is_sci(value):
+    """ Return :const:`True` if a value is an instance of a NumPy or
+    pandas type.
+    """
+    return type(value).__module__.partition(".")[0] in SCI_MODULES
+
+
+def _array_to_list(array):
+    kind = array.dtype.kind
+    if kind == "u" and array.dtype.itemsize == 8 and array.size and int(array.max()) > INT64_MAX:
+        raise ValueError("Integer out of bounds (64-bit signed integer values only)")
+    if kind in "biufUS":
+        return array.tolist()
+    elif kind == "M":
+        # Nanosecond precision would otherwise produce plain integers
+        return array.astype("M8[us]").tolist()
+    elif kind == "m":
+        return array.astype("m8[us]").tolist()
+    elif kind == "O":
+        return [sci_to_native(item) if is_sci(item) else item for item in array.tolist()]
+    else:
+        raise TypeError(array)
+
+
+def _series_to_list(series):
+    from numpy import asarray
+    values = _array_to_list(asarray(series))
+    missing = asarray(series.isnull())
+    if missing.any():
+        # Missing values in pandas (NaN, NaT, None) all become null
+        for i in missing.nonzero()[0].tolist():
+            values[i] = None
+    return values
+
+
+def frame_columns(frame):
+    """ Convert a pandas DataFrame into a list of column names and a
+    list of columns, each a list of native values. Missing values
+    become :const:`None`.
+    """
+    keys = [ustr(key) for key in frame.columns]
+    return keys, [_series_to_list(frame.iloc[:, i]) for i in range(len(keys))]
+
+
+def sci_to_native(value):
+    """ Convert a NumPy or pandas value into the equivalent native value.
+    Conversion of arrays, series and data frames is vectorised. Scalars
+    become native scalars, arrays and series become (possibly nested)
+    lists, and data frames become lists of maps, one per row, keyed by
+    column name. Missing values in pandas objects become :const:`None`.
+
+    :raises ValueError: if an unsigned integer exceeds the signed 64-bit
+                        range supported by Neo4j
+    :raises TypeError: if the value has no native equivalent
+    """
+    type_name = type(value).__name__
+    if type_name == "ndarray":
+        return _array_to_list(value)
+    elif type_name == "DataFrame":
+        keys, columns = frame_columns(value)
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+    elif type_name in ("Series", "Index"):
+        return _series_to_list(value)
+    elif hasattr(value, "to_pydatetime"):
+        # pandas Timestamp
+        return value.to_pydatetime()
+    elif hasattr(value, "to_pytimedelta"):
+        # pandas Timedelta
+        return value.to_pytimedelta()
+    elif hasattr(value, "dtype") and hasattr(value, "item"):
+        # NumPy scalar
+        kind = value.dtype.kind
+        if kind == "u" and int(value) > INT64_MAX:
+            raise ValueError("Integer out of bounds (64-bit signed integer values only)")
+        elif kind == "M":
+            return value.astype("M8[us]").item()
+        elif kind == "m":
+            return value.astype("m8[us]").item()
+        elif kind in "cV":
+            raise TypeError(value)
+        return value.item()
+    else:
+        raise TypeError(value)
+
+
+def fix_sci_parameters(value):
+    """ Convert any NumPy or pandas values held within a structure of
+    native lists and dictionaries, returning the structure unchanged
+    if there are none.
+    """
+    if is_sci(value):
+        return sci_to_native(value)
+    elif isinstance(value, dict):
+        fixed = None
+        for key, item in value.items():
+            fixed_item = fix_sci_parameters(item)
+            if fixed_item is not item:
+                if fixed is None:
+                    fixed = dict(value)
+                fixed[key] = fixed_item
+        return value if fixed is None else fixed
+    elif isinstance(value, (list, tuple)):
+        fixed = None
+        for i, item in enumerate(value):
+            fixed_item = fix_sci_parameters(item)
+            if fixed_item is not item:
+                if fixed is None:
+                    fixed = list(value)
+                fixed[i] = fixed_item
+        return value if fixed is None else fixed
+    else:
+        return value
@@ -23,6 +23,7 @@ from collections import Sequence, Set
 from py2neo.cypher import cypher_escape
 from py2neo.data import Node
 from py2neo.internal.collections import is_collection
+from py2neo.internal.compat import string_types
 
 
 _operators = {
@@ -63,6 +64,127 @@ def _property_conditions(properties, offset=1):
         yield condition, parameters
 
 
+_neighbourhood_patterns = {
+    None: "(a)-[_%s]-(b)",
+    "outgoing": "(a)-[_%s]->(b)",
+    "incoming": "(a)<-[_%s]-(b)",
+}
+
+_aggregate_functions = {
+    "avg": "avg",
+    "collect": "collect",
+    "count": "count",
+    "max": "max",
+    "min": "min",
+    "stdev": "stDev",
+    "sum": "sum",
+}
+
+
+def _key_expression(key):
+    return "id(_)" if key == "__id__" else "_.%s" % cypher_escape(key)
+
+
+def _projection(keys):
+    if not keys:
+        raise ValueError("At least one key must be specified")
+    return ", ".join(map(_key_expression, keys))
+
+
+def _aggregate(match, group_by, aggregates):
+    # Compute aggregate values on the server, optionally grouped by
+    # one or more keys, returning one dictionary per group.
+    if match._order_by or match._skip or match._limit is not None:
+        raise ValueError("Aggregated matches cannot be ordered, skipped or limited")
+    if not aggregates:
+        raise ValueError("At least one aggregate must be specified")
+    if group_by is None:
+        names = []
+    elif isinstance(group_by, string_types):
+        names = [group_by]
+    else:
+        names = list(group_by)
+    expressions = list(map(_key_expression, names))
+    for function, keys in sorted(aggregates.items()):
+        try:
+            cypher_function = _aggregate_functions[function]
+        except KeyError:
+            raise ValueError("Unsupported aggregate function %r" % function)
+        if keys is True:
+            names.append(function)
+            expressions.append("%s(_)" % cypher_function)
+        else:
+            for key in ([keys] if isinstance(keys, string_types) else keys):
+                names.append("%s_%s" % (function, key))
+                expressions.append("%s(%s)" % (cypher_function, _key_expression(key)))
+    query, parameters = match._query_and_parameters(returns=", ".join(expressions))
+    results = [dict(zip(names, record)) for record in match.graph.run(query, parameters)]
+    if group_by is None:
+        return results[0]
+    else:
+        return results
+
+
+def _relationship_detail(r_type):
+
+    def r_type_name(r):
+        try:
+            return r.__name__
+        except AttributeError:
+            return r
+
+    if r_type is None:
+        return ""
+    elif is_collection(r_type):
+        return ":" + "|:".join(cypher_escape(r_type_name(t)) for t in r_type)
+    else:
+        return ":%s" % cypher_escape(r_type_name(r_type))
+
+
+def _get_many(matcher, cache, identities, chunk_size):
+    # Fetch entities by identity, serving as many as possible from the
+    # cache and selecting the remainder in batches.
+    identities = list(identities)
+    entities = cache.get_many(identities)
+    missing = []
+    for identity in identities:
+        if identity not in entities:
+            entities[identity] = None
+            missing.append(identity)
+    for i in range(0, len(missing), chunk_size):
+        condition = ("id(_) IN {ids}", {"ids": missing[i:i + chunk_size]})
+        for entity in matcher.match().where(condition):
+            entities[entity.identity] = entity
+    return [entities[identity] for identity in identities]
+
+
+def _pages(match, page_size, key, start):
+    # Paginate a match by key value rather than by SKIP, so that the
+    # cost of each page does not depend on its depth within the result.
+    if match._order_by or match._skip or match._limit is not None:
+        raise ValueError("Paginated matches cannot be ordered, skipped or limited")
+    if key is None:
+        expression = "id(_)"
+    else:
+        expression = "_.%s" % cypher_escape(key)
+        match = match.where("%s IS NOT NULL" % expression)
+
+    def iterate(last):
+        while True:
+            if last is None:
+                page_match = match
+            else:
+                page_match = match.where(("%s > {page_start}" % expression, {"page_start": last}))
+            page = [entity for entity in page_match.order_by(expression).limit(page_size)]
+            if page:
+                yield page
+            if len(page) < page_size:
+                break
+            last = page[-1].identity if key is None else page[-1][key]
+
+    return iterate(start)
+
+
 class NodeMatch(object):
     """ Immutable set of node selection criteria.
     """
@@ -86,6 +208,55 @@ class NodeMatch(object):
         for record in self.graph.run(*self._query_and_parameters()):
             yield record[0]
 
+    def values(self, *keys):
+        """ Iterate through selected property values of all matching
+        nodes, yielding a tuple for each. Only the values requested are
+        returned from the server, and no :class:`.Node` objects are
+        constructed. The special key ``__id__`` selects the internal ID
+        of each node. For example::
+
+            match.values("__id__", "name")
+
+        :param keys: property keys to select
+        """
+        for record in self.graph.run(*self._query_and_parameters(returns=_projection(keys))):
+            yield tuple(record)
+
+    def project(self, *keys):
+        """ Iterate through selected property values of all matching
+        nodes, yielding a dictionary for each, keyed by property key.
+        As with :meth:`.values`, no :class:`.Node` objects are
+        constructed.
+
+        :param keys: property keys to select
+        """
+        for record in self.graph.run(*self._query_and_parameters(returns=_projection(keys))):
+            yield dict(zip(keys, record))
+
+    def aggregate(self, group_by=None, **aggregates):
+        """ Compute aggregate values over all matching nodes on the
+        server, without returning the nodes themselves. Each keyword
+        names an aggregating function (``count``, ``sum``, ``avg``,
+        ``min``, ``max``, ``stdev`` or ``collect``) and supplies the
+        property key, or list of keys, to which it is applied. The
+        value :const:`True` applies a function to the node itself,
+        which is mainly useful for ``count``. For example::
+
+            match.aggregate(count=True, avg="age", group_by="country")
+
+        Results are keyed by function and property key, such as
+        ``avg_age``, or by function name alone for :const:`True`
+        values.
+
+        :param group_by: property key, or list of keys, by which to
+                         group the nodes
+        :param aggregates: aggregating functions and property keys
+        :return: a dictionary of aggregate values or, if grouped, a
+                 list of dictionaries, each also holding the values of
+                 the grouping keys
+        """
+        return _aggregate(self, group_by, aggregates)
+
     def first(self):
         """ Evaluate the match and return the first :class:`.Node`
         matched or :const:`None` if no matching nodes are found.
@@ -94,7 +265,27 @@ class NodeMatch(object):
         """
         return self.graph.evaluate(*self._query_and_parameters())
 
-    def _query_and_parameters(self, count=False):
+    def pages(self, page_size, key=None, start=None):
+        """ Iterate through all matching nodes in pages, each a list of
+        up to `page_size` nodes. Rather than skipping over earlier
+        results, each page is selected by filtering on `key` and
+        continuing from the last value seen, so deep pages cost no more
+        than the first. For large labels, an indexed key should be used.
+
+        A match cannot be paginated if it is already ordered, skipped or
+        limited.
+
+        :param page_size: maximum number of nodes per page
+        :param key: unique property key to order and paginate by; by
+                    default nodes are paginated by internal ID and nodes
+                    without a value for any other key are not included
+        :param start: key value after which to begin, for example the
+                      last value seen before an interrupted scan
+        :return: iterator of lists of :class:`.Node` objects
+        """
+        return _pages(self, page_size, key, start)
+
+    def _query_and_parameters(self, count=False, returns=None):
         """ A tuple of the Cypher query and parameters used to select
         the nodes that match the criteria for this selection.
 
@@ -113,7 +304,7 @@ class NodeMatch(object):
         if count:
             clauses.append("RETURN count(_)")
         else:
-            clauses.append("RETURN _")
+            clauses.append("RETURN %s" % (returns or "_"))
             if self._order_by:
                 clauses.append("ORDER BY %s" % (", ".join(self._order_by)))
             if self._skip:
@@ -220,6 +411,19 @@ class NodeMatcher(object):
         except KeyError:
             return self.match().where("id(_) = %d" % identity).first()
 
+    def get_many(self, identities, chunk_size=1000):
+        """ Return a list of nodes for a sequence of identities, in the
+        same order. Nodes already held in the cache are returned
+        directly, and all others are matched in batches of up to
+        `chunk_size`, rather than with one query per identity.
+
+            matcher.get_many([1234, 1235, 1236])
+
+        Where no :class:`.Node` exists for an identity, py:const:`None`
+        is included in its place.
+        """
+        return _get_many(self, self.graph.node_cache, identities, chunk_size)
+
     def match(self, *labels, **properties):
         """ Describe a basic node match using labels and property equality.
 
@@ -240,7 +444,7 @@ class RelationshipMatch(object):
     """
 
     def __init__(self, graph, nodes=None, r_type=None,
-                 conditions=tuple(), order_by=tuple(), skip=None, limit=None):
+                 conditions=tuple(), order_by=tuple(), skip=None, limit=None, endpoints=False):
         if nodes is not None and not isinstance(nodes, (Sequence, Set)):
             raise ValueError("Nodes must be supplied as a Sequence or a Set")
         self.graph = graph
@@ -250,6 +454,7 @@ class RelationshipMatch(object):
         self._order_by = tuple(order_by)
         self._skip = skip
         self._limit = limit
+        self._endpoints = endpoints
 
     def __len__(self):
         """ Return the number of relationships matched.
@@ -261,8 +466,62 @@ class RelationshipMatch(object):
         """
         query, parameters = self._query_and_parameters()
         for record in self.graph.run(query, parameters):
+            if self._endpoints:
+                # Hydrating the endpoints refreshes the same node
+                # objects as are held by the relationship
+                _ = record[1], record[2]
             yield record[0]
 
+    def values(self, *keys):
+        """ Iterate through selected property values of all matching
+        relationships, yielding a tuple for each. Only the values
+        requested are returned from the server, and no
+        :class:`.Relationship` objects are constructed. The special key
+        ``__id__`` selects the internal ID of each relationship. For
+        example::
+
+            match.values("__id__", "since")
+
+        :param keys: property keys to select
+        """
+        for record in self.graph.run(*self._query_and_parameters(returns=_projection(keys))):
+            yield tuple(record)
+
+    def project(self, *keys):
+        """ Iterate through selected property values of all matching
+        relationships, yielding a dictionary for each, keyed by property
+        key. As with :meth:`.values`, no :class:`.Relationship` objects
+        are constructed.
+
+        :param keys: property keys to select
+        """
+        for record in self.graph.run(*self._query_and_parameters(returns=_projection(keys))):
+            yield dict(zip(keys, record))
+
+    def aggregate(self, group_by=None, **aggregates):
+        """ Compute aggregate values over all matching relationships on the
+        server, without returning the relationships themselves. Each keyword
+        names an aggregating function (``count``, ``sum``, ``avg``,
+        ``min``, ``max``, ``stdev`` or ``collect``) and supplies the
+        property key, or list of keys, to which it is applied. The
+        value :const:`True` applies a function to the relationship itself,
+        which is mainly useful for ``count``. For example::
+
+            match.aggregate(count=True, sum=["weight", "cost"])
+
+        Results are keyed by function and property key, such as
+        ``avg_age``, or by function name alone for :const:`True`
+        values.
+
+        :param group_by: property key, or list of keys, by which to
+                         group the relationships
+        :param aggregates: aggregating functions and property keys
+        :return: a dictionary of aggregate values or, if grouped, a
+                 list of dictionaries, each also holding the values of
+                 the grouping keys
+        """
+        return _aggregate(self, group_by, aggregates)
+
     def first(self):
         """ Evaluate the selection and return the first
         :class:`.Relationship` selected or :const:`None` if no matching
@@ -270,9 +529,34 @@ class RelationshipMatch(object):
 
         :return: a single matching :class:`.Relationship` or :const:`None`
         """
+        if self._endpoints:
+            for relationship in self.limit(1 if self._limit is None else min(self._limit, 1)):
+                return relationship
+            return None
         return self.graph.evaluate(*self._query_and_parameters())
 
-    def _query_and_parameters(self, count=False):
+    def pages(self, page_size, key=None, start=None):
+        """ Iterate through all matching relationships in pages, each a
+        list of up to `page_size` relationships. Rather than skipping
+        over earlier results, each page is selected by filtering on
+        `key` and continuing from the last value seen, so deep pages
+        cost no more than the first.
+
+        A match cannot be paginated if it is already ordered, skipped or
+        limited.
+
+        :param page_size: maximum number of relationships per page
+        :param key: unique property key to order and paginate by; by
+                    default relationships are paginated by internal ID
+                    and relationships without a value for any other key
+                    are not included
+        :param start: key value after which to begin, for example the
+                      last value seen before an interrupted scan
+        :return: iterator of lists of :class:`.Relationship` objects
+        """
+        return _pages(self, page_size, key, start)
+
+    def _query_and_parameters(self, count=False, returns=None):
         """ A tuple of the Cypher query and parameters used to select
         the relationships that match the criteria for this selection.
 
@@ -285,20 +569,9 @@ class RelationshipMatch(object):
             if n.identity is None:
                 raise ValueError("Node %r is not bound to a graph" % n)
 
-        def r_type_name(r):
-            try:
-                return r.__name__
-            except AttributeError:
-                return r
-
         clauses = []
         parameters = {}
-        if self._r_type is None:
-            relationship_detail = ""
-        elif is_collection(self._r_type):
-            relationship_detail = ":" + "|:".join(cypher_escape(r_type_name(t)) for t in self._r_type)
-        else:
-            relationship_detail = ":%s" % cypher_escape(r_type_name(self._r_type))
+        relationship_detail = _relationship_detail(self._r_type)
         if not self._nodes:
             clauses.append("MATCH (a)-[_" + relationship_detail + "]->(b)")
         elif isinstance(self._nodes, Sequence):
@@ -343,7 +616,12 @@ class RelationshipMatch(object):
         if count:
             clauses.append("RETURN count(_)")
         else:
-            clauses.append("RETURN _")
+            if returns:
+                clauses.append("RETURN %s" % returns)
+            elif self._endpoints:
+                clauses.append("RETURN _, a, b")
+            else:
+                clauses.append("RETURN _")
             if self._order_by:
                 clauses.append("ORDER BY %s" % (", ".join(self._order_by)))
             if self._skip:
@@ -378,7 +656,8 @@ class RelationshipMatch(object):
                               conditions=self._conditions + conditions + tuple(_property_conditions(properties)),
                               order_by=self._order_by,
                               skip=self._skip,
-                              limit=self._limit)
+                              limit=self._limit,
+                              endpoints=self._endpoints)
 
     def order_by(self, *fields):
         """ Order by the fields or field expressions specified.
@@ -397,7 +676,8 @@ class RelationshipMatch(object):
                               conditions=self._conditions,
                               order_by=fields,
                               skip=self._skip,
-                              limit=self._limit)
+                              limit=self._limit,
+                              endpoints=self._endpoints)
 
     def skip(self, amount):
         """ Skip the first `amount` relationships in the result.
@@ -411,7 +691,8 @@ class RelationshipMatch(object):
                               conditions=self._conditions,
                               order_by=self._order_by,
                               skip=amount,
-                              limit=self._limit)
+                              limit=self._limit,
+                              endpoints=self._endpoints)
 
     def limit(self, amount):
         """ Limit to at most `amount` relationships.
@@ -425,7 +706,29 @@ class RelationshipMatch(object):
                               conditions=self._conditions,
                               order_by=self._order_by,
                               skip=self._skip,
-                              limit=amount)
+                              limit=amount,
+                              endpoints=self._endpoints)
+
+    def with_endpoints(self):
+        """ Return the start and end nodes of each relationship in full,
+        within the same result, rather than as bare nodes whose labels
+        and properties are loaded separately on first access. This
+        avoids further queries when walking the matched relationships.
+
+        As the endpoints are hydrated, any unpushed local changes to
+        those nodes, including any used to build the match, are
+        overwritten with their stored labels and properties.
+
+        :return: refined :class:`.RelationshipMatch` object
+        """
+        return self.__class__(self.graph,
+                              nodes=self._nodes,
+                              r_type=self._r_type,
+                              conditions=self._conditions,
+                              order_by=self._order_by,
+                              skip=self._skip,
+                              limit=self._limit,
+                              endpoints=True)
 
 
 class RelationshipMatcher(object):
@@ -470,6 +773,73 @@ class RelationshipMatcher(object):
         except KeyError:
             return self.match().where("id(_) = %d" % identity).first()
 
+    def get_many(self, identities, chunk_size=1000):
+        """ Return a list of relationships for a sequence of identities,
+        in the same order. Relationships already held in the cache are
+        returned directly, and all others are matched in batches of up
+        to `chunk_size`, rather than with one query per identity.
+
+            matcher.get_many([1234, 1235, 1236])
+
+        Where no :class:`.Relationship` exists for an identity,
+        py:const:`None` is included in its place.
+        """
+        return _get_many(self, self.graph.relationship_cache, identities, chunk_size)
+
+    def neighbourhoods(self, nodes, r_type=None, direction=None, chunk_size=1000, **properties):
+        """ Fetch the relationships attached to each of a collection of
+        nodes, using one query for every `chunk_size` nodes rather than
+        one query per node.
+
+            matcher.neighbourhoods(people, r_type="KNOWS", direction="outgoing")
+
+        :param nodes: collection of bound nodes
+        :param r_type: relationship type, or collection of types, to
+                       match (:const:`None` means any type)
+        :param direction: ``"outgoing"`` or ``"incoming"`` to match
+                          only relationships in that direction from each
+                          node, or :const:`None` to match both
+        :param chunk_size: maximum number of nodes to match per query
+        :param properties: set of property keys and values to match
+        :return: dictionary mapping each node to a list of its matching
+                 relationships
+        """
+        try:
+            pattern = _neighbourhood_patterns[direction]
+        except KeyError:
+            raise ValueError("Unsupported direction %r" % (direction,))
+        nodes = list(nodes)
+        for node in nodes:
+            if node.graph != self.graph:
+                raise ValueError("Node %r does not belong to this graph" % node)
+            if node.identity is None:
+                raise ValueError("Node %r is not bound to a graph" % node)
+        clauses = ["MATCH (a) WHERE id(a) IN {ids}",
+                   "MATCH " + pattern % _relationship_detail(r_type)]
+        parameters = {}
+        if properties:
+            conditions = []
+            for condition, param in _property_conditions(properties):
+                conditions.append(condition)
+                parameters.update(param)
+            clauses.append("WHERE %s" % " AND ".join(conditions))
+        clauses.append("RETURN id(a), _")
+        query = " ".join(clauses)
+        nodes_by_identity = {}
+        for node in nodes:
+            nodes_by_identity[node.identity] = node
+        neighbourhoods = {node: [] for node in nodes}
+        seen = set()
+        identities = list(nodes_by_identity)
+        for i in range(0, len(identities), chunk_size):
+            parameters["ids"] = identities[i:i + chunk_size]
+            for identity, relationship in self.graph.run(query, parameters):
+                # Undirected matches may find a relationship twice from the same node
+                if (identity, relationship.identity) not in seen:
+                    seen.add((identity, relationship.identity))
+                    neighbourhoods[nodes_by_identity[identity]].append(relationship)
+        return neighbourhoods
+
     def match(self, nodes=None, r_type=None, **properties):
         """ Describe a basic relationship match...
 
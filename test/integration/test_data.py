@@ -189,7 +189,7 @@ class RelationshipTestCase(IntegrationTestCase):
         got = self.graph.relationships.get(r.identity)
         assert got.identity == r.identity
 
-    def test_relationship_cache_is_thread_local(self):
+    def test_relationship_cache_is_shared_between_threads(self):
         import threading
         a = Node()
         b = Node()
@@ -206,7 +206,7 @@ class RelationshipTestCase(IntegrationTestCase):
         thread.join()
 
         assert r.identity in self.graph.relationship_cache
-        assert r.identity not in other_relationship_cache_keys
+        assert r.identity in other_relationship_cache_keys
 
     def test_cannot_get_relationship_by_id_when_id_does_not_exist(self):
         a = Node()
@@ -18,11 +18,16 @@
 
 from __future__ import absolute_import
 
-from unittest import TestCase
+from unittest import TestCase, skipIf
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
 
 from neo4j.exceptions import ConstraintError, CypherSyntaxError
 
-from py2neo.data import Node, Relationship, Path, Record
+from py2neo.data import Node, Relationship, Path, Record, LazyRecord, CompactNode, CompactRelationship
 from py2neo.database import Database, Graph, GraphError, TransactionFinished
 from py2neo.internal.json import JSONHydrator
 from py2neo.testing import IntegrationTestCase
@@ -94,6 +99,22 @@ class DatabaseTestCase(IntegrationTestCase):
         assert self.db.store_file_sizes
         assert self.db.config
 
+    def test_dbms_snapshot(self):
+        snapshot = self.db.snapshot()
+        self.assertEqual(snapshot["name"], "graph.db")
+        self.assertEqual(snapshot["kernel_version"], self.db.kernel_version)
+        self.assertEqual(snapshot["store_id"], self.db.store_id)
+        assert snapshot["kernel_start_time"]
+        assert snapshot["primitive_counts"]
+        assert snapshot["store_file_sizes"]
+        assert snapshot["config"]
+
+    def test_jmx_queries_are_cached(self):
+        info_1 = self.db.query_jmx("org.neo4j", name="Kernel")
+        info_2 = self.db.query_jmx("org.neo4j", name="Kernel")
+        self.assertEqual(info_1, info_2)
+        self.assertIn("org.neo4j:name=Kernel,*", self.db._jmx_cache)
+
     def test_database_name(self):
         self.assertEqual(self.db.name, "graph.db")
 
@@ -193,7 +214,23 @@ class GraphObjectTestCase(IntegrationTestCase):
             _ = self.graph.nodes[node_id]
         self.assertIsNone(self.graph.nodes.get(node_id))
 
-    def test_node_cache_is_thread_local(self):
+    def test_can_resolve_stale_nodes(self):
+        a = Node("Person", name="Alice")
+        b = Node("Person", name="Bob")
+        ab = Relationship(a, "KNOWS", b)
+        self.graph.create(ab)
+        self.graph.node_cache.clear()
+        self.graph.relationship_cache.clear()
+        ab = self.graph.evaluate("MATCH ()-[ab]->() WHERE id(ab) = {x} RETURN ab", x=ab.identity)
+        assert ab.start_node._stale
+        self.graph.resolve([ab])
+        self.assertEqual(ab.start_node._stale, set())
+        self.assertEqual(ab.end_node._stale, set())
+        self.assertEqual(ab.start_node["name"], "Alice")
+        self.assertEqual(set(ab.end_node.labels), {"Person"})
+        self.graph.delete(ab | ab.start_node | ab.end_node)
+
+    def test_node_cache_is_shared_between_threads(self):
         from threading import Thread
         node = Node()
         self.graph.create(node)
@@ -208,7 +245,15 @@ class GraphObjectTestCase(IntegrationTestCase):
         thread.join()
 
         assert node.identity in self.graph.node_cache
-        assert node.identity not in other_cache_keys
+        assert node.identity in other_cache_keys
+
+    def test_node_cache_records_hits(self):
+        node = Node()
+        self.graph.create(node)
+        hits = self.graph.node_cache.stats()["hits"]
+        got = self.graph.nodes.get(node.identity)
+        assert got is node
+        assert self.graph.node_cache.stats()["hits"] == hits + 1
 
     def test_graph_repr(self):
         assert repr(self.graph).startswith("<")
@@ -284,6 +329,22 @@ class GraphSchemaTestCase(IntegrationTestCase):
             self.schema.drop_index(label_2, "key")
         self.graph.delete(munich)
 
+    def test_schema_apply(self):
+        label_1 = next(self.unique_string)
+        label_2 = next(self.unique_string)
+        spec = {
+            "indexes": [(label_1, "name"), (label_1, "key")],
+            "uniqueness_constraints": [(label_2, "name")],
+        }
+        created = self.schema.apply(spec)
+        self.assertEqual(len(created), 3)
+        self.assertEqual(set(self.schema.get_indexes(label_1)), {(u"name",), (u"key",)})
+        self.assertEqual(self.schema.get_uniqueness_constraints(label_2), [(u"name",)])
+        self.assertEqual(self.schema.apply(spec), [])
+        self.schema.drop_index(label_1, "name")
+        self.schema.drop_index(label_1, "key")
+        self.schema.drop_uniqueness_constraint(label_2, "name")
+
     def test_unique_constraint(self):
         label_1 = next(self.unique_string)
         borough = Node(label_1, name="Taufkirchen")
@@ -726,6 +787,37 @@ class TransactionCreateTestCase(IntegrationTestCase):
             self.graph.create("this string is definitely not graphy")
 
 
+@skipIf(pandas is None, "pandas is not installed")
+class FrameLoadingTestCase(IntegrationTestCase):
+
+    def test_can_create_nodes_from_frame(self):
+        company = Node("Company", name="Acme")
+        self.graph.create(company)
+        frame = pandas.DataFrame({"name": ["Alice", "Bob"], "age": [33, None], "employer": ["Acme", "Nobody"]},
+                                 columns=["name", "age", "employer"], index=["a", "b"])
+        ids = self.graph.create_nodes_from_frame(frame, "Person", return_ids=True, chunk_size=1,
+                                                 relationships={"employer": ("WORKS_FOR", "Company", "name")})
+        self.assertEqual(list(ids.index), ["a", "b"])
+        alice = self.graph.nodes.get(int(ids["a"]))
+        bob = self.graph.nodes.get(int(ids["b"]))
+        self.assertEqual(dict(alice), {"name": "Alice", "age": 33})
+        self.assertEqual(dict(bob), {"name": "Bob"})
+        self.assertEqual(len(self.graph.match((alice, company), "WORKS_FOR")), 1)
+        self.assertEqual(len(self.graph.match((bob,), "WORKS_FOR")), 0)
+        self.graph.delete(alice | bob | company)
+
+    def test_can_merge_nodes_from_frame(self):
+        frame = pandas.DataFrame({"name": ["Alice", "Bob"], "age": [33, 44]}, columns=["name", "age"])
+        with self.graph.begin() as tx:
+            first = tx.merge_from_frame(frame, "Person", "name", "Employee", return_ids=True)
+        second = self.graph.merge_from_frame(frame, "Person", "name", return_ids=True)
+        self.assertEqual(list(first), list(second))
+        alice = self.graph.nodes.get(int(first[0]))
+        self.assertEqual(set(alice.labels), {"Person", "Employee"})
+        self.assertEqual(alice["age"], 33)
+        self.graph.delete(alice | self.graph.nodes.get(int(first[1])))
+
+
 class TransactionDeleteTestCase(IntegrationTestCase):
 
     def test_can_delete_relationship(self):
@@ -933,6 +1025,48 @@ class CursorStreamingTestCase(IntegrationTestCase):
                                Record(zip(["n", "n_sq"], [10, 100]))]
 
 
+class CursorLazyHydrationTestCase(IntegrationTestCase):
+
+    def test_lazy_records_hydrate_on_access(self):
+        cursor = self.graph.run("CREATE (a:Person {name:'Alice'}) RETURN a, a.name AS name", lazy=True)
+        record = next(cursor)
+        assert isinstance(record, LazyRecord)
+        self.assertEqual(record["name"], "Alice")
+        a = record["a"]
+        assert isinstance(a, Node)
+        self.assertEqual(a["name"], "Alice")
+        assert record["a"] is a
+        self.graph.delete(a)
+
+    def test_lazy_records_equal_eager_records(self):
+        lazy = list(self.graph.run("UNWIND range(1, 3) AS n RETURN n, n * n AS n_sq", lazy=True))
+        eager = list(self.graph.run("UNWIND range(1, 3) AS n RETURN n, n * n AS n_sq"))
+        self.assertEqual(lazy, eager)
+
+
+class CursorCompactEntityTestCase(IntegrationTestCase):
+
+    def test_compact_entities_can_be_returned(self):
+        cursor = self.graph.run("CREATE (a:Person {name:'Alice'})-[ab:KNOWS]->(b:Person {name:'Bob'}) "
+                                "RETURN a, ab, b", entities="compact")
+        a, ab, b = next(cursor)
+        assert isinstance(a, CompactNode)
+        assert isinstance(ab, CompactRelationship)
+        self.assertEqual(a.labels, ("Person",))
+        self.assertEqual(a["name"], "Alice")
+        self.assertEqual(ab.type, "KNOWS")
+        self.assertEqual(ab.start_identity, a.identity)
+        self.assertEqual(ab.end_identity, b.identity)
+        full_ab = ab.to_relationship()
+        assert isinstance(full_ab, Relationship)
+        self.assertEqual(full_ab.end_node, b.to_node())
+        self.graph.delete(full_ab | a.to_node() | b.to_node())
+
+    def test_unknown_entity_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.graph.run("RETURN 1", entities="tiny")
+
+
 class CursorEvaluationTestCase(IntegrationTestCase):
 
     def test_can_evaluate_single_value(self):
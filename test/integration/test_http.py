@@ -212,3 +212,50 @@ class BasicHTTPTestCase(HTTPGraphTestCase):
     def test_simple_query(self):
         x = self.http_graph.evaluate("RETURN $x", x=1)
         self.assertEqual(1, x)
+
+
+class ConnectionPoolTestCase(HTTPGraphTestCase):
+
+    def test_concurrent_requests_share_a_blocking_pool(self):
+        from threading import Thread
+        headers = {
+            "Authorization": HTTP.authorization("neo4j", "password")
+        }
+        resource = HTTP("http://localhost:7474/db/data/", headers, verified=False,
+                        max_connections=2, blocking=True)
+        try:
+            threads = [Thread(target=resource.get_json, args=("",)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = resource.stats()
+            assert stats["requests"] == 8
+            assert stats["connections"] <= 2
+            assert stats["overflows"] == 0
+        finally:
+            resource.close()
+
+    def test_can_run_with_compression(self):
+        headers = {
+            "Authorization": HTTP.authorization("neo4j", "password")
+        }
+        resource = HTTP("http://localhost:7474/db/data/", headers, verified=False, compression=True)
+        try:
+            assert "neo4j_version" in resource.get_json("")
+        finally:
+            resource.close()
+
+    def test_can_run_cypher_with_compression(self):
+        headers = {
+            "Authorization": HTTP.authorization("neo4j", "password")
+        }
+        resource = HTTP("http://localhost:7474/db/data/", headers, verified=False, compression=True)
+        try:
+            statement = {"statement": "UNWIND range(1, 1000) AS n RETURN n, 'x' AS padding"}
+            rs = resource.post("transaction/commit", {"statements": [statement]}, [200])
+            data = resource.codec.decode(rs.data)
+            assert rs.headers.get("Content-Encoding") in (None, "gzip")
+            assert len(data["results"][0]["data"]) == 1000
+        finally:
+            resource.close()
@@ -186,6 +186,75 @@ class NodeMatcherTestCase(IntegrationTestCase):
         found_names = {actor["name"] for actor in found}
         assert found_names == {"Kevin Bacon", "Kiefer Sutherland"}
 
+    def test_get_many(self):
+        people = list(self.matcher.match("Person").order_by("_.name").limit(5))
+        identities = [person.identity for person in people]
+        missing = max(node.identity for node in self.matcher.match()) + 1
+        self.graph.node_cache.clear()
+        found = self.matcher.get_many(identities[2:] + [missing] + identities[:2], chunk_size=2)
+        self.assertEqual([node and node["name"] for node in found],
+                         [person["name"] for person in people[2:]] + [None] +
+                         [person["name"] for person in people[:2]])
+
+    def test_pages_by_identity(self):
+        people = list(self.matcher.match("Person").order_by("id(_)"))
+        pages = list(self.matcher.match("Person").pages(50))
+        self.assertTrue(all(len(page) == 50 for page in pages[:-1]))
+        self.assertEqual([node for page in pages for node in page], people)
+
+    def test_pages_by_property(self):
+        names = [person["name"] for person in self.matcher.match("Person").order_by("_.name")]
+        pages = list(self.matcher.match("Person").pages(7, key="name"))
+        self.assertEqual([node["name"] for page in pages for node in page], names)
+
+    def test_pages_from_start(self):
+        names = sorted(person["name"] for person in self.matcher.match("Person"))
+        pages = list(self.matcher.match("Person").pages(7, key="name", start=names[9]))
+        self.assertEqual([node["name"] for page in pages for node in page], names[10:])
+
+    def test_limited_match_cannot_be_paginated(self):
+        with self.assertRaises(ValueError):
+            self.matcher.match("Person").limit(10).pages(5)
+
+    def test_values(self):
+        people = list(self.matcher.match("Person").order_by("_.name").limit(3))
+        values = list(self.matcher.match("Person").order_by("_.name").limit(3).values("__id__", "name"))
+        self.assertEqual(values, [(person.identity, person["name"]) for person in people])
+
+    def test_project(self):
+        found = list(self.matcher.match("Person", name="Keanu Reeves").project("name", "born"))
+        self.assertEqual(found, [{"name": "Keanu Reeves", "born": 1964}])
+
+    def test_values_requires_keys(self):
+        with self.assertRaises(ValueError):
+            list(self.matcher.match("Person").values())
+
+    def test_aggregate(self):
+        people = list(self.matcher.match("Person").where("_.born IS NOT NULL"))
+        births = [person["born"] for person in people]
+        result = self.matcher.match("Person").where("_.born IS NOT NULL").aggregate(
+            count=True, min="born", max="born", sum="born")
+        self.assertEqual(result, {"count": len(people), "min_born": min(births),
+                                  "max_born": max(births), "sum_born": sum(births)})
+
+    def test_aggregate_with_group_by(self):
+        people = list(self.matcher.match("Person").where("_.born >= 1970"))
+        expected = {}
+        for person in people:
+            expected[person["born"]] = expected.get(person["born"], 0) + 1
+        result = self.matcher.match("Person").where("_.born >= 1970").aggregate(group_by="born", count=True)
+        self.assertEqual({row["born"]: row["count"] for row in result}, expected)
+
+    def test_aggregate_requires_known_function(self):
+        with self.assertRaises(ValueError):
+            self.matcher.match("Person").aggregate(median="born")
+
+    def test_get_many_uses_cache(self):
+        people = list(self.matcher.match("Person").limit(3))
+        found = self.matcher.get_many([person.identity for person in people])
+        for person, node in zip(people, found):
+            self.assertIs(node, person)
+
 
 class RelationshipMatchNodeCombinationsTestCase(IntegrationTestCase):
 
@@ -254,3 +323,68 @@ class RelationshipMatchNodeCombinationsTestCase(IntegrationTestCase):
         r = list(match)
         self.assertEqual(len(r), 6)
         self.assertSetEqual(set(r), {self.r[0], self.r[1], self.r[2], self.r[3], self.r[4], self.r[5]})
+
+    def test_pages(self):
+        pages = list(self.graph.match(r_type="TO").pages(4))
+        self.assertEqual([len(page) for page in pages], [4, 2])
+        self.assertEqual(set(pages[0] + pages[1]), set(self.r))
+
+    def test_values(self):
+        values = sorted(self.graph.match(nodes=(self.a, None), r_type="TO").values("__id__"))
+        self.assertEqual(values, sorted((r.identity,) for r in [self.r[0], self.r[5]]))
+
+    def test_aggregate(self):
+        result = self.graph.match(nodes=(self.b, None), r_type="TO").aggregate(count=True)
+        self.assertEqual(result, {"count": 3})
+
+    def test_neighbourhoods_outgoing(self):
+        found = self.graph.relationships.neighbourhoods([self.a, self.b, self.d], direction="outgoing")
+        self.assertEqual(set(found), {self.a, self.b, self.d})
+        self.assertSetEqual(set(found[self.a]), {self.r[0], self.r[5]})
+        self.assertSetEqual(set(found[self.b]), {self.r[1], self.r[2], self.r[3]})
+        self.assertEqual(found[self.d], [])
+
+    def test_neighbourhoods_in_both_directions(self):
+        found = self.graph.relationships.neighbourhoods([self.b, self.c], r_type="TO", chunk_size=1)
+        self.assertEqual(len(found[self.b]), 4)
+        self.assertSetEqual(set(found[self.b]), {self.r[0], self.r[1], self.r[2], self.r[3]})
+        self.assertSetEqual(set(found[self.c]), {self.r[2], self.r[4]})
+
+    def test_neighbourhoods_incoming(self):
+        found = self.graph.relationships.neighbourhoods([self.d], direction="incoming")
+        self.assertSetEqual(set(found[self.d]), {self.r[4], self.r[5]})
+
+    def test_endpoints_are_returned_inline(self):
+        self.graph.node_cache.clear()
+        self.graph.relationship_cache.clear()
+        found = list(self.graph.match((self.a, None), r_type="TO"))
+        self.assertSetEqual(set(found), {self.r[0], self.r[5]})
+        for relationship in found:
+            self.assertFalse(relationship.start_node._stale)
+            self.assertFalse(relationship.end_node._stale)
+
+    def test_endpoints_overwrite_unpushed_changes_to_anchor_nodes(self):
+        self.a["name"] = "Alice"
+        found = list(self.graph.match((self.a, None), r_type="TO"))
+        self.assertSetEqual(set(found), {self.r[0], self.r[5]})
+        self.assertNotIn("name", self.a)
+
+    def test_endpoints_can_be_omitted_to_keep_unpushed_changes(self):
+        self.a["name"] = "Alice"
+        found = list(self.graph.match((self.a, None), r_type="TO", endpoints=False))
+        self.assertSetEqual(set(found), {self.r[0], self.r[5]})
+        self.assertEqual(self.a["name"], "Alice")
+
+    def test_endpoints_can_be_omitted(self):
+        self.graph.node_cache.clear()
+        self.graph.relationship_cache.clear()
+        found = list(self.graph.match((self.a, None), r_type="TO", endpoints=False))
+        self.assertSetEqual(set(found), {self.r[0], self.r[5]})
+        for relationship in found:
+            self.assertTrue(relationship.end_node._stale)
+
+    def test_get_many(self):
+        self.graph.relationship_cache.clear()
+        identities = [self.r[4].identity, self.r[0].identity, -1, self.r[4].identity]
+        found = self.graph.relationships.get_many(identities)
+        self.assertEqual(found, [self.r[4], self.r[0], None, self.r[4]])
@@ -19,7 +19,7 @@
 from platform import python_implementation
 from unittest import TestCase, skipIf
 
-from py2neo.internal.caching import ThreadLocalEntityCache
+from py2neo.internal.caching import ThreadLocalEntityCache, EntityCache
 
 
 IMPLEMENTATION = python_implementation()
@@ -221,3 +221,115 @@ class EntityCacheTestCase(TestCase):
                 thread.stop()
             while threads:
                 threads.pop().join()
+
+
+class SharedEntityCacheTestCase(TestCase):
+
+    def test_values_are_shared_between_threads(self):
+        from threading import Thread
+
+        # Given
+        cache = EntityCache()
+        key = "X"
+        value = cache.update(key, Entity)
+
+        # When
+        other_values = []
+        thread = Thread(target=lambda: other_values.append(cache.update(key, Entity)))
+        thread.start()
+        thread.join()
+
+        # Then the other thread should have extracted the same value
+        assert other_values == [value]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @skipIf(IMPLEMENTATION == "PyPy", "Test not supported in PyPy yet")
+    def test_strong_tier_retains_recent_values(self):
+        # Given
+        cache = EntityCache(max_size=2, shards=1)
+
+        # When
+        for key in "ABC":
+            cache.update(key, Entity)
+
+        # Then only the two most recently used values should survive
+        assert "A" not in cache
+        assert "B" in cache
+        assert "C" in cache
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["strong_size"] == 2
+
+    @skipIf(IMPLEMENTATION == "PyPy", "Test not supported in PyPy yet")
+    def test_extraction_refreshes_strong_tier(self):
+        # Given
+        cache = EntityCache(max_size=2, shards=1)
+        cache.update("A", Entity)
+        cache.update("B", Entity)
+
+        # When
+        _ = cache["A"]
+        cache.update("C", Entity)
+
+        # Then the least recently used value should have been evicted
+        assert "A" in cache
+        assert "B" not in cache
+
+    def test_strong_tier_is_divided_exactly_between_shards(self):
+        for max_size, shards in [(20, 16), (16, 16), (100, 7), (5, 16), (1, 16)]:
+            # Given
+            cache = EntityCache(max_size=max_size, shards=shards)
+
+            # Then every shard should hold some values strongly, up to max_size in total
+            sizes = [shard.max_size for shard in cache._shards]
+            assert len(sizes) == min(shards, max_size)
+            assert min(sizes) >= 1
+            assert sum(sizes) == max_size
+
+    def test_strong_tier_never_exceeds_max_size(self):
+        # Given
+        cache = EntityCache(max_size=20, shards=16)
+
+        # When
+        for key in range(1000):
+            cache.update(key, Entity)
+
+        # Then no more than max_size values should be held strongly
+        assert cache.stats()["strong_size"] == 20
+
+    def test_get_many(self):
+        # Given
+        cache = EntityCache(shards=4)
+        values = [cache.update(key, Entity) for key in range(10)]
+
+        # When
+        found = cache.get_many([3, 12, 7, 3])
+
+        # Then only held values should be returned
+        assert found == {3: values[3], 7: values[7]}
+        assert cache.stats()["hits"] == 3
+        assert cache.stats()["misses"] == 11
+
+    def test_threaded_usage(self):
+        from threading import Thread
+        from time import time
+
+        cache = EntityCache(max_size=10000)
+        n_threads = 16
+        n_keys = 100000
+        values = []
+
+        def update_keys():
+            values.extend(cache.update(key, Entity) for key in range(n_keys))
+
+        threads = [Thread(target=update_keys) for _ in range(n_threads)]
+        t0 = time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print("Performed %d updates across %d threads in %.03fs" %
+              (n_threads * n_keys, n_threads, time() - t0))
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == n_threads * n_keys
+        assert stats["misses"] == n_keys
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import OrderedDict
+from time import time
+from unittest import TestCase
+
+from neo4j.packstream.structure import Structure
+
+from py2neo.data import Node, Path
+from py2neo.internal.caching import ThreadLocalEntityCache
+from py2neo.internal.http import read_transactional_response
+from py2neo.internal.json import JSONHydrator, JSONStreamReader
+from py2neo.internal.packstream import PackStreamHydrator
+
+
+# Response bodies in the layout returned by the transactional endpoint
+# of Neo4j 3.5 when asked for resultDataContents ["row", "graph"].
+
+ROW_GRAPH_RESPONSE = b"""\
+{"results":[{"columns":["a","r","b","p","m","l"],"data":[{"row":[{"name":"Alice"},\
+{"since":1999},{"name":"Bob"},[{"name":"Alice"},{"since":1999},{"name":"Bob"}],\
+{"person":{"name":"Alice"},"age":33},[{"name":"Alice"},{"name":"Bob"}]],"meta":[\
+{"id":0,"type":"node","deleted":false},{"id":0,"type":"relationship","deleted":false},\
+{"id":1,"type":"node","deleted":false},[{"id":0,"type":"node","deleted":false},\
+{"id":0,"type":"relationship","deleted":false},{"id":1,"type":"node","deleted":false}],\
+{"id":0,"type":"node","deleted":false},null,{"id":0,"type":"node","deleted":false},\
+{"id":1,"type":"node","deleted":false}],"graph":{"nodes":[{"id":"0","labels":["Person"],\
+"properties":{"name":"Alice"}},{"id":"1","labels":["Person"],"properties":{"name":"Bob"}}],\
+"relationships":[{"id":"0","type":"KNOWS","startNode":"0","endNode":"1",\
+"properties":{"since":1999}}]}}]}],"errors":[]}"""
+
+DELETED_RELATIONSHIP_RESPONSE = b"""\
+{"results":[{"columns":["r"],"data":[{"row":[{}],"meta":[{"id":5,"type":"relationship",\
+"deleted":true}],"graph":{"nodes":[],"relationships":[]}}]}],"errors":[]}"""
+
+MAPS_LIKE_ENTITIES_RESPONSE = b"""\
+{"results":[{"columns":["m","e","a"],"data":[{"row":[{"name":"Alice"},{},{"name":"Alice"}],\
+"meta":[null,{"id":0,"type":"node","deleted":false}],"graph":{"nodes":[{"id":"0",\
+"labels":["Person"],"properties":{"name":"Alice"}}],"relationships":[]}}]}],"errors":[]}"""
+
+EMPTY_LISTS_RESPONSE = b"""\
+{"results":[{"columns":["l","p","k"],"data":[{"row":[[],[{"name":"Alice"},{"since":1999},\
+{"name":"Bob"}],[]],"meta":[[{"id":0,"type":"node","deleted":false},{"id":0,\
+"type":"relationship","deleted":false},{"id":1,"type":"node","deleted":false}]],\
+"graph":{"nodes":[{"id":"0","labels":["Person"],"properties":{"name":"Alice"}},{"id":"1",\
+"labels":["Person"],"properties":{"name":"Bob"}}],"relationships":[{"id":"0","type":"KNOWS",\
+"startNode":"0","endNode":"1","properties":{"since":1999}}]}}]}],"errors":[]}"""
+
+NESTED_PATHS_RESPONSE = b"""\
+{"results":[{"columns":["ps","m"],"data":[{"row":[[[{"name":"Alice"},{"since":1999},\
+{"name":"Bob"}],[{"name":"Alice"}]],{"path":[{"name":"Alice"},{"since":1999},{"name":"Bob"}],\
+"n":1}],"meta":[[{"id":0,"type":"node","deleted":false},{"id":0,"type":"relationship",\
+"deleted":false},{"id":1,"type":"node","deleted":false}],[{"id":0,"type":"node",\
+"deleted":false}],[{"id":0,"type":"node","deleted":false},{"id":0,"type":"relationship",\
+"deleted":false},{"id":1,"type":"node","deleted":false}],null],"graph":{"nodes":[{"id":"0",\
+"labels":["Person"],"properties":{"name":"Alice"}},{"id":"1","labels":["Person"],\
+"properties":{"name":"Bob"}}],"relationships":[{"id":"0","type":"KNOWS","startNode":"0",\
+"endNode":"1","properties":{"since":1999}}]}}]}],"errors":[]}"""
+
+
+def read_records(response):
+    return [data for event, data in read_transactional_response(JSONStreamReader([response]))
+            if event == "record"]
+
+
+class FakeGraph(object):
+
+    database = None
+    name = "data"
+
+    def __init__(self):
+        self.node_cache = ThreadLocalEntityCache()
+        self.relationship_cache = ThreadLocalEntityCache()
+        self.queries = []
+        self.resolved = []
+
+    def run(self, cypher, **parameters):
+        # Relationship r starts at node r if r is odd, otherwise at node r + 1
+        self.queries.append(cypher)
+        return [(r, r if r % 2 else r + 1) for r in parameters["x"]]
+
+    def resolve(self, subgraph):
+        self.resolved.append(list(subgraph))
+        for node in subgraph:
+            node._stale.clear()
+
+
+class PackStreamHydratorTestCase(TestCase):
+
+    def test_scalar_result_with_one_million_records(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("n", "name", "scores"))
+        records = [[n, u"Alice", [1.0, 2.0, 3.0]] for n in range(1000000)]
+        t0 = time()
+        for record in records:
+            hydrator.hydrate(record)
+        print("Hydrated %d scalar records in %.03fs" % (len(records), time() - t0))
+
+    def test_lists_of_primitives_are_not_copied(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("scores",))
+        scores = [1.0, 2.0, 3.0]
+        for _ in range(hydrator.profile_size + 1):
+            value, = hydrator.hydrate([scores])
+            assert value is scores
+
+    def test_profiled_column_still_hydrates_structures(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("a",))
+        for n in range(hydrator.profile_size + 1):
+            hydrator.hydrate([n])
+        value, = hydrator.hydrate([Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})])
+        assert isinstance(value, Node)
+        assert value["name"] == u"Alice"
+
+    def test_profiled_column_hydrates_values_of_other_types(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("a",))
+        for n in range(hydrator.profile_size + 1):
+            hydrator.hydrate([[n]])
+        value, = hydrator.hydrate([Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})])
+        assert isinstance(value, Node)
+        value, = hydrator.hydrate([{u"a": Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})}])
+        assert isinstance(value[u"a"], Node)
+
+    def test_empty_collections_do_not_count_towards_profile(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("a",))
+        for n in range(hydrator.profile_size + 1):
+            hydrator.hydrate([[]])
+        value, = hydrator.hydrate([[Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})]])
+        assert isinstance(value[0], Node)
+
+    def test_hub_result_with_one_hundred_thousand_records(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("a", "r", "b"))
+        hub = Structure(b"N", 1, [u"Hub"], {u"name": u"Alice", u"since": 1999})
+        records = [[hub, Structure(b"R", n, 1, n, u"KNOWS", {}),
+                    Structure(b"N", n, [u"Person"], {u"name": u"Bob"})] for n in range(2, 100002)]
+        t0 = time()
+        for record in records:
+            hydrator.hydrate(record)
+        print("Hydrated %d hub records in %.03fs" % (len(records), time() - t0))
+
+    def test_repeated_node_is_hydrated_once_per_result(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("a",))
+        a1, = hydrator.hydrate([Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})])
+        a1["name"] = u"Alicia"
+        a2, = hydrator.hydrate([Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})])
+        assert a2 is a1
+        assert a2["name"] == u"Alice"
+
+    def test_repeated_entities_take_values_from_latest_record(self):
+        # UNWIND range(1, 3) AS i MATCH (a)-[r]->(b) SET a.count = i, r.count = i RETURN a, r
+        hydrator = PackStreamHydrator(FakeGraph(), ("a", "r"))
+        results = [hydrator.hydrate([Structure(b"N", 1, [u"Person"], {u"count": i}),
+                                     Structure(b"R", 7, 1, 2, u"KNOWS", {u"count": i})])
+                   for i in range(1, 4)]
+        a, r = results[-1]
+        assert all(result[0] is a and result[1] is r for result in results)
+        assert a["count"] == 3 and r["count"] == 3
+        a2, = hydrator.hydrate([Structure(b"N", 1, [u"Person", u"Employee"], {u"count": 3})])
+        assert a2 is a and a.labels == {u"Person", u"Employee"}
+
+    def test_relationships_of_five_hundred_types(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("r",))
+        records = [[Structure(b"R", n, 1, 2, u"TYPE_%d" % (n % 500), {})] for n in range(1, 100001)]
+        t0 = time()
+        for record in records:
+            hydrator.hydrate(record)
+        print("Hydrated %d relationships of 500 types in %.03fs" % (len(records), time() - t0))
+
+    def test_nodes_share_label_sets(self):
+        hydrator = PackStreamHydrator(FakeGraph(), ("a",))
+        nodes = [hydrator.hydrate([Structure(b"N", n, [u"Person", u"Employee"], {})])[0]
+                 for n in range(1, 100001)]
+        label_sets = set(map(id, (node._remote_labels for node in nodes)))
+        print("Hydrated %d nodes with %d distinct label sets" % (len(nodes), len(label_sets)))
+        assert len(label_sets) == 1
+
+    def test_stale_end_nodes_are_resolved_in_one_batch(self):
+        graph = FakeGraph()
+        hydrator = PackStreamHydrator(graph, ("r",))
+        relationships = [hydrator.hydrate([Structure(b"R", n, 1, n + 1000, u"KNOWS", {})])[0]
+                         for n in range(1, 101)]
+        _ = relationships[0].end_node["name"]
+        for relationship in relationships:
+            _ = relationship.end_node["name"]
+        assert len(graph.resolved) == 1
+        assert len(graph.resolved[0]) == 101
+
+
+class JSONHydratorTestCase(TestCase):
+
+    @staticmethod
+    def path_row(n):
+        # A path (n)-[n]->(n+1)<-[n+1]-(n+2)
+        return [{
+            "nodes": ["http://localhost:7474/db/data/node/%d" % i for i in (n, n + 1, n + 2)],
+            "relationships": ["http://localhost:7474/db/data/relationship/%d" % i for i in (n, n + 1)],
+        }]
+
+    def test_path_directions_are_resolved_in_one_query(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("p",))
+        rows = [self.path_row(n) for n in range(1, 1001, 2)]
+        hydrator.prepare(rows)
+        paths = [hydrator.hydrate(row)[0] for row in rows]
+        assert len(graph.queries) == 1
+        for path in paths:
+            r1, r2 = path.relationships
+            assert r1.start_node is path.nodes[0]
+            assert r2.start_node is path.nodes[2]
+
+    @staticmethod
+    def graph_row(row, meta, nodes=(), relationships=()):
+        return {
+            "row": row,
+            "meta": meta,
+            "graph": {
+                "nodes": [{"id": str(i), "labels": ["Person"], "properties": {"name": name}}
+                          for i, name in nodes],
+                "relationships": [{"id": str(i), "type": "KNOWS", "startNode": str(start),
+                                   "endNode": str(end), "properties": {}}
+                                  for i, start, end in relationships],
+            },
+        }
+
+    def test_row_format_hydrates_entities_without_extra_queries(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("a", "r", "b", "p"))
+        data = self.graph_row(
+            [{"name": "Alice"}, {}, {"name": "Bob"}, [{"name": "Bob"}, {}, {"name": "Alice"}]],
+            [{"id": 1, "type": "node", "deleted": False},
+             {"id": 7, "type": "relationship", "deleted": False},
+             {"id": 2, "type": "node", "deleted": False},
+             [{"id": 2, "type": "node", "deleted": False},
+              {"id": 7, "type": "relationship", "deleted": False},
+              {"id": 1, "type": "node", "deleted": False}]],
+            nodes=[(1, "Alice"), (2, "Bob")], relationships=[(7, 1, 2)])
+        values = hydrator.unpack(data)
+        hydrator.prepare([values])
+        a, r, b, p = hydrator.hydrate(values)
+        assert not graph.queries
+        assert a.has_label("Person") and a["name"] == "Alice"
+        assert r.start_node is a and r.end_node is b
+        assert type(r).__name__ == "KNOWS"
+        assert p.nodes == (b, a)
+        assert p.relationships[0] is r
+
+    def test_row_format_distinguishes_maps_from_entities(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("m", "e", "x", "n"))
+        data = self.graph_row(
+            [OrderedDict([("person", {"name": "Alice"}), ("age", 33)]), {}, 1, {}],
+            [{"id": 1, "type": "node", "deleted": False}, None, None,
+             {"id": 3, "type": "node", "deleted": False}],
+            nodes=[(1, "Alice")])
+        data["graph"]["nodes"].append({"id": "3", "labels": [], "properties": {}})
+        m, e, x, n = hydrator.hydrate(hydrator.unpack(data))
+        assert isinstance(m, dict) and m["age"] == 33
+        assert isinstance(m["person"], Node) and m["person"]["name"] == "Alice"
+        assert e == {} and not isinstance(e, Node)
+        assert isinstance(n, Node) and n.identity == 3
+
+    def test_row_format_supports_compact_entities(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("a",))
+        hydrator.compact = True
+        data = self.graph_row([{"name": "Alice"}], [{"id": 1, "type": "node", "deleted": False}],
+                              nodes=[(1, "Alice")])
+        a, = hydrator.hydrate(hydrator.unpack(data))
+        assert type(a).__name__ == "CompactNode"
+        assert a.labels == ("Person",)
+
+    def test_recorded_row_format_response(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("a", "r", "b", "p", "m", "l"))
+        data, = read_records(ROW_GRAPH_RESPONSE)
+        values = hydrator.unpack(data)
+        hydrator.prepare([values])
+        a, r, b, p, m, l = hydrator.hydrate(values)
+        assert not graph.queries
+        assert a.identity == 0 and a.has_label("Person") and a["name"] == "Alice"
+        assert b.identity == 1 and b["name"] == "Bob"
+        assert type(r).__name__ == "KNOWS" and r["since"] == 1999
+        assert r.start_node is a and r.end_node is b
+        assert p.nodes == (a, b) and p.relationships[0] is r
+        assert m == {"person": a, "age": 33} and m["person"] is a
+        assert l == [a, b] and l[0] is a and l[1] is b
+
+    def test_recorded_maps_equal_to_entity_properties_are_not_entities(self):
+        hydrator = JSONHydrator(FakeGraph(), ("m", "e", "a"))
+        data, = read_records(MAPS_LIKE_ENTITIES_RESPONSE)
+        m, e, a = hydrator.hydrate(hydrator.unpack(data))
+        assert type(m) is dict and m == {"name": "Alice"}
+        assert type(e) is dict and e == {}
+        assert isinstance(a, Node) and a.identity == 0 and a["name"] == "Alice"
+
+    def test_recorded_empty_lists_are_not_paths(self):
+        hydrator = JSONHydrator(FakeGraph(), ("l", "p", "k"))
+        data, = read_records(EMPTY_LISTS_RESPONSE)
+        l, p, k = hydrator.hydrate(hydrator.unpack(data))
+        assert l == [] and k == []
+        assert isinstance(p, Path) and [node["name"] for node in p.nodes] == ["Alice", "Bob"]
+
+    def test_recorded_nested_paths(self):
+        hydrator = JSONHydrator(FakeGraph(), ("ps", "m"))
+        data, = read_records(NESTED_PATHS_RESPONSE)
+        ps, m = hydrator.hydrate(hydrator.unpack(data))
+        assert isinstance(ps, list) and len(ps) == 2
+        assert isinstance(ps[0], Path) and len(ps[0]) == 1
+        assert isinstance(ps[1], Path) and len(ps[1]) == 0 and ps[1].start_node is ps[0].start_node
+        assert isinstance(m["path"], Path) and m["path"].relationships[0] is ps[0].relationships[0]
+        assert m["n"] == 1
+
+    def test_row_metadata_must_match_row_values(self):
+        hydrator = JSONHydrator(FakeGraph(), ("a", "x"))
+        data = self.graph_row([{"name": "Alice"}, 1], [None, {"id": 1, "type": "node", "deleted": False}],
+                              nodes=[(1, "Alice")])
+        with self.assertRaises(ValueError):
+            hydrator.unpack(data)
+
+    def test_recorded_deleted_relationship_is_hydrated_as_stale(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("r",))
+        data, = read_records(DELETED_RELATIONSHIP_RESPONSE)
+        r, = hydrator.hydrate(hydrator.unpack(data))
+        assert r.identity == 5 and r.graph is graph
+        assert "properties" in r._stale
+        assert graph.relationship_cache[5] is r
+
+    def test_recorded_deleted_relationship_reuses_cached_instance(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("a", "r", "b", "p", "m", "l"))
+        data, = read_records(ROW_GRAPH_RESPONSE)
+        cached = hydrator.hydrate(hydrator.unpack(data))[1]
+        hydrator = JSONHydrator(graph, ("r",))
+        data, = read_records(DELETED_RELATIONSHIP_RESPONSE.replace(b'"id":5', b'"id":0'))
+        r, = hydrator.hydrate(hydrator.unpack(data))
+        assert r is cached
+
+    def test_repeated_entities_in_row_format_take_values_from_latest_record(self):
+        graph = FakeGraph()
+        hydrator = JSONHydrator(graph, ("a", "r"))
+        results = []
+        for i in range(1, 4):
+            data = self.graph_row([{"count": i}, {"count": i}],
+                                  [{"id": 1, "type": "node", "deleted": False},
+                                   {"id": 7, "type": "relationship", "deleted": False}],
+                                  nodes=[(1, "Alice")], relationships=[(7, 1, 2)])
+            data["graph"]["nodes"][0]["properties"] = {"count": i}
+            data["graph"]["relationships"][0]["properties"] = {"count": i}
+            results.append(hydrator.hydrate(hydrator.unpack(data)))
+        a, r = results[-1]
+        assert all(result[0] is a and result[1] is r for result in results)
+        assert a["count"] == 3 and r["count"] == 3
+
+    def test_repeated_entities_in_rest_format_take_values_from_latest_record(self):
+        hydrator = JSONHydrator(FakeGraph(), ("a",))
+        results = [hydrator.hydrate([{"self": "http://localhost:7474/db/data/node/1",
+                                      "metadata": {"id": 1, "labels": ["Person"]},
+                                      "data": {"count": i}}]) for i in range(1, 4)]
+        a, = results[-1]
+        assert all(result[0] is a for result in results)
+        assert a["count"] == 3
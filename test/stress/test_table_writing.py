@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from io import StringIO
+from timeit import default_timer as timer
+from unittest import TestCase
+
+from py2neo.data import Table
+
+
+RECORD_COUNT = 200000
+
+
+class TableWritingBenchmark(TestCase):
+    """ Benchmark for writing large tables. Each test writes the same
+    table in one format and reports the throughput achieved.
+    """
+
+    table = None
+    results = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = Table([(n, u"Person %d" % n, n * 0.5, n % 2 == 0, [n, n + 1])
+                           for n in range(RECORD_COUNT)],
+                          keys=["number", "name", "score", "even", "pair"])
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, seconds in sorted(cls.results.items()):
+            print("%-20s %8.3fs %12.0f records/s" % (name, seconds, RECORD_COUNT / seconds))
+
+    def benchmark(self, name, method, **kwargs):
+        out = StringIO()
+        t0 = timer()
+        count = method(out, header=True, **kwargs)
+        self.results[name] = timer() - t0
+        self.assertEqual(count, RECORD_COUNT)
+        return out.getvalue()
+
+    def test_write(self):
+        value = self.benchmark("write", self.table.write)
+        self.assertEqual(value.count(u"\r\n"), RECORD_COUNT + 2)
+
+    def test_write_html(self):
+        value = self.benchmark("write_html", self.table.write_html)
+        self.assertEqual(value.count(u"<tr>"), RECORD_COUNT + 1)
+
+    def test_write_csv(self):
+        value = self.benchmark("write_csv", self.table.write_csv)
+        self.assertEqual(value.count(u"\r\n"), RECORD_COUNT + 1)
+
+    def test_write_tsv(self):
+        value = self.benchmark("write_tsv", self.table.write_tsv)
+        self.assertEqual(value.count(u"\r\n"), RECORD_COUNT + 1)
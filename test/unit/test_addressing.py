@@ -29,7 +29,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'bolt',
@@ -45,7 +49,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'bolt+routing',
@@ -61,7 +69,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'http',
@@ -77,7 +89,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'https',
@@ -93,7 +109,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'https',
@@ -109,7 +129,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'https',
@@ -125,7 +149,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'http',
@@ -141,7 +169,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'http',
@@ -157,7 +189,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'other',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 9999,
             'scheme': 'bolt',
@@ -173,7 +209,11 @@ class AddressingTestCase(TestCase):
         del data["hash"]
         self.assertEqual(data, {
             'auth': ('neo4j', 'password'),
+            'blocking': False,
+            'compression': False,
             'host': 'host',
+            'keep_alive': True,
+            'max_connections': 10,
             'password': 'password',
             'port': 8888,
             'scheme': 'bolt',
@@ -183,3 +223,11 @@ class AddressingTestCase(TestCase):
             'user': 'neo4j',
             'user_agent': bolt_user_agent(),
         })
+
+    def test_http_pool_settings(self):
+        data = get_connection_data("http://host:9999", max_connections=4, blocking=True,
+                                   keep_alive=False, compression=True)
+        self.assertEqual(data["max_connections"], 4)
+        self.assertTrue(data["blocking"])
+        self.assertFalse(data["keep_alive"])
+        self.assertTrue(data["compression"])
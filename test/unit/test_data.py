@@ -16,10 +16,14 @@
 # limitations under the License.
 
 
+from copy import copy, deepcopy
 from io import StringIO
-from unittest import TestCase
+from pickle import HIGHEST_PROTOCOL, dumps, loads
+from unittest import TestCase, skipIf
 
-from py2neo.data import Table, Subgraph, Walkable, Node, Relationship, PropertyDict, Path, walk
+from py2neo.data import Table, ColumnTable, Subgraph, Walkable, Node, Relationship, PropertyDict, Path, Record, LazyRecord, \
+    CompactNode, CompactRelationship, walk
+from py2neo.internal.compat import Sequence
 
 
 KNOWS = Relationship.type("KNOWS")
@@ -348,6 +352,237 @@ class DataListTestCase(TestCase):
                                          u'Carol\t55\r\n'
                                          u'Dave\t66\r\n')
 
+    def test_write_html(self):
+        table = Table([
+            ["Alice", 33],
+            ["Bob <b>", 44],
+        ], keys=["name", "age"])
+        out = StringIO()
+        table.write_html(out, header=True)
+        self.assertEqual(out.getvalue(), u'<table>'
+                                         u'<tr><th>name</th><th>age</th></tr>'
+                                         u'<tr><td style="text-align:left">Alice</td>'
+                                         u'<td style="text-align:right">33</td></tr>'
+                                         u'<tr><td style="text-align:left">Bob &lt;b&gt;</td>'
+                                         u'<td style="text-align:right">44</td></tr>'
+                                         u'</table>')
+
+    def test_write_with_many_records_is_buffered(self):
+        table = Table([["Alice", n] for n in range(2500)], keys=["name", "number"])
+        writes = []
+
+        class File(object):
+
+            def write(self, data):
+                writes.append(data)
+
+        self.assertEqual(table.write_csv(File(), header=True), 2500)
+        self.assertEqual(len(writes), 3)
+        self.assertEqual(u"".join(writes).count(u"\r\n"), 2501)
+        del writes[:]
+        self.assertEqual(table.write(File(), header=True), 2500)
+        self.assertEqual(len(writes), 3)
+        self.assertEqual(u"".join(writes).count(u"\r\n"), 2502)
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnTableTestCase(TestCase):
+
+    records = [
+        ["Alice", 33, 1.5, None],
+        ["Bob", None, 2.5, True],
+        ["Carol", 55, 3.5, False],
+    ]
+    keys = ["name", "age", "score", "flag"]
+
+    def test_behaves_as_table(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        expected = Table(self.records, keys=self.keys)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table, expected)
+        self.assertEqual(list(table), list(expected))
+        self.assertEqual(table[1], ("Bob", None, 2.5, True))
+        self.assertEqual(table[-1], ("Carol", 55, 3.5, False))
+        self.assertIn(("Alice", 33, 1.5, None), table)
+        self.assertEqual(table.keys(), self.keys)
+        with self.assertRaises(IndexError):
+            _ = table[3]
+
+    def test_field_metadata_matches_table(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        expected = Table(self.records, keys=self.keys)
+        for key in self.keys:
+            self.assertEqual(table.field(key), expected.field(key))
+
+    def test_numeric_columns_are_typed(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        age, age_mask = table._columns[1]
+        score, score_mask = table._columns[2]
+        self.assertIn(age.typecode, ("q", "l"))
+        self.assertEqual(list(age_mask), [0, 1, 0])
+        self.assertEqual(score.typecode, "d")
+        self.assertIsNone(score_mask)
+        self.assertIsInstance(table._columns[0][0], list)
+        self.assertIsInstance(table._columns[3][0], list)
+
+    def test_oversized_integers_are_not_typed(self):
+        table = ColumnTable([[2 ** 64], [1]], keys=["n"])
+        self.assertIsInstance(table._columns[0][0], list)
+        self.assertEqual(table.column("n"), [2 ** 64, 1])
+
+    def test_column(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        self.assertEqual(table.column("age"), [33, None, 55])
+        self.assertEqual(table.column(0), ["Alice", "Bob", "Carol"])
+
+    def test_slice(self):
+        table = ColumnTable(self.records, keys=self.keys)[1:]
+        self.assertIsInstance(table, ColumnTable)
+        self.assertEqual(table, Table(self.records[1:], keys=self.keys))
+
+    def test_select(self):
+        table = ColumnTable(self.records, keys=self.keys).select("score", "name")
+        self.assertEqual(table.keys(), ["score", "name"])
+        self.assertEqual(table, [(1.5, "Alice"), (2.5, "Bob"), (3.5, "Carol")])
+
+    def test_list_operations_match_table(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        expected = Table(self.records, keys=self.keys)
+        extra = [("Dave", 66, 4.5, None)]
+        self.assertEqual(table + extra, expected + extra)
+        self.assertEqual(extra + table, extra + expected)
+        self.assertEqual(table + table, expected + expected)
+        self.assertEqual(table * 2, expected * 2)
+        self.assertEqual(2 * table, 2 * expected)
+        self.assertEqual(table.copy(), list(expected))
+        self.assertEqual(sorted(table, reverse=True), sorted(expected, reverse=True))
+        self.assertTrue(table < extra)
+        self.assertEqual(table.count(("Bob", None, 2.5, True)), 1)
+        self.assertEqual(table.index(("Carol", 55, 3.5, False)), 2)
+
+    def test_is_immutable(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        record = ("Dave", 66, 4.5, None)
+        for method in ("append", "extend", "insert", "remove", "pop", "reverse", "sort", "clear"):
+            self.assertFalse(hasattr(table, method))
+        with self.assertRaises(TypeError):
+            table[0] = record
+        with self.assertRaises(TypeError):
+            del table[0]
+        table += [record]
+        self.assertIsInstance(table, list)
+        self.assertEqual(table, Table(self.records + [record], keys=self.keys))
+
+    def test_is_sequence_not_list(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        self.assertIsInstance(table, Sequence)
+        self.assertNotIsInstance(table, list)
+        self.assertEqual(list(reversed(table)), list(reversed(Table(self.records, keys=self.keys))))
+
+    def test_copy(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        for copied in (copy(table), deepcopy(table)):
+            self.assertIsInstance(copied, ColumnTable)
+            self.assertEqual(copied, table)
+            self.assertEqual(copied.keys(), table.keys())
+            self.assertEqual(copied.field("age"), table.field("age"))
+
+    def test_pickle(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        for protocol in range(HIGHEST_PROTOCOL + 1):
+            unpickled = loads(dumps(table, protocol))
+            self.assertIsInstance(unpickled, ColumnTable)
+            self.assertEqual(unpickled, table)
+            self.assertEqual(unpickled.keys(), table.keys())
+            self.assertEqual(unpickled.column("age"), [33, None, 55])
+
+    def test_empty(self):
+        table = ColumnTable([], keys=["a", "b"])
+        self.assertEqual(len(table), 0)
+        self.assertFalse(table)
+        self.assertEqual(list(table), [])
+
+    def test_write_output_matches_table(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        expected = Table(self.records, keys=self.keys)
+        for method in ("write", "write_html", "write_csv"):
+            out, expected_out = StringIO(), StringIO()
+            getattr(table, method)(out, header=True)
+            getattr(expected, method)(expected_out, header=True)
+            self.assertEqual(out.getvalue(), expected_out.getvalue())
+
+    @skipIf(numpy is None, "NumPy not installed")
+    def test_to_ndarray(self):
+        table = ColumnTable(self.records, keys=self.keys)
+        score = table.to_ndarray("score")
+        self.assertEqual(score.tolist(), [1.5, 2.5, 3.5])
+        self.assertFalse(score.flags.writeable)
+        age = table.to_ndarray("age")
+        self.assertEqual(age.tolist(), [33, None, 55])
+        numbers = table.select("age", "score")[::2].to_ndarray()
+        self.assertEqual(numbers.tolist(), [[33.0, 1.5], [55.0, 3.5]])
+
+
+class LazyRecordTestCase(TestCase):
+
+    def setUp(self):
+        self.hydrated = []
+
+        def hydrate(index, value):
+            self.hydrated.append(index)
+            return value * 10
+
+        self.record = LazyRecord(["a", "b", "c"], [1, 2, 3], hydrate)
+
+    def test_values_are_hydrated_on_first_access_only(self):
+        self.assertEqual(self.record["b"], 20)
+        self.assertEqual(self.record[1], 20)
+        self.assertEqual(self.hydrated, [1])
+
+    def test_lazy_record_equals_eager_record(self):
+        self.assertEqual(self.record, Record(zip(["a", "b", "c"], [10, 20, 30])))
+        self.assertEqual(list(self.record), [10, 20, 30])
+        self.assertEqual(self.record.data(), {"a": 10, "b": 20, "c": 30})
+        self.assertEqual(self.record.items(), [("a", 10), ("b", 20), ("c", 30)])
+
+    def test_get_and_slice(self):
+        self.assertEqual(self.record.get("c"), 30)
+        self.assertIsNone(self.record.get("z"))
+        self.assertEqual(self.record[1:], Record(zip(["b", "c"], [20, 30])))
+        self.assertNotIn(0, self.hydrated)
+
+
+class CompactEntityTestCase(TestCase):
+
+    def test_compact_nodes_share_label_tuples(self):
+        a = CompactNode(None, 1, [u"Person", u"Employee"], {u"name": u"Alice"})
+        b = CompactNode(None, 2, [u"Employee", u"Person"], {u"name": u"Bob"})
+        self.assertIs(a.labels, b.labels)
+        self.assertTrue(a.has_label(u"Person"))
+        self.assertEqual(a["name"], u"Alice")
+        self.assertIsNone(a["age"])
+
+    def test_compact_node_labels_are_interned(self):
+        a = CompactNode(None, 1, [u"Per" + u"son"], {})
+        b = CompactNode(None, 2, [u"Pe" + u"rson"], {})
+        self.assertIs(a.labels[0], b.labels[0])
+
+    def test_compact_entities_have_no_instance_dict(self):
+        a = CompactNode(None, 1, [u"Person"], {})
+        r = CompactRelationship(None, 1, 1, 2, u"KNOWS", {})
+        self.assertFalse(hasattr(a, "__dict__"))
+        self.assertFalse(hasattr(r, "__dict__"))
+
+    def test_compact_uuid_is_generated_once_on_demand(self):
+        a = CompactNode(None, 1, [u"Person"], {})
+        self.assertIsNone(a._uuid)
+        self.assertEqual(a.__uuid__, a.__uuid__)
+
 
 class NodeCastTestCase(TestCase):
 
@@ -770,6 +1005,17 @@ class NodeTestCase(TestCase):
 
 class RelationshipTestCase(TestCase):
 
+    def test_relationship_type_is_registered(self):
+        assert Relationship.type("KNOWS") is KNOWS
+        assert type(Relationship(alice, "KNOWS", bob)) is KNOWS
+
+    def test_relationship_type_finds_declared_subclass(self):
+
+        class DECLARED_TYPE(Relationship):
+            pass
+
+        assert Relationship.type("DECLARED_TYPE") is DECLARED_TYPE
+
     def test_nodes(self):
         nodes = alice_knows_bob.nodes
         assert isinstance(nodes, tuple)
@@ -14,3 +14,125 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+
+from io import StringIO
+from json import loads as json_loads
+from unittest import TestCase
+
+from py2neo.data import Node, Record
+from py2neo.database import Cursor, Database, Graph, GraphError, Schema
+from py2neo.internal.compat import TimeoutError
+
+
+class DatabaseTestCase(TestCase):
+
+    def test_http_driver_hydrates_into_owning_database(self):
+        db = Database("http://localhost:7474", max_connections=3)
+        self.assertIs(db.driver._database, db)
+
+
+class GraphTestCase(TestCase):
+
+    def test_cache_size_is_fixed_when_graph_is_first_created(self):
+        graph = Graph("http://localhost:7476", cache_size=10)
+        self.assertEqual(graph.node_cache.max_size, 10)
+        self.assertEqual(graph.relationship_cache.max_size, 10)
+        self.assertIs(Graph("http://localhost:7476"), graph)
+        self.assertIs(Graph("http://localhost:7476", cache_size=10), graph)
+        with self.assertRaises(ValueError):
+            Graph("http://localhost:7476", cache_size=20)
+
+
+class FakeSchemaGraph(object):
+
+    def __init__(self, index_rows):
+        self.index_rows = index_rows
+        self.statements = []
+
+    def run(self, statement, **parameters):
+        self.statements.append(statement)
+        if statement.startswith("CALL db.awaitIndexes"):
+            error = GraphError("There is no procedure with the name `db.awaitIndexes` registered")
+            error.code = "Neo.ClientError.Procedure.ProcedureNotFound"
+            raise error
+        return list(self.index_rows)
+
+
+class SchemaTestCase(TestCase):
+
+    def test_await_indexes_returns_once_online(self):
+        graph = FakeSchemaGraph([(u"INDEX ON :Person(name)", u"Person", [u"name"], u"ONLINE",
+                                  u"node_label_property", {})])
+        Schema(graph).await_indexes([(u"Person", (u"name",), None)], timeout=0)
+        self.assertEqual(graph.statements, ["CALL db.awaitIndexes($timeout)", "CALL db.indexes"])
+
+    def test_await_indexes_times_out(self):
+        graph = FakeSchemaGraph([(u"INDEX ON :Person(name)", u"Person", [u"name"], u"POPULATING",
+                                  u"node_label_property", {})])
+        with self.assertRaises(TimeoutError):
+            Schema(graph).await_indexes([(u"Person", (u"name",), None)], timeout=0)
+
+
+class FakeResult(object):
+
+    def __init__(self, keys, rows):
+        self._keys = keys
+        self._records = [Record(zip(keys, row)) for row in rows]
+        self.fetched = 0
+
+    def keys(self):
+        return self._keys
+
+    def fetch(self):
+        try:
+            record = self._records[self.fetched]
+        except IndexError:
+            return None
+        else:
+            self.fetched += 1
+            return record
+
+
+class CursorWriterTestCase(TestCase):
+
+    keys = ["name", "age", "note"]
+    rows = [[u"Alice", 33, None], [u"Bob", 44, u"says \"hi\", loudly"]]
+
+    def test_csv_output(self):
+        out = StringIO()
+        count = Cursor(FakeResult(self.keys, self.rows)).write_csv(out, header=True)
+        self.assertEqual(count, 2)
+        self.assertEqual(out.getvalue(), u"name,age,note\r\n"
+                                         u"Alice,33,\r\n"
+                                         u"Bob,44,\"says \"\"hi\"\", loudly\"\r\n")
+
+    def test_tsv_output(self):
+        out = StringIO()
+        Cursor(FakeResult(self.keys, self.rows)).write_tsv(out)
+        self.assertEqual(out.getvalue(), u"Alice\t33\t\r\n"
+                                         u"Bob\t44\t\"says \"\"hi\"\", loudly\"\r\n")
+
+    def test_records_are_written_in_chunks(self):
+        writes = []
+
+        class File(object):
+
+            def write(self, data):
+                writes.append((result.fetched, data))
+
+        rows = [[i, i, i] for i in range(10)]
+        result = FakeResult(self.keys, rows)
+        count = Cursor(result).write_csv(File(), chunk_size=4)
+        self.assertEqual(count, 10)
+        self.assertEqual([fetched for fetched, _ in writes], [4, 8, 10])
+        self.assertEqual(u"".join(data for _, data in writes).count(u"\r\n"), 10)
+
+    def test_jsonl_output(self):
+        out = StringIO()
+        alice = Node("Person", name="Alice")
+        Cursor(FakeResult(["n", "x"], [[alice, 1], [None, [1, 2]]])).write_jsonl(out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(json_loads(lines[0]), {"n": {"identity": None, "labels": ["Person"],
+                                                      "properties": {"name": "Alice"}}, "x": 1})
+        self.assertEqual(json_loads(lines[1]), {"n": None, "x": [1, 2]})
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from json import dumps, loads
+from threading import Event, Thread
+from unittest import TestCase
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from neo4j.exceptions import AuthError, Forbidden, ServiceUnavailable
+
+from py2neo.database import Database, GraphError
+from py2neo.internal.http import result_data_contents
+
+
+class FakeTransactionalEndpoint(object):
+    """ Minimal stand-in for the transactional HTTP endpoint of a Neo4j
+    server. Each autocommit statement returns `size` records of
+    integers in the row format or, for a statement starting with "PATH",
+    `size` paths (1)-[1]->(2)<-[2]-(3) in the REST format. The response
+    is written in two chunked halves, the second only once
+    :attr:`.resume` is set (or after a timeout), so that tests can tell
+    whether records reached the client before the response was
+    complete.
+    """
+
+    def __init__(self, size=5000, version="3.5.0"):
+        self.size = size
+        self.version = version
+        self.resume = Event()
+        self.resumed_early = []
+        self.statements = []
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_body(dumps({"neo4j_version": endpoint.version}).encode("utf-8"))
+
+            def do_POST(self):
+                data = loads(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+                statement = data["statements"][0]["statement"]
+                endpoint.statements.append(statement)
+                if statement.startswith("FAIL"):
+                    body = {"results": [], "errors": [{"code": "Neo.DatabaseError.General.UnknownError",
+                                                       "message": "Failed"}]}
+                elif statement.startswith("PATH"):
+                    body = {"results": [{"columns": ["p"],
+                                         "data": [self.path_data(data["statements"][0])
+                                                  for _ in range(endpoint.size)],
+                                         "stats": {}}], "errors": []}
+                else:
+                    body = {"results": [{"columns": ["n"],
+                                         "data": [{"row": [i], "meta": [None]} for i in range(endpoint.size)],
+                                         "stats": {}}], "errors": []}
+                payload = dumps(body).encode("utf-8")
+                half = len(payload) // 2
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self.send_chunk(payload[:half])
+                endpoint.resumed_early.append(endpoint.resume.wait(5))
+                endpoint.resume.clear()
+                self.send_chunk(payload[half:])
+                self.send_chunk(b"")
+
+            def path_data(self, statement):
+                uri = endpoint.uri + "/db/data/%s/%d"
+                data = {"rest": [{"nodes": [uri % ("node", i) for i in (1, 2, 3)],
+                                  "relationships": [uri % ("relationship", i) for i in (1, 2)],
+                                  "start": uri % ("node", 1), "end": uri % ("node", 3), "length": 2}]}
+                if "graph" in statement.get("resultDataContents", []):
+                    data["graph"] = {"nodes": [{"id": str(i), "labels": [], "properties": {}} for i in (1, 2, 3)],
+                                     "relationships": [{"id": "1", "type": "TO", "startNode": "1", "endNode": "2",
+                                                        "properties": {}},
+                                                       {"id": "2", "type": "TO", "startNode": "3", "endNode": "2",
+                                                        "properties": {}}]}
+                return data
+
+            def send_body(self, payload):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def send_chunk(self, data):
+                self.wfile.write(("%x\r\n" % len(data)).encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.uri = "http://127.0.0.1:%d" % self.server.server_address[1]
+        thread = Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class AutocommitStreamingTestCase(TestCase):
+
+    def setUp(self):
+        self.endpoint = FakeTransactionalEndpoint()
+
+    def tearDown(self):
+        self.endpoint.close()
+
+    def graph(self, **settings):
+        return Database(self.endpoint.uri, **settings).default_graph
+
+    def test_records_reach_cursor_before_response_is_complete(self):
+        graph = self.graph()
+        cursor = graph.run("UNWIND range(0, 4999) AS n RETURN n")
+        self.assertTrue(cursor.forward())
+        self.assertEqual(cursor.current["n"], 0)
+        self.endpoint.resume.set()
+        self.assertEqual([record["n"] for record in cursor], list(range(1, 5000)))
+        self.assertEqual(self.endpoint.resumed_early, [True])
+
+    def test_connection_is_released_once_cursor_is_exhausted(self):
+        graph = self.graph(max_connections=1, blocking=True)
+        for _ in range(3):
+            self.endpoint.resume.set()
+            self.assertEqual(len(list(graph.run("UNWIND range(0, 4999) AS n RETURN n"))), 5000)
+        self.assertEqual(len(self.endpoint.statements), 3)
+
+    def test_connection_is_released_when_cursor_is_closed(self):
+        graph = self.graph(max_connections=1, blocking=True)
+        cursor = graph.run("UNWIND range(0, 4999) AS n RETURN n")
+        self.assertEqual(cursor.evaluate(), 0)
+        self.endpoint.resume.set()
+        cursor.close()
+        self.endpoint.resume.set()
+        self.assertEqual(graph.evaluate("RETURN 1"), 0)
+
+    def test_statement_errors_are_raised_by_run(self):
+        graph = self.graph(max_connections=1, blocking=True)
+        self.endpoint.resume.set()
+        with self.assertRaises(GraphError):
+            graph.run("FAIL")
+        self.endpoint.resume.set()
+        self.assertEqual(graph.evaluate("RETURN 1"), 0)
+
+
+class RESTPathStreamingTestCase(TestCase):
+
+    def setUp(self):
+        self.endpoint = FakeTransactionalEndpoint(size=1500, version="3.2.9")
+
+    def tearDown(self):
+        self.endpoint.close()
+
+    def test_path_directions_need_no_further_queries(self):
+        graph = Database(self.endpoint.uri, max_connections=1, blocking=True).default_graph
+        self.endpoint.resume.set()
+        paths = [record["p"] for record in graph.run("PATH")]
+        self.assertEqual(len(paths), 1500)
+        self.assertEqual(self.endpoint.statements, ["PATH"])
+        for path in paths:
+            r1, r2 = path.relationships
+            self.assertEqual((r1.start_node.identity, r1.end_node.identity), (1, 2))
+            self.assertEqual((r2.start_node.identity, r2.end_node.identity), (3, 2))
+
+
+class FakeHTTP(object):
+
+    def __init__(self, response):
+        self.response = response
+
+    def get_json(self, ref):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class ResultDataContentsTestCase(TestCase):
+
+    def test_row_and_graph_formats_are_used_from_neo4j_3_3(self):
+        self.assertEqual(result_data_contents(FakeHTTP({"neo4j_version": "3.3.0"})), ["row", "graph"])
+        self.assertEqual(result_data_contents(FakeHTTP({"neo4j_version": "3.2.9"})), ["REST", "graph"])
+        self.assertEqual(result_data_contents(FakeHTTP({})), ["REST", "graph"])
+
+    def test_no_format_is_selected_if_server_cannot_be_asked(self):
+        for error in (AuthError("Unauthorized"), Forbidden("Forbidden"),
+                      ServiceUnavailable("Cannot connect"), GraphError("Failed")):
+            self.assertIsNone(result_data_contents(FakeHTTP(error)))
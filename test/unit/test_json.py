@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from unittest import TestCase
+
+from py2neo.internal.json import JSONCodec, JSONStreamReader, json_codec
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class JSONStreamReaderTestCase(TestCase):
+
+    def read_array(self, data, size):
+        reader = JSONStreamReader(chunked(data, size))
+        values = []
+        if reader.start(u"["):
+            while True:
+                values.append(reader.read_value())
+                if not reader.advance(u"]"):
+                    break
+        self.assertIsNone(reader.peek())
+        return values
+
+    def test_can_read_empty_array(self):
+        self.assertEqual(self.read_array(b" [ ] ", 1), [])
+
+    def test_can_read_values_split_across_chunks(self):
+        data = b'[{"a": [1, 2.5, null]}, "text", true, 12345678]'
+        for size in range(1, len(data) + 1):
+            self.assertEqual(self.read_array(data, size),
+                             [{u"a": [1, 2.5, None]}, u"text", True, 12345678])
+
+    def test_can_read_multibyte_characters_split_across_chunks(self):
+        data = u'["café", "€"]'.encode("utf-8")
+        for size in range(1, len(data) + 1):
+            self.assertEqual(self.read_array(data, size), [u"café", u"€"])
+
+    def test_can_read_object_keys(self):
+        reader = JSONStreamReader(chunked(b'{"a": 1, "b": [2]}', 3))
+        self.assertTrue(reader.start(u"{"))
+        self.assertEqual(reader.read_key(), u"a")
+        self.assertEqual(reader.read_value(), 1)
+        self.assertTrue(reader.advance(u"}"))
+        self.assertEqual(reader.read_key(), u"b")
+        self.assertEqual(reader.read_value(), [2])
+        self.assertFalse(reader.advance(u"}"))
+
+    def test_truncated_input_raises_value_error(self):
+        reader = JSONStreamReader(chunked(b'[{"a": 1', 2))
+        reader.start(u"[")
+        with self.assertRaises(ValueError):
+            reader.read_value()
+
+
+class JSONCodecTestCase(TestCase):
+
+    def test_round_trip(self):
+        codec = JSONCodec()
+        value = {u"name": u"Alice", u"tags": [1, 2.5, True, None], u"nested": {u"x": u"\u00e9"}}
+        data = codec.encode(value)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(codec.decode(data), value)
+
+    def test_tuples_and_iterators_are_encoded_as_lists(self):
+        codec = JSONCodec()
+        self.assertEqual(codec.decode(codec.encode({u"a": (1, 2), u"b": map(int, u"34")})),
+                         {u"a": [1, 2], u"b": [3, 4]})
+
+    def test_unsupported_values_are_reported(self):
+        for codec in (JSONCodec(), json_codec()):
+            value = object()
+            with self.assertRaises(TypeError) as context:
+                codec.encode({u"x": [value]})
+            self.assertIs(context.exception.args[0], value)
+
+    def test_fastest_codec_agrees_with_standard_codec(self):
+        codec = json_codec()
+        value = {u"x": [1, -2, 3.5, u"four", None, False], u"y": {u"z": u"\u2603"}}
+        self.assertEqual(codec.decode(codec.encode(value)), JSONCodec().decode(JSONCodec().encode(value)))
+
+    def test_out_of_range_integers_are_rejected(self):
+        for codec in (JSONCodec(), json_codec()):
+            for value in (2 ** 63, 2 ** 64 - 1, 2 ** 70, -(2 ** 63) - 1):
+                with self.assertRaises(ValueError):
+                    codec.encode({u"x": [value]})
+
+    def test_long_digit_strings_and_int64_bounds_are_accepted(self):
+        for codec in (JSONCodec(), json_codec()):
+            value = {u"x": [2 ** 63 - 1, -(2 ** 63)], u"y": u"1234567890123456789012345"}
+            self.assertEqual(codec.decode(codec.encode(value)), value)
+
+    def test_dates_times_and_uuids_are_reported(self):
+        from datetime import date, datetime, time
+        from uuid import uuid4
+        for codec in (JSONCodec(), json_codec()):
+            for value in (date.today(), datetime.now(), time(12, 30), uuid4()):
+                with self.assertRaises(TypeError) as context:
+                    codec.encode({u"x": [value]})
+                self.assertIs(context.exception.args[0], value)
+
+    def test_uuid_shaped_strings_are_accepted(self):
+        for codec in (JSONCodec(), json_codec()):
+            value = {u"id": u"12345678-1234-1234-1234-123456789abc"}
+            self.assertEqual(codec.decode(codec.encode(value)), value)
+
+    def test_codecs_agree_on_floats_and_enumerations(self):
+        from enum import Enum, IntEnum
+
+        class Colour(Enum):
+            RED = 1
+
+        class Size(IntEnum):
+            LARGE = 3
+
+        class Shape(str, Enum):
+            SQUARE = u"square"
+
+        nan, inf = float("nan"), float("inf")
+        values = [1.5, -0.0, 1e308, [1e308, 1e308], nan, inf, -inf, [1.0, [2.0, {u"z": nan}]], (inf,),
+                  Colour.RED, [Colour.RED], Size.LARGE, {u"s": Shape.SQUARE}]
+
+        def outcome(codec, value):
+            try:
+                data = codec.encode({u"x": value})
+            except (TypeError, ValueError) as error:
+                return type(error)
+            else:
+                return codec.decode(data)
+
+        for value in values:
+            self.assertEqual(outcome(JSONCodec(), value), outcome(json_codec(), value), value)
+        self.assertEqual(outcome(JSONCodec(), map(float, [u"1", u"nan"])),
+                         outcome(json_codec(), map(float, [u"1", u"nan"])))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from unittest import TestCase
+
+from py2neo.matching import RelationshipMatch
+
+
+class FakeGraph(object):
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, cypher, parameters=None, **kwparameters):
+        self.queries.append(cypher)
+        return iter([])
+
+
+class RelationshipMatchTestCase(TestCase):
+
+    def test_first_with_endpoints_matches_one_relationship(self):
+        graph = FakeGraph()
+        match = RelationshipMatch(graph, r_type="TO").with_endpoints()
+        self.assertIsNone(match.first())
+        self.assertEqual(graph.queries, ["MATCH (a)-[_:TO]->(b) RETURN _, a, b LIMIT 1"])
+
+    def test_first_with_endpoints_keeps_lower_limit(self):
+        graph = FakeGraph()
+        match = RelationshipMatch(graph, r_type="TO").with_endpoints().limit(0)
+        self.assertIsNone(match.first())
+        self.assertEqual(graph.queries, ["MATCH (a)-[_:TO]->(b) RETURN _, a, b LIMIT 0"])
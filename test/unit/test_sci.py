@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2018, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from datetime import datetime
+from unittest import TestCase, skipIf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from py2neo.internal.json import JSONCodec
+from py2neo.internal.operations import create_nodes_from_frame, merge_nodes_from_frame
+from py2neo.internal.sci import fix_sci_parameters, is_sci, sci_to_native
+
+
+@skipIf(numpy is None, "NumPy is not installed")
+class NumPyConversionTestCase(TestCase):
+
+    def test_scalars_become_native(self):
+        for value, expected in [(numpy.int64(1), 1), (numpy.float32(0.5), 0.5), (numpy.bool_(True), True)]:
+            converted = sci_to_native(value)
+            self.assertEqual(converted, expected)
+            self.assertFalse(is_sci(converted))
+
+    def test_arrays_become_lists(self):
+        self.assertEqual(sci_to_native(numpy.arange(3)), [0, 1, 2])
+        self.assertEqual(sci_to_native(numpy.array([[1.5, 2.5], [3.5, 4.5]])), [[1.5, 2.5], [3.5, 4.5]])
+
+    def test_datetimes_keep_their_type(self):
+        array = numpy.array(["2018-01-02T03:04:05"], dtype="M8[ns]")
+        self.assertEqual(sci_to_native(array), [datetime(2018, 1, 2, 3, 4, 5)])
+
+    def test_unsigned_integers_beyond_int64_are_refused(self):
+        with self.assertRaises(ValueError):
+            sci_to_native(numpy.array([2 ** 63], dtype="u8"))
+        with self.assertRaises(ValueError):
+            sci_to_native(numpy.uint64(2 ** 63))
+        self.assertEqual(sci_to_native(numpy.array([2 ** 63 - 1], dtype="u8")), [2 ** 63 - 1])
+
+    def test_complex_values_are_refused(self):
+        with self.assertRaises(TypeError):
+            sci_to_native(numpy.array([1j]))
+
+    def test_nested_parameters_are_fixed(self):
+        parameters = {"x": 1, "rows": [{"n": numpy.int64(1)}], "array": numpy.arange(2)}
+        fixed = fix_sci_parameters(parameters)
+        self.assertEqual(fixed, {"x": 1, "rows": [{"n": 1}], "array": [0, 1]})
+        self.assertEqual(type(fixed["rows"][0]["n"]), int)
+
+    def test_native_parameters_are_unchanged(self):
+        parameters = {"x": 1, "rows": [{"n": 1}]}
+        self.assertIs(fix_sci_parameters(parameters), parameters)
+
+    def test_json_codec_encodes_arrays(self):
+        codec = JSONCodec()
+        self.assertEqual(codec.decode(codec.encode({"x": numpy.arange(3), "y": numpy.int64(4)})),
+                         {"x": [0, 1, 2], "y": 4})
+
+
+@skipIf(pandas is None, "pandas is not installed")
+class PandasConversionTestCase(TestCase):
+
+    def test_series_become_lists(self):
+        self.assertEqual(sci_to_native(pandas.Series([1, 2, 3])), [1, 2, 3])
+
+    def test_missing_values_become_null(self):
+        self.assertEqual(sci_to_native(pandas.Series([1.5, None])), [1.5, None])
+
+    def test_data_frames_become_lists_of_maps(self):
+        frame = pandas.DataFrame({"name": ["Alice", "Bob"], "age": [33, None]}, columns=["name", "age"])
+        rows = sci_to_native(frame)
+        self.assertEqual(rows, [{"name": "Alice", "age": 33.0}, {"name": "Bob", "age": None}])
+        self.assertEqual(type(rows[0]["age"]), float)
+
+    def test_timestamps_become_datetimes(self):
+        self.assertEqual(sci_to_native(pandas.Timestamp("2018-01-02")), datetime(2018, 1, 2))
+
+
+class FakeTransaction(object):
+
+    def __init__(self):
+        self.statements = []
+
+    def run(self, cypher, x):
+        self.statements.append((cypher, x))
+        # Return rows out of order, as aggregation may do
+        return [(row[0], 100 + row[0]) for row in reversed(x)]
+
+
+@skipIf(pandas is None, "pandas is not installed")
+class FrameLoadingTestCase(TestCase):
+
+    def test_rows_are_sent_in_chunks_and_identities_kept_in_order(self):
+        tx = FakeTransaction()
+        frame = pandas.DataFrame({"name": ["Alice", "Bob", "Carol"], "employer": ["Acme", None, "Acme"]},
+                                 columns=["name", "employer"])
+        identities = create_nodes_from_frame(tx, frame, "Person", chunk_size=2,
+                                             relationships={"employer": ("WORKS_FOR", "Company", "name")})
+        self.assertEqual(identities, [100, 101, 102])
+        self.assertEqual([len(x) for _, x in tx.statements], [2, 1])
+        self.assertEqual(tx.statements[0][1][1], [1, {"name": "Bob"}, None, None])
+
+    def test_merge_with_missing_primary_keys_sends_nothing(self):
+        tx = FakeTransaction()
+        for missing in (None, float("nan")):
+            frame = pandas.DataFrame({"name": ["Alice", missing, "Carol"], "age": [33, 44, 55]},
+                                     columns=["name", "age"])
+            with self.assertRaises(ValueError):
+                merge_nodes_from_frame(tx, frame, "Person", "name", chunk_size=1)
+        self.assertEqual(tx.statements, [])
+
+    def test_merge_with_unknown_primary_key_column_sends_nothing(self):
+        tx = FakeTransaction()
+        frame = pandas.DataFrame({"name": ["Alice", "Bob"]})
+        with self.assertRaises(ValueError):
+            merge_nodes_from_frame(tx, frame, "Person", "email")
+        self.assertEqual(tx.statements, [])